@@ -6,6 +6,7 @@ import logging
 
 # Import your model's Base and settings
 from services.auth_user_management.models import Base
+import services.model_catalog_discovery.models  # noqa: F401  registers catalog_models on Base
 from services.auth_user_management.config import get_settings
 
 # Configure logging
@@ -0,0 +1,35 @@
+"""add_audit_events
+
+Revision ID: add_audit_events
+Revises: init_db
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_audit_events'
+down_revision = 'init_db'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table('audit_events',
+        sa.Column('id', sa.Integer(), nullable=False, autoincrement=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('kind', sa.String(20)),
+        sa.Column('event', sa.String(100), nullable=False),
+        sa.Column('actor_email', sa.String(255)),
+        sa.Column('ip', sa.String(45)),
+        sa.Column('target', sa.String(255)),
+        sa.Column('details', sa.Text()),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_audit_events_created_at', 'audit_events', ['created_at'])
+    op.create_index('ix_audit_events_actor_created', 'audit_events', ['actor_email', 'created_at'])
+
+def downgrade():
+    op.drop_index('ix_audit_events_actor_created', table_name='audit_events')
+    op.drop_index('ix_audit_events_created_at', table_name='audit_events')
+    op.drop_table('audit_events')
@@ -0,0 +1,21 @@
+"""add_catalog_content_hash
+
+Revision ID: add_catalog_content_hash
+Revises: add_model_catalog
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_catalog_content_hash'
+down_revision = 'add_model_catalog'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('catalog_models', sa.Column('content_hash', sa.String(64)))
+
+def downgrade():
+    op.drop_column('catalog_models', 'content_hash')
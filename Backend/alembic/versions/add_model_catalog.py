@@ -0,0 +1,47 @@
+"""add_model_catalog
+
+Revision ID: add_model_catalog
+Revises: add_team_activity_index
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = 'add_model_catalog'
+down_revision = 'add_team_activity_index'
+branch_labels = None
+depends_on = None
+
+PreciseDateTime = sa.DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql")
+
+def upgrade():
+    op.create_table('catalog_models',
+        sa.Column('id', sa.Integer(), nullable=False, autoincrement=True),
+        sa.Column('slug', sa.String(120), nullable=False),
+        sa.Column('name', sa.String(200), nullable=False),
+        sa.Column('description', sa.Text()),
+        sa.Column('type', sa.String(3), nullable=False),
+        sa.Column('task', sa.String(100)),
+        sa.Column('tags', sa.JSON(), nullable=False),
+        sa.Column('size', sa.String(20)),
+        sa.Column('parameters', sa.BigInteger()),
+        sa.Column('license', sa.String(100)),
+        sa.Column('commercial', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('tier', sa.String(20), nullable=False, server_default='free'),
+        sa.Column('version', sa.String(20)),
+        sa.Column('status', sa.String(20), nullable=False, server_default='ready'),
+        sa.Column('metrics', sa.JSON()),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('updated_at', PreciseDateTime, nullable=False),
+        sa.Column('deleted_at', PreciseDateTime),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('slug')
+    )
+    op.create_index('ix_catalog_models_updated_at', 'catalog_models', ['updated_at'])
+
+def downgrade():
+    op.drop_index('ix_catalog_models_updated_at', table_name='catalog_models')
+    op.drop_table('catalog_models')
@@ -0,0 +1,24 @@
+"""add_team_activity_index
+
+Revision ID: add_team_activity_index
+Revises: add_team_version
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_team_activity_index'
+down_revision = 'add_team_version'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_index(
+        'ix_team_activity_team_created_id',
+        'team_activity_logs',
+        ['team_id', 'created_at', 'id']
+    )
+
+def downgrade():
+    op.drop_index('ix_team_activity_team_created_id', table_name='team_activity_logs')
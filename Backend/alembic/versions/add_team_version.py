@@ -0,0 +1,24 @@
+"""add_team_version
+
+Revision ID: add_team_version
+Revises: add_user_listing_indexes
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_team_version'
+down_revision = 'add_user_listing_indexes'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('teams', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+    # Serves a user's team list, ordered by team
+    op.create_index('ix_team_members_user_team', 'team_members', ['user_id', 'team_id'])
+
+def downgrade():
+    op.drop_index('ix_team_members_user_team', table_name='team_members')
+    op.drop_column('teams', 'version')
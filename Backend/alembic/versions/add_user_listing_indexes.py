@@ -0,0 +1,31 @@
+"""add_user_listing_indexes
+
+Revision ID: add_user_listing_indexes
+Revises: add_email_outbox
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_user_listing_indexes'
+down_revision = 'add_email_outbox'
+branch_labels = None
+depends_on = None
+
+# Each filter column leads, followed by the (created_at, id) sort key
+INDEXES = [
+    ('ix_users_created_id', ['created_at', 'id']),
+    ('ix_users_role_created_id', ['role', 'created_at', 'id']),
+    ('ix_users_tier_created_id', ['tier', 'created_at', 'id']),
+    ('ix_users_org_created_id', ['organization', 'created_at', 'id']),
+    ('ix_users_status_created_id', ['is_active', 'email_verified', 'created_at', 'id']),
+]
+
+def upgrade():
+    for name, columns in INDEXES:
+        op.create_index(name, 'users', columns)
+
+def downgrade():
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name='users')
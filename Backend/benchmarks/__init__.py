@@ -0,0 +1,27 @@
+"""
+Micro-benchmarks for hot paths in the backend services.
+
+Run from the Backend directory, e.g.:
+    python -m benchmarks.bench_jwt_decode
+
+Settings normally come from .env; placeholders are filled in here so the
+benchmarks run on a bare checkout without a database or SMTP server.
+"""
+import os
+
+_PLACEHOLDER_SETTINGS = {
+    "DB_USERNAME": "bench",
+    "DB_PASSWORD": "bench",
+    "DB_HOST": "localhost",
+    "DB_NAME": "bench",
+    "JWT_SECRET_KEY": "benchmark-secret-key",
+    "SMTP_SERVER": "localhost",
+    "SMTP_PORT": "25",
+    "SMTP_USERNAME": "bench",
+    "SMTP_PASSWORD": "bench",
+    "FROM_EMAIL": "bench@example.com",
+    "FRONTEND_URL": "http://localhost:3000",
+}
+
+for _name, _value in _PLACEHOLDER_SETTINGS.items():
+    os.environ.setdefault(_name, _value)
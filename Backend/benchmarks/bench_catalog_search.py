@@ -0,0 +1,115 @@
+"""
+Model catalog search latency with a large synthetic catalog.
+
+Builds a CatalogIndex of synthetic entries, then times a mix of searches,
+each including the serialization GET /models does for its response, and
+checks the p99 of every kind against a target.
+
+    python -m benchmarks.bench_catalog_search [--entries 100000] [--runs 200] [--target-ms 5]
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+import benchmarks  # noqa: F401  (placeholder settings)
+
+from services.model_catalog_discovery.index import CatalogIndex
+from services.model_catalog_discovery.schemas import CatalogSearchResponse
+
+TASKS = ["text-generation", "summarization", "translation", "classification", "question-answering", "embedding"]
+DOMAINS = ["finance", "healthcare", "legal", "retail", "education", "security", "code", "chat", "science", "media"]
+LICENSES = ["Apache 2.0", "MIT", "Commercial", "Research Only", "Llama 3", "CC-BY-4.0"]
+FAMILIES = ["llama", "mistral", "phi", "gemma", "qwen", "falcon", "bloom", "gpt", "t5", "bert"]
+SIZES = ["small", "medium", "large"]
+
+
+def synthetic_entries(count: int, rng: random.Random):
+    started = datetime(2026, 1, 1)
+    for entry_id in range(1, count + 1):
+        family = rng.choice(FAMILIES)
+        parameters = int(10 ** rng.uniform(8, 11.5))
+        domains = rng.sample(DOMAINS, rng.randint(1, 3))
+        yield {
+            "id": entry_id,
+            "slug": f"{family}-{entry_id}",
+            "name": f"{family.title()} {parameters // 1_000_000_000 or 1}B {domains[0].title()} v{entry_id % 7}",
+            "description": f"A {rng.choice(SIZES)} {family} model tuned for {' and '.join(domains)} workloads "
+                           f"(build {entry_id:x})",
+            "type": "LLM" if parameters >= 3_000_000_000 else "SLM",
+            "task": rng.choice(TASKS),
+            "tags": domains,
+            "size": rng.choice(SIZES),
+            "parameters": parameters,
+            "license": rng.choice(LICENSES),
+            "commercial": rng.random() < 0.5,
+            "tier": rng.choice(["free", "advanced", "enterprise"]),
+            "version": "1.0",
+            "status": "ready",
+            "metrics": {"accuracy": round(rng.uniform(0.6, 0.99), 3)},
+            "updated_at": started + timedelta(seconds=entry_id),
+        }
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--target-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    entries = list(synthetic_entries(args.entries, rng))
+    start = time.perf_counter()
+    index = CatalogIndex.build(entries)
+    print(f"built index of {len(index):,} entries in {time.perf_counter() - start:.2f}s")
+
+    updates = [dict(rng.choice(entries), description="refreshed weights", updated_at=datetime(2027, 1, 1))
+               for _ in range(1000)]
+    start = time.perf_counter()
+    for entry in updates:
+        index.upsert(entry)
+    print(f"incremental upsert  {(time.perf_counter() - start) / len(updates) * 1e6:.1f} us/entry")
+
+    deep_cursor = entries[len(entries) * 9 // 10]["id"]
+    cases = [
+        ("browse", dict()),
+        ("common term", dict(query="finance")),
+        ("two terms", dict(query="healthcare summarization")),
+        ("rare term", dict(query=f"{entries[len(entries) // 2]['id']:x}")),
+        ("no match", dict(query="nonexistent")),
+        ("facets", dict(filters={"type": ["LLM"], "license": ["MIT", "Apache 2.0"]})),
+        ("term + facets", dict(query="legal", filters={"type": ["SLM"], "params": ["<1B"]})),
+        ("deep cursor", dict(query="chat", after=deep_cursor)),
+    ]
+
+    failed = False
+    print(f"{'case':<16}{'total':>8}{'p50 ms':>10}{'p99 ms':>10}")
+    for label, kwargs in cases:
+        samples = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            result = index.search(limit=20, **kwargs)
+            CatalogSearchResponse(
+                items=result.items, total=result.total, next_cursor=None, facets=result.facets
+            ).model_dump_json()
+            samples.append((time.perf_counter() - start) * 1000)
+        p50, p99 = statistics.median(samples), percentile(samples, 0.99)
+        failed |= p99 > args.target_ms
+        print(f"{label:<16}{result.total:>8}{p50:>10.3f}{p99:>10.3f}")
+
+    if failed:
+        print(f"p99 above the {args.target_ms} ms target")
+        sys.exit(1)
+    print(f"all p99 within the {args.target_ms} ms target")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Verification email rendering throughput, before and after precompiled templates.
+
+"legacy" reproduces the old path: read the logo from disk, base64 it and
+inline it into a freshly built f-string for every message. "templated"
+uses the precompiled Jinja2 template with the logo attached once by
+Content-ID. The HTML rows time rendering alone; the message rows also
+serialize the full MIME message, as the SMTP sender does.
+
+    python -m benchmarks.bench_email_render [--messages 2000] [--logo-kb 40]
+"""
+import argparse
+import base64
+import os
+import tempfile
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+import benchmarks  # noqa: F401  (placeholder settings)
+
+from services.auth_user_management import email as email_templates
+
+
+def legacy_verification_html(logo_path: str, verify_url: str) -> str:
+    """The pre-template HTML, rebuilt with a fresh logo read on every call"""
+    with open(logo_path, 'rb') as f:
+        logo_base64 = base64.b64encode(f.read()).decode()
+    return f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <style>
+            body {{
+                font-family: Arial, sans-serif;
+                margin: 0;
+                padding: 0;
+                background-color: #ffffff;
+            }}
+            .container {{
+                max-width: 600px;
+                margin: 0 auto;
+                padding: 20px;
+            }}
+            .header {{
+                text-align: center;
+                padding: 20px 0;
+            }}
+            .logo-placeholder {{
+                width: 150px;
+                height: 60px;
+                background-color: #e0e0e0;
+                margin: 0 auto;
+                display: flex;
+                align-items: center;
+                justify-content: center;
+                color: #666;
+                font-size: 12px;
+            }}
+            .content {{
+                background-color: #ffffff;
+                padding: 30px;
+                border-radius: 8px;
+                border: 1px solid #e0e0e0;
+            }}
+            .button {{
+                display: inline-block;
+                padding: 12px 24px;
+                background-color: #00B4D8;
+                color: white;
+                text-decoration: none;
+                border-radius: 4px;
+                margin: 20px 0;
+            }}
+            .footer {{
+                text-align: center;
+                padding: 20px;
+                color: #666;
+                font-size: 12px;
+            }}
+            h1 {{
+                color: #0077B6;
+                margin-bottom: 20px;
+            }}
+            p {{
+                color: #333;
+                line-height: 1.6;
+            }}
+            .logo {{
+                max-width: 200px;
+                height: auto;
+                margin: 0 auto;
+                display: block;
+            }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <img src="data:image/jpeg;base64,{logo_base64}" alt="Artintel LLMs Logo" class="logo">
+            </div>
+            <div class="content">
+                <h1>Welcome to Artintel LLMs!</h1>
+                <p>Thank you for registering. Please verify your email address to get started.</p>
+                <p style="text-align: center;">
+                    <a href="{verify_url}" class="button">Verify Email Address</a>
+                </p>
+                <p>This link will expire in 24 hours.</p>
+                <p>If you didn't create an account, please ignore this email.</p>
+            </div>
+            <div class="footer">
+                <p>© 2024 Artintel LLMs. All rights reserved.</p>
+                <p>If you have any questions, please contact our support team.</p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+
+
+def legacy_message(logo_path: str, to_email: str, token: str) -> bytes:
+    verify_url = f"http://localhost:3000/verify-email?token={token}"
+    msg = MIMEMultipart('alternative')
+    msg['To'] = to_email
+    msg['Subject'] = "Verify your email address - Artintel LLMs"
+    msg.attach(MIMEText(legacy_verification_html(logo_path, verify_url), 'html'))
+    return msg.as_bytes()
+
+
+def templated_message(to_email: str, token: str) -> bytes:
+    return email_templates.build_verification_email(to_email, token).as_bytes()
+
+
+def run(label: str, render, count: int) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        render(f"user{i}@example.com", f"token-{i:08d}")
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed
+    print(f"{label:<18} {rate:10.0f} messages/s   {elapsed / count * 1e6:8.1f} us/message")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--logo-kb", type=int, default=40)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        logo_path = os.path.join(tmp, "logo.jpg")
+        with open(logo_path, "wb") as f:
+            f.write(os.urandom(args.logo_kb * 1024))
+        email_templates.LOGO_PATH = logo_path
+        email_templates.get_logo_part.cache_clear()
+
+        before = run("legacy html", lambda to, token: legacy_verification_html(logo_path, token), args.messages)
+        after = run("templated html", lambda to, token: email_templates.get_verification_template(token), args.messages)
+        print(f"{'speedup':<18} {after / before:10.1f}x")
+
+        before = run("legacy message", lambda to, token: legacy_message(logo_path, to, token), args.messages)
+        after = run("templated message", templated_message, args.messages)
+        print(f"{'speedup':<18} {after / before:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Time to first token and decode rate for streamed generation.
+
+Runs concurrent generations on a simulated model that takes a fixed time
+per token, and reports what a client sees when it reads the stream versus
+waiting for the whole completion, plus how quickly a cancelled stream
+gives its slot back.
+
+    python -m benchmarks.bench_generate [--clients 8] [--tokens 64] [--token-ms 10]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import benchmarks  # noqa: F401  (placeholder settings)
+
+from services.deployment_inference.backends import EchoGenerator
+from services.deployment_inference.streaming import TokenStreamer
+
+
+async def run(args):
+    executor = ThreadPoolExecutor(max_workers=args.workers)
+    streamer = TokenStreamer(
+        "bench", EchoGenerator(args.token_ms), executor, max_streams=args.clients, max_tokens=args.tokens
+    )
+    prompt = " ".join(f"t{number}" for number in range(args.tokens))
+    first_token, total, rates = [], [], []
+
+    async def client():
+        start = time.perf_counter()
+        stream = streamer.open(prompt)
+        try:
+            async for event in stream:
+                if "token" in event and stream.tokens == 1:
+                    first_token.append((time.perf_counter() - start) * 1000)
+        finally:
+            await stream.aclose()
+        elapsed = time.perf_counter() - start
+        total.append(elapsed * 1000)
+        rates.append(stream.tokens / elapsed)
+
+    await asyncio.gather(*(client() for _ in range(args.clients)))
+
+    stream = streamer.open(prompt)
+    async for event in stream:
+        if stream.tokens == 2:
+            break
+    start = time.perf_counter()
+    await stream.aclose()
+    freed = (time.perf_counter() - start) * 1000
+    executor.shutdown()
+    return statistics.median(first_token), statistics.median(total), statistics.median(rates), freed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--tokens", type=int, default=64)
+    parser.add_argument("--token-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    first_token, total, rate, freed = asyncio.run(run(args))
+    print(f"{args.clients} clients x {args.tokens} tokens at {args.token_ms:g}ms/token, {args.workers} workers")
+    print(f"time to first token, streamed:  {first_token:8.1f} ms (p50)")
+    print(f"time to first token, buffered:  {total:8.1f} ms (p50, whole completion)")
+    print(f"decode rate per stream:         {rate:8.1f} tokens/s (p50)")
+    print(f"slot freed after cancel in:     {freed:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Inference throughput and latency with and without request batching.
+
+Serves a simulated model whose batch cost is a fixed overhead plus a
+small per-input cost (the shape of most CPU and GPU runtimes), then drives
+it with concurrent single-input clients for each max batch size. A max
+batch size of 1 is the unbatched baseline.
+
+    python -m benchmarks.bench_inference [--batch-sizes 1,8,32] [--clients 64] [--seconds 3]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import benchmarks  # noqa: F401  (placeholder settings)
+
+from services.deployment_inference.backends import InferenceBackend
+from services.deployment_inference.batching import MicroBatcher
+
+
+class SimulatedModel(InferenceBackend):
+    kind = "simulated"
+
+    def __init__(self, overhead_ms: float, per_item_ms: float):
+        self.overhead = overhead_ms / 1000
+        self.per_item = per_item_ms / 1000
+
+    def predict_batch(self, items):
+        time.sleep(self.overhead + self.per_item * len(items))
+        return items
+
+
+async def run(batch_size, args):
+    executor = ThreadPoolExecutor(max_workers=args.workers)
+    batcher = MicroBatcher(
+        "bench", SimulatedModel(args.overhead_ms, args.per_item_ms), executor,
+        max_batch_size=batch_size, max_wait=args.max_wait_ms / 1000,
+        max_queue=args.clients * 2, concurrency=args.workers
+    )
+    await batcher.start()
+    latencies = []
+    deadline = time.perf_counter() + args.seconds
+
+    async def client(number):
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await batcher.predict([number])
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(number) for number in range(args.clients)))
+    elapsed = time.perf_counter() - start
+    await batcher.stop()
+    executor.shutdown()
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return len(latencies) / elapsed, statistics.median(latencies), p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-sizes", default="1,8,32")
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--overhead-ms", type=float, default=4.0)
+    parser.add_argument("--per-item-ms", type=float, default=0.2)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{args.clients} clients, {args.workers} workers, "
+          f"model cost {args.overhead_ms:g}ms + {args.per_item_ms:g}ms per input")
+    print(f"{'batch':>6}{'req/s':>10}{'p50 ms':>9}{'p99 ms':>9}")
+    for batch_size in (int(value) for value in args.batch_sizes.split(",")):
+        throughput, p50, p99 = asyncio.run(run(batch_size, args))
+        print(f"{batch_size:>6}{throughput:>10.0f}{p50:>9.1f}{p99:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
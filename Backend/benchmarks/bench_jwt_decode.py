@@ -0,0 +1,60 @@
+"""
+JWT decode cost with and without the verified-token cache.
+
+Replays 10k requests (one second of traffic at 10k RPS) spread over a pool
+of distinct tokens, the way real clients reuse a token for its lifetime,
+and reports per-request cost and the share of one core spent decoding.
+
+    python -m benchmarks.bench_jwt_decode [--requests 10000] [--tokens 500]
+"""
+import argparse
+import random
+import time
+
+import benchmarks  # noqa: F401  (placeholder settings)
+from jose import jwt
+
+from services.auth_user_management.token_cache import TokenVerificationCache
+
+SECRET = "benchmark-secret-key"
+ALGORITHM = "HS256"
+
+
+def make_tokens(count: int):
+    exp = int(time.time()) + 3600
+    return [
+        jwt.encode({"sub": f"user{i}@example.com", "iat": exp - 3600, "exp": exp}, SECRET, algorithm=ALGORITHM)
+        for i in range(count)
+    ]
+
+
+def run(label: str, decode, traffic, rps: int):
+    start = time.perf_counter()
+    for token in traffic:
+        decode(token)
+    elapsed = time.perf_counter() - start
+    per_call_us = elapsed / len(traffic) * 1e6
+    core_share = per_call_us * rps / 1e6 * 100
+    print(f"{label:<10} {per_call_us:8.2f} us/request   {core_share:6.1f}% of one core at {rps} RPS")
+    return per_call_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--tokens", type=int, default=500)
+    args = parser.parse_args()
+
+    tokens = make_tokens(args.tokens)
+    rng = random.Random(42)
+    traffic = [rng.choice(tokens) for _ in range(args.requests)]
+
+    cache = TokenVerificationCache(maxsize=args.tokens * 2, secret_key=SECRET, algorithm=ALGORITHM)
+
+    before = run("uncached", lambda t: jwt.decode(t, SECRET, algorithms=[ALGORITHM]), traffic, args.requests)
+    after = run("cached", cache.decode, traffic, args.requests)
+    print(f"speedup    {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
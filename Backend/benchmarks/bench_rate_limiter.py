@@ -0,0 +1,64 @@
+"""
+Rate-limit check cost with one million tracked identifiers.
+
+Compares the in-memory sliding-window backend against the previous
+approach, which scanned every tracked key on each check to clean up.
+
+    python -m benchmarks.bench_rate_limiter [--identifiers 1000000] [--checks 200000]
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+import benchmarks  # noqa: F401  (placeholder settings)
+
+from services.auth_user_management.rate_limiter import InMemoryRateLimitBackend
+
+WINDOW_SECONDS = 30 * 60
+LIMIT = 5
+
+
+def legacy_scan(attempts):
+    """The old per-check cleanup: a full pass over every tracked key"""
+    now = datetime.now()
+    expired = [key for key, (_, ts) in attempts.items() if now - ts > timedelta(hours=24)]
+    for key in expired:
+        del attempts[key]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--identifiers", type=int, default=1_000_000)
+    parser.add_argument("--checks", type=int, default=200_000)
+    args = parser.parse_args()
+
+    keys = [f"user{i}@example.com:login" for i in range(args.identifiers)]
+    backend = InMemoryRateLimitBackend()
+
+    start = time.perf_counter()
+    for key in keys:
+        backend.hit_sync(key, LIMIT, WINDOW_SECONDS)
+    fill = time.perf_counter() - start
+    print(f"populated {len(backend):,} identifiers in {fill:.2f}s")
+
+    rng = random.Random(42)
+    sample = [rng.choice(keys) for _ in range(args.checks)]
+    start = time.perf_counter()
+    for key in sample:
+        backend.hit_sync(key, LIMIT, WINDOW_SECONDS)
+    elapsed = time.perf_counter() - start
+    print(f"sliding window  {elapsed / args.checks * 1e6:10.2f} us/check  ({args.checks / elapsed:,.0f} checks/s)")
+
+    now = datetime.now()
+    attempts = {key: (1, now) for key in keys}
+    runs = 5
+    start = time.perf_counter()
+    for _ in range(runs):
+        legacy_scan(attempts)
+    elapsed = time.perf_counter() - start
+    print(f"legacy scan     {elapsed / runs * 1e6:10.2f} us/check  ({runs / elapsed:,.1f} checks/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Model recommendation latency as the catalog grows.
+
+For each catalog size, builds a Recommender over synthetic entries and
+times "similar models" lookups uncached (one matrix product) and cached,
+a batch of uncached lookups scored in a single product, and use-case
+queries.
+
+    python -m benchmarks.bench_recommend [--sizes 10000,50000,100000] [--runs 50]
+"""
+import argparse
+import random
+import statistics
+import time
+
+import benchmarks  # noqa: F401  (placeholder settings)
+
+from benchmarks.bench_catalog_search import synthetic_entries
+from services.model_catalog_discovery.recommend import CACHED_MATCHES, Recommender
+
+BATCH = 64
+
+
+def timed_ms(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,50000,100000")
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'models':>8}{'build s':>9}{'MB':>7}{'miss ms':>10}{'hit us':>9}{f'x{BATCH} ms/query':>16}{'use case ms':>13}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        rng = random.Random(42)
+        entries = list(synthetic_entries(size, rng))
+        start = time.perf_counter()
+        recommender = Recommender(entries, version=None)
+        build = time.perf_counter() - start
+
+        samples = [rng.choice(entries) for _ in range(args.runs)]
+        picks = iter(samples)
+        miss = timed_ms(lambda: recommender.similar([next(picks)]), args.runs)
+
+        target = samples[0]
+        recommender.remember(target["id"], recommender.similar([target])[0])
+        hit = timed_ms(lambda: recommender.cached(target["id"])[:10], args.runs) * 1000
+
+        batch = [rng.choice(entries) for _ in range(BATCH)]
+        batched = timed_ms(lambda: recommender.similar(batch, CACHED_MATCHES), 5) / BATCH
+
+        use_case = timed_ms(lambda: recommender.for_use_case(
+            "summarize finance reports for healthcare", task="summarization", licenses=["MIT", "Apache 2.0"],
+            max_parameters=10_000_000_000, k=60
+        ), args.runs)
+
+        megabytes = recommender.matrix.nbytes / 1e6
+        print(f"{size:>8}{build:>9.2f}{megabytes:>7.1f}{miss:>10.2f}{hit:>9.1f}{batched:>16.2f}{use_case:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Cold-start time of the API process.
+
+Each run starts a fresh interpreter and reports, in milliseconds:
+
+    interpreter  process spawn until the child's first line runs
+    import       `import main` (routes, models, middleware; no database)
+    openapi      building the OpenAPI schema, paid by the first /docs hit
+    lifespan     startup hooks: engines, DB check, background workers
+                 (only with --lifespan; needs the configured database)
+
+    python -m benchmarks.bench_startup [--runs 10] [--lifespan] [--target-ms 1500]
+
+With --target-ms the exit status is 1 when the median time to a ready
+app exceeds the target, so the check can gate a deploy pipeline.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import benchmarks  # noqa: F401  (placeholder settings, inherited by the children)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import time
+started = time.perf_counter()
+import asyncio, json, sys
+import benchmarks
+import main
+imported = time.perf_counter()
+main.app.openapi()
+schema = time.perf_counter()
+timings = {"import": imported - started, "openapi": schema - imported}
+if "--lifespan" in sys.argv:
+    async def startup():
+        begun = time.perf_counter()
+        async with main.lifespan(main.app):
+            timings["lifespan"] = time.perf_counter() - begun
+    asyncio.run(startup())
+print(json.dumps(timings))
+"""
+
+
+def run_once(lifespan: bool) -> dict:
+    spawned = time.perf_counter()
+    args = [sys.executable, "-c", CHILD] + (["--lifespan"] if lifespan else [])
+    result = subprocess.run(args, cwd=BACKEND_DIR, capture_output=True, text=True)
+    total = time.perf_counter() - spawned
+    if result.returncode != 0:
+        sys.exit(f"Child process failed:\n{result.stderr}")
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings["interpreter"] = total - sum(timings.values())
+    timings["ready"] = total
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--lifespan", action="store_true", help="also run startup hooks against the database")
+    parser.add_argument("--target-ms", type=float, default=None, help="fail if the median ready time exceeds this")
+    args = parser.parse_args()
+
+    runs = [run_once(args.lifespan) for _ in range(args.runs)]
+
+    phases = ["interpreter", "import", "openapi"] + (["lifespan"] if args.lifespan else []) + ["ready"]
+    print(f"{'phase':<12} {'median':>9} {'p95':>9} {'max':>9}   ({args.runs} cold starts)")
+    for phase in phases:
+        values = sorted(run[phase] * 1000 for run in runs)
+        p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+        print(f"{phase:<12} {statistics.median(values):7.1f}ms {p95:7.1f}ms {values[-1]:7.1f}ms")
+
+    if args.target_ms is not None:
+        median_ready = statistics.median(run["ready"] for run in runs) * 1000
+        verdict = "within" if median_ready <= args.target_ms else "OVER"
+        print(f"ready median {median_ready:.1f}ms is {verdict} the {args.target_ms:.0f}ms target")
+        if median_ready > args.target_ms:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,14 +4,21 @@
 
 from fastapi import FastAPI
 from services.auth_user_management.routes import router as auth_router, tags_metadata
-from services.auth_user_management.database import verify_db_connection
+from services.auth_user_management.database import dispose_engines, get_replica_set, init_engines, verify_db_connection
 from services.auth_user_management.config import get_settings
+from services.auth_user_management.rate_limit_middleware import RateLimitMiddleware
+from services.auth_user_management.metrics import MetricsMiddleware, metrics_endpoint
+from services.auth_user_management.email_outbox import email_worker
+from services.auth_user_management.team_logger import team_activity_logger
+import asyncio
 import logging
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-# from services.model_catalog.routes import router as model_router
+from services.model_catalog_discovery.routes import router as model_router
+from services.model_catalog_discovery.service import model_catalog
 # from services.data_integration.routes import router as data_router
-# from services.deployment.routes import router as deploy_router
+from services.deployment_inference.routes import router as inference_router
+from services.deployment_inference.engine import inference_engine
 # from services.monitoring.routes import router as monitor_router
 # from services.finetuning.routes import router as finetune_router
 
@@ -31,14 +38,34 @@ async def lifespan(app: FastAPI):
         
     logger.info("Environment variables loaded successfully")
     
-    # Verify database connection
-    if not verify_db_connection():
+    # Engines are created here rather than at import, so importing the app
+    # (tests, Alembic, OpenAPI generation) never needs a database
+    init_engines()
+
+    # Verify database connection (blocking retries, kept off the event loop)
+    if not await asyncio.to_thread(verify_db_connection):
         logger.error("Failed to connect to database. Please check your database configuration.")
         raise SystemExit(1)
-    
+
+    # Read replica health checks; reads fall back to the primary while none is healthy
+    await get_replica_set().start()
+
+    # Background delivery of queued emails (verification, password reset)
+    await email_worker.start()
+    # Write-behind team activity log
+    await team_activity_logger.start()
+    # In-memory catalog index, loaded in the background and kept in sync by polling
+    await model_catalog.start()
+    # Models in INFERENCE_MODELS, each behind its own request batcher
+    await inference_engine.start()
+
     logger.info("Application startup complete")
     yield
-    # Cleanup code here if needed
+    await inference_engine.stop()
+    await model_catalog.stop()
+    await team_activity_logger.stop()
+    await email_worker.stop()
+    await dispose_engines()
 
 # Instantiate our FastAPI application
 app = FastAPI(
@@ -46,7 +73,8 @@ app = FastAPI(
     description="""
     Welcome to Artintel's Large Language Model Platform API documentation.
     """,
-    openapi_tags=tags_metadata
+    openapi_tags=tags_metadata,
+    lifespan=lifespan
 )
 
 # -----------------------------------------------------------------------------
@@ -55,12 +83,15 @@ app = FastAPI(
 # tags=["auth"] helps group these routes in API docs (Swagger).
 # -----------------------------------------------------------------------------
 app.include_router(auth_router, prefix="/auth")
-# app.include_router(model_router, prefix="/models", tags=["Model Catalog"])
+app.include_router(model_router, prefix="/models", tags=["Model Catalog"])
 # app.include_router(data_router, prefix="/data", tags=["Data Integration"])
-# app.include_router(deploy_router, prefix="/deploy", tags=["Deployment"])
+app.include_router(inference_router, prefix="/v1", tags=["Inference"])
 # app.include_router(monitor_router, prefix="/monitor", tags=["Monitoring"])
 # app.include_router(finetune_router, prefix="/finetune", tags=["Fine-tuning"])
 
+# Prometheus scrape endpoint
+app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+
 @app.get("/")
 def read_root():
     """
@@ -69,7 +100,13 @@ def read_root():
     """
     return {"Welcome to the Artintel Backend!"}
 
-# Add CORS middleware
+# Per-route rate limits, enforced before the body is parsed
+app.add_middleware(RateLimitMiddleware)
+
+# Request metrics, labelled by route template (outside rate limiting so 429s are counted)
+app.add_middleware(MetricsMiddleware)
+
+# Add CORS middleware (added last so it also wraps 429 responses)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
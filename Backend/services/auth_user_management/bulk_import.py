@@ -0,0 +1,231 @@
+"""
+services/auth_user_management/bulk_import.py
+
+Bulk user import for onboarding large organisations.
+
+An upload (CSV with a header row, or JSON lines) is spooled to a temporary
+file, then processed in batches. Each batch costs one duplicate-check
+query, parallel password hashing on the bulk hashing pool, executemany
+inserts for users, verification tokens and outbox emails, and a single
+commit. Per-row results are streamed back as JSON lines while the import
+runs.
+"""
+import csv
+import io
+import json
+import tempfile
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Callable, Dict, IO, Iterator, List, Optional, Tuple, Union
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, EmailStr, Field, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from services.auth_user_management.config import get_settings
+from services.auth_user_management.database import AsyncSessionLocal
+from services.auth_user_management.email_outbox import email_worker, enqueue_emails
+from services.auth_user_management.logger import setup_logger
+from services.auth_user_management.metrics import bulk_import_rows_total
+from services.auth_user_management.models import EmailVerificationToken, User
+from services.auth_user_management.password_hashing import PasswordHashingPool, bulk_hashing_pool
+
+logger = setup_logger("bulk_import")
+
+settings = get_settings()
+
+SUPPORTED_FORMATS = ("csv", "jsonl")
+
+# Spooled uploads stay in memory up to this size, then move to disk
+SPOOL_MEMORY_BYTES = 1024 * 1024
+
+
+class BulkImportTooLarge(HTTPException):
+    def __init__(self, detail: str):
+        super().__init__(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail)
+
+
+class BulkUserRow(BaseModel):
+    email: EmailStr
+    password: str = Field(..., min_length=1)
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+
+
+@dataclass
+class RowResult:
+    row: int
+    status: str  # created, duplicate, invalid, error
+    email: Optional[str] = None
+    detail: Optional[str] = None
+
+    def to_line(self) -> bytes:
+        data = {k: v for k, v in asdict(self).items() if v is not None}
+        return json.dumps(data, separators=(",", ":")).encode() + b"\n"
+
+
+async def spool_upload(chunks: AsyncIterator[bytes], max_bytes: int) -> IO[bytes]:
+    """Copy a streamed request body to a temporary file, enforcing a size cap"""
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+    size = 0
+    async for chunk in chunks:
+        size += len(chunk)
+        if size > max_bytes:
+            spool.close()
+            raise BulkImportTooLarge(f"Upload exceeds {max_bytes} bytes")
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+
+def iter_records(upload: IO[bytes], fmt: str) -> Iterator[Tuple[int, Union[Dict, str]]]:
+    """Yield (row number, record) pairs; a str record is a parse error"""
+    text = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row_number, record in enumerate(reader, start=1):
+            if None in record:
+                yield row_number, "Too many columns"
+                continue
+            # Empty cells mean "not provided"
+            yield row_number, {k.strip(): v for k, v in record.items() if k and v not in (None, "")}
+    elif fmt == "jsonl":
+        row_number = 0
+        for line in text:
+            if not line.strip():
+                continue
+            row_number += 1
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield row_number, "Invalid JSON"
+                continue
+            yield row_number, record if isinstance(record, dict) else "Expected a JSON object"
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+
+class BulkUserImporter:
+    """Imports validated rows batch by batch, yielding one result line per row"""
+
+    def __init__(
+        self,
+        token_factory: Callable[[], str],
+        hasher: PasswordHashingPool = bulk_hashing_pool,
+        session_factory=AsyncSessionLocal,
+        batch_size: int = 500,
+        max_rows: int = 50000
+    ):
+        self.token_factory = token_factory
+        self.hasher = hasher
+        self.session_factory = session_factory
+        self.batch_size = max(1, batch_size)
+        self.max_rows = max_rows
+        self.counts: Counter = Counter()
+
+    def _result(self, row: int, status: str, email: Optional[str] = None, detail: Optional[str] = None) -> bytes:
+        self.counts[status] += 1
+        bulk_import_rows_total.labels(status=status).inc()
+        return RowResult(row, status, email, detail).to_line()
+
+    async def run(self, records: Iterator[Tuple[int, Union[Dict, str]]]) -> AsyncIterator[bytes]:
+        seen = set()
+        batch: List[Tuple[int, BulkUserRow]] = []
+        for row_number, record in records:
+            if row_number > self.max_rows:
+                yield self._result(row_number, "error", detail=f"Import is limited to {self.max_rows} rows")
+                break
+            if isinstance(record, str):
+                yield self._result(row_number, "invalid", detail=record)
+                continue
+            try:
+                row = BulkUserRow.model_validate(record)
+            except ValidationError as e:
+                yield self._result(row_number, "invalid", record.get("email"), _validation_detail(e))
+                continue
+
+            key = row.email.lower()
+            if key in seen:
+                yield self._result(row_number, "duplicate", row.email, "Repeated in this upload")
+                continue
+            seen.add(key)
+
+            batch.append((row_number, row))
+            if len(batch) >= self.batch_size:
+                async for line in self._import_batch(batch):
+                    yield line
+                batch = []
+
+        if batch:
+            async for line in self._import_batch(batch):
+                yield line
+
+        summary = {status: self.counts.get(status, 0) for status in ("created", "duplicate", "invalid", "error")}
+        yield json.dumps({"summary": summary}, separators=(",", ":")).encode() + b"\n"
+
+    async def _import_batch(self, batch: List[Tuple[int, BulkUserRow]]) -> AsyncIterator[bytes]:
+        async with self.session_factory() as db:
+            # One round-trip for the whole batch's duplicate check
+            result = await db.execute(select(User.email).where(User.email.in_([row.email for _, row in batch])))
+            existing = {email.lower() for email in result.scalars()}
+
+            fresh = []
+            for row_number, row in batch:
+                if row.email.lower() in existing:
+                    yield self._result(row_number, "duplicate", row.email, "Email already registered")
+                else:
+                    fresh.append((row_number, row))
+            if not fresh:
+                return
+
+            try:
+                hashed = await self.hasher.hash_many([row.password for _, row in fresh])
+            except Exception as e:
+                # Headers are already sent, so report the rows instead of failing the stream
+                logger.error(f"Bulk import batch of {len(fresh)} rows failed to hash: {str(e)}")
+                for row_number, row in fresh:
+                    yield self._result(row_number, "error", row.email, "Could not process this row; retry it")
+                return
+
+            try:
+                await db.execute(insert(User), [
+                    {
+                        "email": row.email,
+                        "hashed_password": hashed_password,
+                        "first_name": row.first_name,
+                        "last_name": row.last_name,
+                        "role": "user",
+                        "tier": "Free"
+                    }
+                    for (_, row), hashed_password in zip(fresh, hashed)
+                ])
+                # MySQL has no INSERT ... RETURNING, so read the new ids back in one query
+                result = await db.execute(
+                    select(User.email, User.id).where(User.email.in_([row.email for _, row in fresh]))
+                )
+                user_ids = {email.lower(): user_id for email, user_id in result.all()}
+
+                tokens = [(row.email, self.token_factory()) for _, row in fresh]
+                await db.execute(insert(EmailVerificationToken), [
+                    {"token": token, "user_id": user_ids[email.lower()]} for email, token in tokens
+                ])
+                await enqueue_emails(db, "verification", tokens)
+                await db.commit()
+            except IntegrityError:
+                # Lost a race with a concurrent registration; nothing in this batch was written
+                await db.rollback()
+                logger.warning(f"Bulk import batch of {len(fresh)} rows conflicted with concurrent writes")
+                for row_number, row in fresh:
+                    yield self._result(row_number, "error", row.email, "Conflicted with a concurrent registration; retry this row")
+                return
+
+        email_worker.wake()
+        for row_number, row in fresh:
+            yield self._result(row_number, "created", row.email)
+
+
+def _validation_detail(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors()
+    )
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 import os
 from dotenv import load_dotenv
 
@@ -13,12 +14,34 @@ class Settings(BaseSettings):
     DB_HOST: str = os.getenv("DB_HOST")
     DB_PORT: int = int(os.getenv("DB_PORT", "3306"))
     DB_NAME: str = os.getenv("DB_NAME")
+    DB_ASYNC_DRIVER: str = "aiomysql"  # or "asyncmy"
+    ASYNC_DATABASE_URL: Optional[str] = None  # Overrides the MySQL URL, e.g. sqlite+aiosqlite:///./test.db
+
+    # Connection pool, per engine and per worker process
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30  # Wait for a free connection before failing the request
+    DB_POOL_RECYCLE_SECONDS: int = 3600  # Keep below MySQL's wait_timeout
+    DB_POOL_PRE_PING: bool = True  # Ping on every checkout; off saves a round-trip if recycle covers idle drops
+
+    # Read replicas (optional); read sessions are routed to them when configured
+    DB_REPLICA_HOSTS: str = ""  # Comma-separated host or host:port (default port DB_PORT)
+    ASYNC_REPLICA_DATABASE_URLS: str = ""  # Comma-separated URLs; override DB_REPLICA_HOSTS
+    DB_REPLICA_POOL_SIZE: int = 5  # Per replica
+    DB_REPLICA_MAX_OVERFLOW: int = 10
+    DB_REPLICA_HEALTH_CHECK_SECONDS: float = 5.0
+    DB_REPLICA_HEALTH_TIMEOUT_SECONDS: float = 2.0
 
     # JWT settings
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_SECONDS: int = 3600
 
+    # Authenticated principal cache
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 300  # Also bounded by each token's exp
+    TOKEN_CACHE_MAX_SIZE: int = 50000  # Verified JWTs kept until their exp
+
     # Email settings
     SMTP_SERVER: str
     SMTP_PORT: int
@@ -36,11 +59,79 @@ class Settings(BaseSettings):
     RESET_PASSWORD_WINDOW_MINUTES: int = 30
     IP_VERIFY_MAX_ATTEMPTS: int = 10
     IP_RESET_MAX_ATTEMPTS: int = 5
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" (per process) or "redis" (shared across workers)
+    RATE_LIMIT_REDIS_URL: str = "redis://localhost:6379/0"
+    RATE_LIMIT_ENABLED: bool = True  # Per-route limits in RateLimitMiddleware
+    RATE_LIMIT_TRUST_FORWARDED_FOR: bool = False  # Only behind a proxy that sets X-Forwarded-For
 
     # Admin registration
     ADMIN_REGISTRATION_KEY: str = os.getenv("ADMIN_REGISTRATION_KEY", "your-secure-key-here")
     ALLOWED_ADMIN_DOMAINS: str = os.getenv("ALLOWED_ADMIN_DOMAINS", "*")  # Comma-separated domains or * for any
 
+    # Password hashing pool
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # "thread" or "process"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64  # Pending jobs allowed on top of busy workers before 503
+
+    # Logging
+    LOG_LEVEL: str = "INFO"
+    LOG_QUEUE_SIZE: int = 10000  # Records buffered for the background writer
+    LOG_QUEUE_OVERFLOW: str = "drop"  # "drop" new records when full, or "block" the caller
+    LOG_FILE_MAX_BYTES: int = 10 * 1024 * 1024
+    LOG_FILE_BACKUP_COUNT: int = 5
+
+    # Audit log
+    AUDIT_LOG_FILE: str = "audit.log"  # JSON lines, inside logs/
+    AUDIT_QUEUE_SIZE: int = 50000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_FSYNC_INTERVAL_SECONDS: float = 5.0
+    AUDIT_DB_SINK_ENABLED: bool = False  # Also bulk-insert events into audit_events
+
+    # Email outbox
+    EMAIL_TRANSPORT: str = "smtp"  # "smtp", or "memory" to keep messages in-process (tests, local dev)
+    EMAIL_SMTP_POOL_SIZE: int = 4  # Authenticated SMTP connections kept open
+    EMAIL_SMTP_TIMEOUT_SECONDS: float = 30.0
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    EMAIL_OUTBOX_POLL_SECONDS: float = 2.0
+    EMAIL_OUTBOX_LEASE_SECONDS: int = 300  # A claimed job is retried if not finished within this
+    EMAIL_MAX_ATTEMPTS: int = 8
+    EMAIL_RETRY_BASE_SECONDS: float = 30.0
+    EMAIL_RETRY_MAX_SECONDS: float = 3600.0
+
+    # Bulk user import
+    BULK_IMPORT_BATCH_SIZE: int = 500  # Rows per duplicate check / insert / commit
+    BULK_IMPORT_MAX_BYTES: int = 50 * 1024 * 1024
+    BULK_IMPORT_MAX_ROWS: int = 50000
+    BULK_IMPORT_HASH_EXECUTOR: str = "process"  # "thread" or "process"
+    BULK_IMPORT_HASH_WORKERS: int = 4
+
+    # Team activity log (write-behind)
+    TEAM_ACTIVITY_BATCH_SIZE: int = 200
+    TEAM_ACTIVITY_FLUSH_INTERVAL_SECONDS: float = 1.0
+    TEAM_ACTIVITY_BUFFER_SIZE: int = 10000  # Events held while the database is slow; extra events are dropped
+    TEAM_ACTIVITY_MAX_ATTEMPTS: int = 30  # Failed flushes of the same batch before it is dropped
+
+    # Model catalog (in-memory index per worker)
+    MODEL_CATALOG_REFRESH_SECONDS: float = 5.0  # Poll for changes made by other workers
+    MODEL_CATALOG_REFRESH_OVERLAP_SECONDS: float = 30.0  # Re-read window; must exceed the longest catalog write transaction
+    MODEL_CATALOG_CACHE_MAX_AGE_SECONDS: int = 30
+    MODEL_CATALOG_IMPORT_BATCH_SIZE: int = 500  # Cards per lookup / executemany / commit
+    MODEL_CATALOG_IMPORT_MAX_BYTES: int = 500 * 1024 * 1024  # Upload cap for POST /models/import
+    MODEL_CATALOG_RECOMMEND_REBUILD_SECONDS: float = 60.0  # Min gap between recommender rebuilds after changes
+    MODEL_CATALOG_RECOMMEND_CACHE_SIZE: int = 10000  # Models whose similar-model lists are kept
+
+    # Inference serving
+    INFERENCE_MODELS: str = ""  # e.g. "sentiment=reference,writer=echo,fraud=onnx:/models/fraud.onnx"
+    INFERENCE_WORKERS: int = 2  # Worker threads shared by all models; one running batch each
+    INFERENCE_MAX_BATCH_SIZE: int = 32
+    INFERENCE_MAX_WAIT_MS: float = 5.0  # How long the first input of a batch waits for company
+    INFERENCE_MAX_QUEUE: int = 1024  # Queued inputs per model before 503
+    INFERENCE_MAX_INPUTS_PER_REQUEST: int = 64
+    INFERENCE_MAX_STREAMS: int = 16  # Concurrent generations per model before 503
+    INFERENCE_MAX_NEW_TOKENS: int = 512
+    INFERENCE_STREAM_BUFFER_TOKENS: int = 32  # Tokens generated ahead of a slow client
+
     class Config:
         env_file = ".env"
         env_file_encoding = 'utf-8'
@@ -1,10 +1,20 @@
 # services/auth_user_management/database.py
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, make_url, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from services.auth_user_management.config import get_settings
+from services.auth_user_management.db_routing import ReplicaSet, RoutingSession
+from services.auth_user_management.metrics import (
+    db_pool_checkout_wait_seconds,
+    db_pool_connections_in_use,
+    db_pool_overflow_connections,
+    db_pool_timeouts_total,
+)
+from typing import List, Optional
 import time
 import logging
 
@@ -13,46 +23,235 @@ settings = get_settings()
 # Configure logging
 logger = logging.getLogger(__name__)
 
-def create_db_engine(retries=3, delay=1):
-    """Create database engine with retry logic"""
-    for attempt in range(retries):
-        try:
-            # Log settings (without password)
-            logger.info(f"Database settings: HOST={settings.DB_HOST}, "
-                       f"PORT={settings.DB_PORT}, USER={settings.DB_USERNAME}, "
-                       f"DB={settings.DB_NAME}")
-            
-            DATABASE_URL = f"mysql+mysqlconnector://{settings.DB_USERNAME}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
-            
-            logger.info(f"Attempting to connect to database (attempt {attempt + 1}/{retries})")
-            
-            engine = create_engine(
-                DATABASE_URL,
-                pool_pre_ping=True,
-                pool_recycle=3600,
-                pool_size=5,
-                max_overflow=10,
-                pool_timeout=30
+# -----------------------------------------------------------------------------
+# Pool instrumentation
+# Checkout wait and timeouts are timed around QueuePool._do_get, the only
+# place a caller blocks, and overflow is read once a get or return has
+# settled. The in-use gauge follows the pool's checkout/checkin events.
+# -----------------------------------------------------------------------------
+_pool_classes = {}
+
+def instrumented_pool_class(base, label: str):
+    """Subclass of a queue pool that records checkout metrics under `label`"""
+    key = (base, label)
+    if key not in _pool_classes:
+        class InstrumentedPool(base):
+            def _do_get(self):
+                started = time.perf_counter()
+                try:
+                    return super()._do_get()
+                except PoolTimeoutError:
+                    db_pool_timeouts_total.labels(pool=label).inc()
+                    raise
+                finally:
+                    db_pool_checkout_wait_seconds.labels(pool=label).observe(time.perf_counter() - started)
+                    self._record_overflow()
+
+            def _do_return_conn(self, record):
+                try:
+                    super()._do_return_conn(record)
+                finally:
+                    self._record_overflow()
+
+            def _record_overflow(self):
+                # overflow() counts down from -pool_size while the pool fills
+                db_pool_overflow_connections.labels(pool=label).set(max(0, self.overflow()))
+
+        InstrumentedPool.__name__ = InstrumentedPool.__qualname__ = f"Instrumented{base.__name__}"
+        _pool_classes[key] = InstrumentedPool
+    return _pool_classes[key]
+
+def instrument_pool_events(engine, label: str) -> None:
+    """Track connections in use for an engine's pool (any pool class)"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        db_pool_connections_in_use.labels(pool=label).inc()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        db_pool_connections_in_use.labels(pool=label).dec()
+
+def pool_options(base, label: str, pool_size: int, max_overflow: int) -> dict:
+    """Engine keyword arguments for a MySQL connection pool, from Settings"""
+    return dict(
+        poolclass=instrumented_pool_class(base, label),
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS
+    )
+
+def get_database_url() -> str:
+    """Sync driver URL, used by scripts, the audit writer and health checks"""
+    if settings.ASYNC_DATABASE_URL and settings.ASYNC_DATABASE_URL.startswith("sqlite"):
+        # Same SQLite file as the async engine, through the stdlib driver
+        return make_url(settings.ASYNC_DATABASE_URL).set(drivername="sqlite").render_as_string(hide_password=False)
+    return (
+        f"mysql+mysqlconnector://{settings.DB_USERNAME}:{settings.DB_PASSWORD}"
+        f"@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
+    )
+
+def create_db_engine():
+    """Create the sync engine; no connection is opened until first use"""
+    url = get_database_url()
+    if url.startswith("sqlite"):
+        engine = create_engine(url, connect_args={"check_same_thread": False})
+    else:
+        engine = create_engine(
+            url,
+            **pool_options(QueuePool, "sync", settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW)
+        )
+    instrument_pool_events(engine, "sync")
+    return engine
+
+def get_async_database_url() -> str:
+    """Async driver URL for the same database (aiomysql by default)"""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    return (
+        f"mysql+{settings.DB_ASYNC_DRIVER}://{settings.DB_USERNAME}:{settings.DB_PASSWORD}"
+        f"@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
+    )
+
+def get_replica_async_database_urls() -> List[str]:
+    """Async URLs of the read replicas; empty when none are configured"""
+    if settings.ASYNC_REPLICA_DATABASE_URLS:
+        return [url.strip() for url in settings.ASYNC_REPLICA_DATABASE_URLS.split(",") if url.strip()]
+    urls = []
+    for entry in settings.DB_REPLICA_HOSTS.split(","):
+        host, _, port = entry.strip().partition(":")
+        if host:
+            urls.append(
+                f"mysql+{settings.DB_ASYNC_DRIVER}://{settings.DB_USERNAME}:{settings.DB_PASSWORD}"
+                f"@{host}:{port or settings.DB_PORT}/{settings.DB_NAME}"
             )
-            
-            # Test the connection
-            with engine.connect() as conn:
-                conn.execute(text("SELECT 1"))
-                logger.info("Database connection successful!")
-            return engine
-            
-        except Exception as e:
-            logger.error(f"Database connection error: {str(e)}")
-            if attempt == retries - 1:
-                raise
-            logger.warning(f"Retrying in {delay} seconds...")
-            time.sleep(delay)
-            delay *= 2
+    return urls
+
+def create_async_db_engine(url: Optional[str] = None, label: str = "primary",
+                           pool_size: Optional[int] = None, max_overflow: Optional[int] = None):
+    """Create an async engine used by request handlers (the primary by default)"""
+    url = url or get_async_database_url()
+    if url.startswith("sqlite"):
+        # aiosqlite fallback for local runs and tests; SQLite has no server-side pool
+        engine = create_async_engine(url, connect_args={"check_same_thread": False})
+    else:
+        engine = create_async_engine(
+            url,
+            **pool_options(
+                AsyncAdaptedQueuePool,
+                label,
+                settings.DB_POOL_SIZE if pool_size is None else pool_size,
+                settings.DB_MAX_OVERFLOW if max_overflow is None else max_overflow
+            )
+        )
+    instrument_pool_events(engine, label)
+    return engine
 
-# Create engine with retry logic
-engine = create_db_engine()
+# -----------------------------------------------------------------------------
+# Lazy engines
+# Importing this module (from main, Alembic, scripts or OpenAPI generation)
+# must not need a reachable database. Engines are built on first use, or
+# eagerly by init_engines() in the application lifespan; `engine` and
+# `async_engine` remain importable names via the module __getattr__ below.
+# -----------------------------------------------------------------------------
+_engine = None
+_async_engine = None
+_replica_set: Optional[ReplicaSet] = None
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def init_engines():
+    """Create the engines and bind the session factories; safe to call repeatedly"""
+    global _engine, _async_engine, _replica_set
+    if _engine is None:
+        _engine = create_db_engine()
+        SessionLocal.configure(bind=_engine)
+    if _async_engine is None:
+        _async_engine = create_async_db_engine()
+        AsyncSessionLocal.configure(bind=_async_engine)
+    if _replica_set is None:
+        replicas = {}
+        for i, url in enumerate(get_replica_async_database_urls()):
+            name = f"replica-{i}"
+            replicas[name] = create_async_db_engine(
+                url, name, settings.DB_REPLICA_POOL_SIZE, settings.DB_REPLICA_MAX_OVERFLOW
+            )
+        _replica_set = ReplicaSet(
+            replicas,
+            check_interval=settings.DB_REPLICA_HEALTH_CHECK_SECONDS,
+            check_timeout=settings.DB_REPLICA_HEALTH_TIMEOUT_SECONDS
+        )
+        ReadSessionLocal.configure(primary=_async_engine, replicas=_replica_set)
+
+def get_engine():
+    if _engine is None:
+        init_engines()
+    return _engine
+
+def get_async_engine():
+    if _async_engine is None:
+        init_engines()
+    return _async_engine
+
+def get_replica_set() -> ReplicaSet:
+    if _replica_set is None:
+        init_engines()
+    return _replica_set
+
+async def dispose_engines():
+    """Close pooled connections on shutdown"""
+    global _engine, _async_engine, _replica_set
+    if _replica_set is not None:
+        await _replica_set.stop()
+        for replica in _replica_set.engines.values():
+            await replica.dispose()
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
+    _engine = _async_engine = _replica_set = None
+    SessionLocal.configure(bind=None)
+    AsyncSessionLocal.configure(bind=None)
+    ReadSessionLocal.configure(primary=None, replicas=None)
+
+def __getattr__(name):
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class LazySessionmaker(sessionmaker):
+    """sessionmaker that creates the engines the first time a session is made"""
+
+    def __call__(self, **local_kw):
+        if _async_engine is None:
+            init_engines()
+        return super().__call__(**local_kw)
+
+SessionLocal = LazySessionmaker(autocommit=False, autoflush=False)
+
+# expire_on_commit=False: attributes stay readable after commit without
+# triggering an implicit (and, under asyncio, illegal) lazy refresh
+AsyncSessionLocal = LazySessionmaker(
+    class_=AsyncSession,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Sessions for read-mostly endpoints. Reads go to a healthy replica until the
+# session writes, then everything goes to the primary (see db_routing).
+# Replication lag means another request's recent write may not be visible
+# yet; re-read from the primary with db_routing.pin_primary where it matters.
+ReadSessionLocal = LazySessionmaker(
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False
+)
 
 Base = declarative_base()
 
@@ -68,13 +267,47 @@ def get_db():
     finally:
         db.close()
 
-def verify_db_connection():
-    """Verify database connection is working"""
-    with SessionLocal() as session:
+async def get_async_db():
+    """Get async database session with error handling"""
+    async with AsyncSessionLocal() as db:
         try:
-            session.execute(text("SELECT 1"))
+            yield db
+        except OperationalError as e:
+            logger.error(f"Database operation failed: {str(e)}")
+            await db.rollback()
+            raise
+
+async def get_async_read_db():
+    """Get an async routing session: reads from a replica, writes pinned to the primary"""
+    async with ReadSessionLocal() as db:
+        try:
+            yield db
+        except OperationalError as e:
+            logger.error(f"Database operation failed: {str(e)}")
+            await db.rollback()
+            raise
+
+def verify_db_connection(retries=3, delay=1):
+    """Verify database connection is working, retrying with backoff
+
+    Blocking; the lifespan runs it in a worker thread.
+    """
+    # Log settings (without password)
+    logger.info(f"Database settings: HOST={settings.DB_HOST}, "
+               f"PORT={settings.DB_PORT}, USER={settings.DB_USERNAME}, "
+               f"DB={settings.DB_NAME}")
+    for attempt in range(retries):
+        logger.info(f"Attempting to connect to database (attempt {attempt + 1}/{retries})")
+        try:
+            with get_engine().connect() as conn:
+                conn.execute(text("SELECT 1"))
+            logger.info("Database connection successful!")
             return True
         except Exception as e:
             logger.error(f"Database connection failed: {str(e)}")
-            return False
+            if attempt == retries - 1:
+                return False
+            logger.warning(f"Retrying in {delay} seconds...")
+            time.sleep(delay)
+            delay *= 2
 
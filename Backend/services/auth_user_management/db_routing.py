@@ -0,0 +1,164 @@
+"""
+services/auth_user_management/db_routing.py
+
+Read-replica routing for ORM sessions.
+
+`RoutingSession` sends reads to a healthy replica and everything else to the
+primary. The first write (a flush, INSERT/UPDATE/DELETE, SELECT ... FOR
+UPDATE or raw SQL) pins the session to the primary for the rest of its life,
+so a request always reads its own writes. A session keeps the replica it
+first picked, so its reads see one consistent copy of the data.
+
+`ReplicaSet` health-checks the replicas in the background and balances
+sessions across the healthy ones by connections in use. With no healthy
+replica, reads fall back to the primary.
+"""
+import asyncio
+import itertools
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.sql.selectable import Select
+
+from services.auth_user_management.logger import setup_logger
+from services.auth_user_management.metrics import db_read_routing_total, db_replica_healthy
+
+logger = setup_logger("db_routing")
+
+
+class ReplicaSet:
+    """Replica engines with their health, and the choice of one per session"""
+
+    def __init__(self, engines: Dict[str, AsyncEngine], check_interval: float = 5.0, check_timeout: float = 2.0):
+        self.engines = engines
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        # Replicas start healthy; the first check runs as soon as the app starts
+        self._healthy: List[str] = list(engines)
+        self._rotation = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+        for name in engines:
+            db_replica_healthy.labels(replica=name).set(1)
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    @property
+    def healthy(self) -> List[str]:
+        return list(self._healthy)
+
+    def choose(self) -> Optional[AsyncEngine]:
+        """Healthy replica with the fewest connections in use, or None"""
+        healthy = self._healthy
+        if not healthy:
+            return None
+        # Rotate the starting point so ties are spread round-robin
+        start = next(self._rotation) % len(healthy)
+        candidates = healthy[start:] + healthy[:start]
+        name = min(candidates, key=lambda n: _checked_out(self.engines[n]))
+        return self.engines[name]
+
+    async def check(self) -> None:
+        """Ping every replica and update the healthy list"""
+        names = list(self.engines)
+        results = await asyncio.gather(*(self._ping(self.engines[name]) for name in names))
+        healthy = []
+        for name, ok in zip(names, results):
+            if ok:
+                healthy.append(name)
+            if ok != (name in self._healthy):
+                logger.warning(f"Replica {name} is now {'healthy' if ok else 'unhealthy'}")
+            db_replica_healthy.labels(replica=name).set(1 if ok else 0)
+        self._healthy = healthy
+
+    async def _ping(self, engine: AsyncEngine) -> bool:
+        async def select_one():
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        try:
+            await asyncio.wait_for(select_one(), self.check_timeout)
+            return True
+        except Exception as e:
+            logger.error(f"Replica health check failed for {engine.url.host or engine.url}: {str(e)}")
+            return False
+
+    async def start(self) -> None:
+        if self._task is None and self.engines:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.check_interval)
+
+
+def _checked_out(engine: AsyncEngine) -> int:
+    checkedout = getattr(engine.sync_engine.pool, "checkedout", None)
+    return checkedout() if checkedout is not None else 0
+
+
+def _is_write(clause) -> bool:
+    if clause is None:
+        return False
+    if isinstance(clause, UpdateBase):
+        return True
+    if isinstance(clause, Select):
+        # Row locks only mean something on the primary
+        return clause._for_update_arg is not None
+    # Raw SQL and anything else we can't classify
+    return True
+
+
+class RoutingSession(Session):
+    """Sync session behind an AsyncSession; see the module docstring"""
+
+    def __init__(self, primary: AsyncEngine = None, replicas: ReplicaSet = None, **kw):
+        super().__init__(**kw)
+        self.primary = primary
+        self.replicas = replicas
+        self.pinned = replicas is None or not replicas
+        self._read_bind = None
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if not self.pinned and (self._flushing or _is_write(clause)):
+            self.pinned = True
+        if self.pinned:
+            return self.primary.sync_engine
+        if self._read_bind is None:
+            replica = self.replicas.choose()
+            db_read_routing_total.labels(target="replica" if replica is not None else "primary").inc()
+            self._read_bind = (replica or self.primary).sync_engine
+        return self._read_bind
+
+    def pin_primary(self) -> bool:
+        """Send everything from now on to the primary; True if reads were going elsewhere"""
+        was_reading_replica = (
+            not self.pinned
+            and self._read_bind is not None
+            and self._read_bind is not self.primary.sync_engine
+        )
+        self.pinned = True
+        return was_reading_replica
+
+
+def pin_primary(db: AsyncSession) -> bool:
+    """Pin a session to the primary, e.g. before re-reading something a replica may lack.
+
+    True if the session had been reading from a replica; always False for
+    plain sessions, which only ever use the primary.
+    """
+    sync_session = db.sync_session
+    return sync_session.pin_primary() if isinstance(sync_session, RoutingSession) else False
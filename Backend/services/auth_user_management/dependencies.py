@@ -0,0 +1,53 @@
+"""
+services/auth_user_management/dependencies.py
+
+Authentication dependencies shared by the routers and by `rbac.require`.
+"""
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from jose import JWTError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.auth_user_management.database import get_async_read_db
+from services.auth_user_management.db_routing import pin_primary
+from services.auth_user_management.models import User
+from services.auth_user_management.principal_cache import UserPrincipal, principal_cache
+from services.auth_user_management.token_cache import decode_access_token
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_read_db)
+) -> UserPrincipal:
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        payload = decode_access_token(token)
+        email: str = payload.get("sub")
+        if email is None:
+            raise credentials_exception
+    except JWTError:
+        raise credentials_exception
+        
+    # Steady state: no DB round-trip, the session never checks out a connection
+    principal = principal_cache.get(email)
+    if principal is not None:
+        return principal
+
+    query = select(User).where(User.email == email)
+    user = (await db.execute(query)).scalars().first()
+    if user is None and pin_primary(db):
+        # A replica may lag behind a user created moments ago
+        user = (await db.execute(query)).scalars().first()
+    if user is None:
+        raise credentials_exception
+
+    principal = UserPrincipal.from_user(user)
+    principal_cache.put(principal, payload.get("exp"))
+    return principal
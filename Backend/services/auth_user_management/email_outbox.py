@@ -0,0 +1,373 @@
+"""
+services/auth_user_management/email_outbox.py
+
+Transactional outbox for outbound email.
+
+Request handlers never talk to SMTP. They add an `EmailOutbox` row in the
+same transaction as the change that triggered the email, so a signup is
+committed together with its verification email or not at all. A background
+worker claims due jobs in batches, sends them over a small pool of
+authenticated SMTP connections and retries failures with exponential
+backoff. An SMTP outage therefore delays email instead of failing requests.
+"""
+import asyncio
+import queue
+import random
+import smtplib
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.message import Message
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.auth_user_management.config import get_settings
+from services.auth_user_management.database import AsyncSessionLocal
+from services.auth_user_management.email import EMAIL_BUILDERS
+from services.auth_user_management.logger import setup_logger
+from services.auth_user_management.metrics import (
+    email_outbox_batch_size,
+    email_outbox_lag_seconds,
+    email_send_duration_seconds,
+    email_send_failures_total,
+    emails_sent_total,
+)
+from services.auth_user_management.models import EmailOutbox
+
+logger = setup_logger("email_outbox")
+
+settings = get_settings()
+
+# Idle connections older than this are checked with NOOP before reuse
+SMTP_IDLE_CHECK_SECONDS = 30.0
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands timezone-aware columns back naive
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+# -----------------------------------------------------------------------------
+# Transports
+# `send` blocks and is always called from the worker's thread pool.
+# -----------------------------------------------------------------------------
+class EmailTransport(ABC):
+    @abstractmethod
+    def send(self, message: Message) -> None:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class SMTPConnectionPool(EmailTransport):
+    """Reuses up to `size` authenticated SMTP connections across sends"""
+
+    def __init__(self, size: int, host: str, port: int, username: str, password: str, timeout: float = 30.0):
+        self.size = max(1, size)
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        # LIFO keeps the most recently used (warmest) connections in play
+        self._idle: "queue.LifoQueue[Tuple[smtplib.SMTP, float]]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+
+    def _connect(self) -> smtplib.SMTP:
+        conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            conn.starttls()
+            conn.login(self.username, self.password)
+        except Exception:
+            _close_quietly(conn)
+            raise
+        return conn
+
+    def _checkout(self) -> smtplib.SMTP:
+        while True:
+            try:
+                conn, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if time.monotonic() - last_used < SMTP_IDLE_CHECK_SECONDS:
+                return conn
+            try:
+                if conn.noop()[0] == 250:
+                    return conn
+            except (smtplib.SMTPException, OSError):
+                pass
+            _close_quietly(conn)
+
+    def send(self, message: Message) -> None:
+        with self._slots:
+            conn = self._checkout()
+            try:
+                conn.send_message(message)
+            except (smtplib.SMTPServerDisconnected, OSError):
+                # The connection itself is broken; don't hand it out again
+                _close_quietly(conn)
+                raise
+            except smtplib.SMTPException:
+                # Message-level rejection, the session is still usable
+                self._idle.put((conn, time.monotonic()))
+                raise
+            self._idle.put((conn, time.monotonic()))
+
+    def close(self) -> None:
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            _close_quietly(conn)
+
+
+class MemoryTransport(EmailTransport):
+    """Keeps messages in-process; stands in for SMTP in tests and local dev"""
+
+    def __init__(self):
+        self.messages: List[Message] = []
+        self._lock = threading.Lock()
+
+    def send(self, message: Message) -> None:
+        with self._lock:
+            self.messages.append(message)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.messages.clear()
+
+
+def _close_quietly(conn: smtplib.SMTP) -> None:
+    try:
+        conn.quit()
+    except (smtplib.SMTPException, OSError):
+        conn.close()
+
+
+def create_email_transport() -> EmailTransport:
+    if settings.EMAIL_TRANSPORT == "memory":
+        return MemoryTransport()
+    if settings.EMAIL_TRANSPORT == "smtp":
+        return SMTPConnectionPool(
+            size=settings.EMAIL_SMTP_POOL_SIZE,
+            host=settings.SMTP_SERVER,
+            port=settings.SMTP_PORT,
+            username=settings.SMTP_USERNAME,
+            password=settings.SMTP_PASSWORD,
+            timeout=settings.EMAIL_SMTP_TIMEOUT_SECONDS
+        )
+    raise ValueError(f"Unknown email transport: {settings.EMAIL_TRANSPORT}")
+
+
+def _is_permanent(error: Exception) -> bool:
+    """Failures that retrying will not fix"""
+    if isinstance(error, (smtplib.SMTPRecipientsRefused, KeyError)):
+        return True
+    return isinstance(error, smtplib.SMTPResponseException) and 500 <= error.smtp_code < 600
+
+
+# -----------------------------------------------------------------------------
+# Enqueueing
+# -----------------------------------------------------------------------------
+def enqueue_email(db: AsyncSession, kind: str, to_email: str, token: str) -> EmailOutbox:
+    """Add an email job to the caller's transaction; it is sent after commit"""
+    if kind not in EMAIL_BUILDERS:
+        raise ValueError(f"Unknown email kind: {kind}")
+    job = EmailOutbox(kind=kind, to_email=to_email, token=token)
+    db.add(job)
+    return job
+
+
+async def enqueue_emails(db: AsyncSession, kind: str, recipients: Iterable[Tuple[str, str]]) -> None:
+    """Queue many (to_email, token) jobs with a single executemany insert"""
+    if kind not in EMAIL_BUILDERS:
+        raise ValueError(f"Unknown email kind: {kind}")
+    rows = [{"kind": kind, "to_email": to_email, "token": token} for to_email, token in recipients]
+    if rows:
+        await db.execute(insert(EmailOutbox), rows)
+
+
+def queue_verification_email(db: AsyncSession, to_email: str, verification_token: str) -> EmailOutbox:
+    return enqueue_email(db, "verification", to_email, verification_token)
+
+
+def queue_password_reset_email(db: AsyncSession, to_email: str, reset_token: str) -> EmailOutbox:
+    return enqueue_email(db, "password_reset", to_email, reset_token)
+
+
+# -----------------------------------------------------------------------------
+# Worker
+# -----------------------------------------------------------------------------
+class EmailOutboxWorker:
+    """Drains the outbox from a background task on the event loop.
+
+    Jobs are claimed with FOR UPDATE SKIP LOCKED and leased for
+    `lease_seconds`, so several app workers can poll the same table and a
+    job claimed by a process that died is picked up again once its lease
+    runs out.
+    """
+
+    def __init__(
+        self,
+        transport: EmailTransport,
+        session_factory=AsyncSessionLocal,
+        batch_size: int = 50,
+        poll_seconds: float = 2.0,
+        lease_seconds: int = 300,
+        max_attempts: int = 8,
+        retry_base_seconds: float = 30.0,
+        retry_max_seconds: float = 3600.0
+    ):
+        self.transport = transport
+        self.session_factory = session_factory
+        self.batch_size = max(1, batch_size)
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max(1, max_attempts)
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            # One thread per pooled connection, so sends never queue on the pool
+            workers = getattr(self.transport, "size", 1)
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="email-outbox")
+        return self._executor
+
+    def retry_delay(self, attempts: int) -> float:
+        delay = min(self.retry_max_seconds, self.retry_base_seconds * (2 ** max(0, attempts - 1)))
+        # Jitter so jobs that failed together don't all retry together
+        return delay * random.uniform(0.8, 1.2)
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._stopping = False
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Email outbox worker started ({type(self.transport).__name__})")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Email outbox worker did not stop in time; claimed jobs will be retried")
+            self._task.cancel()
+        self._task = None
+        self.transport.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def wake(self) -> None:
+        """Poll right away instead of waiting for the next interval"""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                processed = await self.process_batch()
+            except Exception:
+                logger.exception("Email outbox batch failed")
+                processed = 0
+            if processed < self.batch_size and not self._stopping:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+
+    async def process_batch(self) -> int:
+        """Claim and deliver one batch of due jobs; returns how many were claimed"""
+        now = _utcnow()
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(EmailOutbox)
+                .where(
+                    EmailOutbox.status.in_(("pending", "sending")),
+                    EmailOutbox.next_attempt_at <= now
+                )
+                .order_by(EmailOutbox.next_attempt_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            jobs = result.scalars().all()
+            if not jobs:
+                return 0
+
+            lease_until = now + timedelta(seconds=self.lease_seconds)
+            for job in jobs:
+                job.status = "sending"
+                job.attempts += 1
+                job.next_attempt_at = lease_until
+            await db.commit()
+            email_outbox_batch_size.observe(len(jobs))
+
+            errors = await asyncio.gather(*(self._deliver(job) for job in jobs))
+
+            finished = _utcnow()
+            for job, error in zip(jobs, errors):
+                if error is None:
+                    job.status = "sent"
+                    job.sent_at = finished
+                    job.last_error = None
+                    emails_sent_total.labels(kind=job.kind).inc()
+                    email_outbox_lag_seconds.observe((finished - _as_utc(job.created_at)).total_seconds())
+                    continue
+
+                job.last_error = f"{type(error).__name__}: {error}"[:1000]
+                if _is_permanent(error) or job.attempts >= self.max_attempts:
+                    job.status = "dead"
+                    email_send_failures_total.labels(kind=job.kind, outcome="dead").inc()
+                    logger.error(f"Giving up on email job {job.id} after {job.attempts} attempt(s): {job.last_error}")
+                else:
+                    job.status = "pending"
+                    job.next_attempt_at = finished + timedelta(seconds=self.retry_delay(job.attempts))
+                    email_send_failures_total.labels(kind=job.kind, outcome="retry").inc()
+                    logger.warning(f"Email job {job.id} failed, retrying at {job.next_attempt_at}: {job.last_error}")
+            await db.commit()
+        return len(jobs)
+
+    async def _deliver(self, job: EmailOutbox) -> Optional[Exception]:
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._get_executor(), self._send, job.kind, job.to_email, job.token)
+        except Exception as e:
+            return e
+        return None
+
+    def _send(self, kind: str, to_email: str, token: str) -> None:
+        message = EMAIL_BUILDERS[kind](to_email, token)
+        started = time.monotonic()
+        self.transport.send(message)
+        email_send_duration_seconds.observe(time.monotonic() - started)
+
+
+email_worker = EmailOutboxWorker(
+    transport=create_email_transport(),
+    batch_size=settings.EMAIL_OUTBOX_BATCH_SIZE,
+    poll_seconds=settings.EMAIL_OUTBOX_POLL_SECONDS,
+    lease_seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS,
+    max_attempts=settings.EMAIL_MAX_ATTEMPTS,
+    retry_base_seconds=settings.EMAIL_RETRY_BASE_SECONDS,
+    retry_max_seconds=settings.EMAIL_RETRY_MAX_SECONDS
+)
@@ -1,10 +1,27 @@
+import atexit
+import json
 import logging
+import os
+import queue
 import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from functools import partial
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
-from datetime import datetime
-from typing import Optional
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
 from fastapi import Request
+from pythonjsonlogger import jsonlogger
+from services.auth_user_management.config import get_settings
+from services.auth_user_management.metrics import (
+    audit_batch_size,
+    audit_sink_errors_total,
+    log_records_dropped_total,
+)
+
+settings = get_settings()
 
 # Create logs directory if it doesn't exist
 logs_dir = Path("logs")
@@ -16,23 +33,59 @@ class SecurityLogger(logging.Logger):
         self.log(25, msg, *args, **kwargs)  # Level 25 is between INFO and WARNING
 
 class AuditLogger:
-    def __init__(self, logger: logging.Logger):
-        self.logger = logger
+    """Structured audit events.
+
+    Each event is a log record whose message is the event name and whose
+    context travels as record attributes. Nothing is formatted on the
+    request path: the audit writer thread renders records as compact JSON
+    lines (and optionally bulk-inserts them) in batches.
+
+    Safe to create at import time: the writer thread and the audit file are
+    only started on the first event.
+    """
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        self._logger = logger
+
+    @property
+    def logger(self) -> logging.Logger:
+        if self._logger is None:
+            self._logger = get_audit_logger()
+        return self._logger
+
+    def log_event(
+        self,
+        kind: str,
+        event: str,
+        actor: Optional[str] = None,
+        ip: Optional[str] = None,
+        target: Optional[str] = None,
+        details: Optional[str] = None,
+        level: int = logging.INFO
+    ):
+        """Record a single audit event"""
+        self.logger.log(level, event, extra={
+            "kind": kind,
+            "actor": actor,
+            "ip": ip,
+            "target": target,
+            "details": details,
+        })
 
     def log_security_event(
-        self, 
+        self,
         event_type: str,
         user_email: Optional[str],
         request: Request,
         details: str
     ):
         """Log security-related events with context"""
-        self.logger.security(
-            f"Security Event: {event_type} | "
-            f"User: {user_email or 'anonymous'} | "
-            f"IP: {request.client.host} | "
-            f"Details: {details} | "
-            f"Timestamp: {datetime.utcnow()}"
+        self.log_event(
+            "security",
+            event_type,
+            actor=user_email,
+            ip=request.client.host if request.client else None,
+            details=details,
+            level=25
         )
 
     def log_admin_action(
@@ -43,38 +96,260 @@ class AuditLogger:
         details: str
     ):
         """Log administrative actions"""
-        self.logger.info(
-            f"Admin Action: {action} | "
-            f"Admin: {admin_email} | "
-            f"Target: {target} | "
-            f"Details: {details} | "
-            f"Timestamp: {datetime.utcnow()}"
-        )
+        self.log_event("admin", action, actor=admin_email, target=target, details=details)
 
 # Register custom log level
 logging.addLevelName(25, "SECURITY")
 
-# Create logger instance
-def setup_logger(name: str) -> logging.Logger:
-    logger = SecurityLogger(name)
-    
-    # Set format
-    formatter = logging.Formatter(
-        '%(asctime)s | %(levelname)s | %(name)s | %(message)s'
-    )
-    
+LOG_FORMAT = '%(asctime)s | %(levelname)s | %(name)s | %(message)s'
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Hands records to the background writer without blocking the caller.
+
+    Records are queued unformatted: formatting happens on the writer thread,
+    which is safe because the queue never leaves this process. When the queue
+    is full the record is dropped and counted, unless the overflow policy is
+    "block".
+    """
+    def __init__(self, log_queue: queue.Queue, overflow: str = "drop"):
+        super().__init__(log_queue)
+        self.block_on_overflow = overflow == "block"
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.block_on_overflow:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_records_dropped_total.labels(level=record.levelname).inc()
+
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+_queue_handler = NonBlockingQueueHandler(_log_queue, settings.LOG_QUEUE_OVERFLOW)
+_listener: Optional[QueueListener] = None
+_loggers: Dict[str, logging.Logger] = {}
+_setup_lock = threading.Lock()
+
+def _start_listener() -> None:
+    """Start the single background writer shared by every logger"""
+    global _listener
+    formatter = logging.Formatter(LOG_FORMAT)
+
     # Console handler
-    console_handler = logging.StreamHandler()
+    console_handler = logging.StreamHandler(sys.stderr)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # File handler for security events
-    security_handler = logging.FileHandler('security.log')
+
+    # Rotating file handler for security events
+    security_handler = RotatingFileHandler(
+        logs_dir / 'security.log',
+        maxBytes=settings.LOG_FILE_MAX_BYTES,
+        backupCount=settings.LOG_FILE_BACKUP_COUNT
+    )
     security_handler.setFormatter(formatter)
     security_handler.setLevel(25)  # SECURITY level
-    logger.addHandler(security_handler)
-    
-    # Set overall level
-    logger.setLevel(logging.DEBUG)
-    
-    return logger 
\ No newline at end of file
+
+    _listener = QueueListener(_log_queue, console_handler, security_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+def stop_logging() -> None:
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+# Create logger instance
+def setup_logger(name: str) -> logging.Logger:
+    """Return the named logger, creating it once.
+
+    Loggers only enqueue records; a single QueueListener thread formats and
+    writes them. Calling this again with the same name returns the same
+    logger without adding handlers.
+    """
+    with _setup_lock:
+        logger = _loggers.get(name)
+        if logger is not None:
+            return logger
+
+        if _listener is None:
+            _start_listener()
+
+        logger = SecurityLogger(name)
+        logger.addHandler(_queue_handler)
+        # Disabled levels are rejected before the message is built, so use
+        # %-style arguments rather than f-strings for anything below this
+        logger.setLevel(settings.LOG_LEVEL.upper())
+        _loggers[name] = logger
+        return logger
+
+# -----------------------------------------------------------------------------
+# Audit log pipeline
+# -----------------------------------------------------------------------------
+class AuditSink(ABC):
+    """Destination for batches of audit records"""
+    name = "sink"
+
+    @abstractmethod
+    def write_batch(self, records: List[logging.LogRecord]) -> None:
+        ...
+
+    def tick(self) -> None:
+        """Called while the writer is idle"""
+
+    def close(self) -> None:
+        pass
+
+class JsonLinesAuditSink(AuditSink):
+    """Appends one compact JSON object per event, fsyncing at most every interval"""
+    name = "file"
+
+    def __init__(self, path: Path, fsync_interval: float):
+        self._file = open(path, "a", encoding="utf-8")
+        self._fsync_interval = fsync_interval
+        self._last_fsync = time.monotonic()
+        self._dirty = False
+        self._formatter = jsonlogger.JsonFormatter(
+            "%(levelname)s %(message)s",
+            rename_fields={"levelname": "level", "message": "event"},
+            timestamp=True,
+            json_serializer=partial(json.dumps, separators=(",", ":"))
+        )
+
+    def write_batch(self, records: List[logging.LogRecord]) -> None:
+        self._file.write("\n".join(self._formatter.format(record) for record in records) + "\n")
+        self._file.flush()
+        self._dirty = True
+        self._maybe_fsync()
+
+    def _maybe_fsync(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if self._dirty and (force or now - self._last_fsync >= self._fsync_interval):
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
+            self._dirty = False
+
+    def tick(self) -> None:
+        self._maybe_fsync()
+
+    def close(self) -> None:
+        self._maybe_fsync(force=True)
+        self._file.close()
+
+class DatabaseAuditSink(AuditSink):
+    """Bulk-inserts each batch into the audit_events table with executemany"""
+    name = "database"
+
+    def write_batch(self, records: List[logging.LogRecord]) -> None:
+        # Imported here so loggers can be set up without touching the database;
+        # the sync engine is fine because this runs on the writer thread
+        from services.auth_user_management.database import engine
+        from services.auth_user_management.models import AuditEvent
+
+        rows = [
+            {
+                "created_at": datetime.fromtimestamp(record.created, timezone.utc),
+                "kind": getattr(record, "kind", None),
+                "event": record.getMessage()[:100],
+                "actor_email": getattr(record, "actor", None),
+                "ip": getattr(record, "ip", None),
+                "target": getattr(record, "target", None),
+                "details": getattr(record, "details", None),
+            }
+            for record in records
+        ]
+        with engine.begin() as conn:
+            conn.execute(AuditEvent.__table__.insert(), rows)
+
+_AUDIT_STOP = object()
+
+class AuditWriter(threading.Thread):
+    """Drains the audit queue in batches and hands each batch to every sink"""
+
+    def __init__(self, audit_queue: queue.Queue, sinks: List[AuditSink], batch_size: int, flush_interval: float):
+        super().__init__(name="audit-writer", daemon=True)
+        self.queue = audit_queue
+        self.sinks = sinks
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+    def run(self) -> None:
+        stopping = False
+        while not stopping:
+            try:
+                record = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                for sink in self.sinks:
+                    sink.tick()
+                continue
+
+            # Whatever queued up while the last batch was written goes out together
+            batch = []
+            while record is not _AUDIT_STOP:
+                batch.append(record)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    record = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            else:
+                stopping = True
+
+            if batch:
+                self._write(batch)
+
+        for sink in self.sinks:
+            sink.close()
+
+    def _write(self, batch: List[logging.LogRecord]) -> None:
+        audit_batch_size.observe(len(batch))
+        for sink in self.sinks:
+            try:
+                sink.write_batch(batch)
+            except Exception as e:
+                audit_sink_errors_total.labels(sink=sink.name).inc()
+                setup_logger("audit_writer").error(f"Audit sink {sink.name} failed: {str(e)}")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self.queue.put(_AUDIT_STOP)
+        self.join(timeout)
+
+_audit_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=settings.AUDIT_QUEUE_SIZE)
+_audit_writer: Optional[AuditWriter] = None
+_audit_logger: Optional[logging.Logger] = None
+
+def get_audit_logger() -> logging.Logger:
+    """Logger feeding the audit writer; starts the writer on first use"""
+    global _audit_writer, _audit_logger
+    with _setup_lock:
+        if _audit_logger is not None:
+            return _audit_logger
+
+        sinks: List[AuditSink] = [
+            JsonLinesAuditSink(logs_dir / settings.AUDIT_LOG_FILE, settings.AUDIT_FSYNC_INTERVAL_SECONDS)
+        ]
+        if settings.AUDIT_DB_SINK_ENABLED:
+            sinks.append(DatabaseAuditSink())
+        _audit_writer = AuditWriter(
+            _audit_queue,
+            sinks,
+            batch_size=settings.AUDIT_BATCH_SIZE,
+            flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS
+        )
+        _audit_writer.start()
+        atexit.register(stop_audit_writer)
+
+        _audit_logger = logging.Logger("audit", logging.INFO)
+        _audit_logger.addHandler(NonBlockingQueueHandler(_audit_queue, settings.LOG_QUEUE_OVERFLOW))
+        return _audit_logger
+
+def stop_audit_writer() -> None:
+    """Write out queued audit events and fsync before shutdown"""
+    global _audit_writer
+    if _audit_writer is not None:
+        _audit_writer.stop()
+        _audit_writer = None
@@ -1,4 +1,16 @@
-from prometheus_client import Counter, Histogram, Gauge
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+)
+from starlette.requests import Request
+from starlette.responses import Response
+import os
 import time
 
 # Request metrics
@@ -14,6 +26,20 @@ http_request_duration_seconds = Histogram(
     ['method', 'endpoint']
 )
 
+http_requests_in_progress = Gauge(
+    'http_requests_in_progress',
+    'HTTP requests currently being handled',
+    ['method'],
+    multiprocess_mode='livesum'
+)
+
+http_response_size_bytes = Histogram(
+    'http_response_size_bytes',
+    'HTTP response body size',
+    ['method', 'endpoint'],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+)
+
 # User metrics
 active_users_total = Gauge(
     'active_users_total',
@@ -44,23 +70,350 @@ rate_limit_hits = Counter(
     ['endpoint']
 )
 
+# Password hashing metrics
+password_hash_queue_wait_seconds = Histogram(
+    'password_hash_queue_wait_seconds',
+    'Time a password hashing job waited for a free worker',
+    ['operation']
+)
+
+password_hash_duration_seconds = Histogram(
+    'password_hash_duration_seconds',
+    'Time spent hashing or verifying a password',
+    ['operation']
+)
+
+password_hash_rejections_total = Counter(
+    'password_hash_rejections_total',
+    'Password hashing jobs rejected because the pool was saturated',
+    ['operation']
+)
+
+password_hash_in_flight = Gauge(
+    'password_hash_in_flight',
+    'Password hashing jobs queued or running',
+    multiprocess_mode='livesum'
+)
+
+# Auth cache metrics
+principal_cache_requests_total = Counter(
+    'principal_cache_requests_total',
+    'Principal cache lookups in get_current_user',
+    ['result']
+)
+
+token_cache_requests_total = Counter(
+    'token_cache_requests_total',
+    'Verified-token cache lookups before jwt.decode',
+    ['result']
+)
+
+# Logging pipeline metrics
+log_records_dropped_total = Counter(
+    'log_records_dropped_total',
+    'Log records dropped because the logging queue was full',
+    ['level']
+)
+
+audit_batch_size = Histogram(
+    'audit_batch_size',
+    'Audit events written per batch',
+    buckets=(1, 5, 10, 50, 100, 500, 1000)
+)
+
+audit_sink_errors_total = Counter(
+    'audit_sink_errors_total',
+    'Audit batches a sink failed to write',
+    ['sink']
+)
+
+# Email outbox metrics
+emails_sent_total = Counter(
+    'emails_sent_total',
+    'Outbox emails delivered',
+    ['kind']
+)
+
+email_send_failures_total = Counter(
+    'email_send_failures_total',
+    'Outbox delivery attempts that failed',
+    ['kind', 'outcome']  # outcome: "retry" or "dead"
+)
+
+email_send_duration_seconds = Histogram(
+    'email_send_duration_seconds',
+    'Time to hand one message to the SMTP server',
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+email_outbox_batch_size = Histogram(
+    'email_outbox_batch_size',
+    'Outbox jobs claimed per batch',
+    buckets=(1, 5, 10, 25, 50, 100, 250)
+)
+
+email_outbox_lag_seconds = Histogram(
+    'email_outbox_lag_seconds',
+    'Time from enqueue to successful delivery',
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 3600.0)
+)
+
+# Bulk import metrics
+bulk_import_rows_total = Counter(
+    'bulk_import_rows_total',
+    'Rows processed by the bulk user import',
+    ['status']  # created, duplicate, invalid, error
+)
+
+# Team activity log metrics
+team_activity_batch_size = Histogram(
+    'team_activity_batch_size',
+    'Team activity rows inserted per batch',
+    buckets=(1, 5, 10, 50, 100, 200, 500)
+)
+
+team_activity_dropped_total = Counter(
+    'team_activity_dropped_total',
+    'Team activity events dropped without being written',
+    ['reason']  # buffer_full, rejected, retries_exhausted
+)
+
+team_activity_flush_errors_total = Counter(
+    'team_activity_flush_errors_total',
+    'Team activity batches that failed to insert'
+)
+
+# Database connection pool metrics, labelled by pool (primary, replica-N, sync)
+db_pool_checkout_wait_seconds = Histogram(
+    'db_pool_checkout_wait_seconds',
+    'Time to obtain a pooled connection, including opening a new one',
+    ['pool'],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30)
+)
+
+db_pool_connections_in_use = Gauge(
+    'db_pool_connections_in_use',
+    'Connections currently checked out of the pool',
+    ['pool'],
+    multiprocess_mode='livesum'
+)
+
+db_pool_overflow_connections = Gauge(
+    'db_pool_overflow_connections',
+    'Connections open beyond pool_size',
+    ['pool'],
+    multiprocess_mode='livesum'
+)
+
+db_pool_timeouts_total = Counter(
+    'db_pool_timeouts_total',
+    'Checkouts that gave up after DB_POOL_TIMEOUT_SECONDS',
+    ['pool']
+)
+
+# Read-replica routing
+db_replica_healthy = Gauge(
+    'db_replica_healthy',
+    'Whether the last health check of a read replica succeeded',
+    ['replica'],
+    multiprocess_mode='livemin'
+)
+
+db_read_routing_total = Counter(
+    'db_read_routing_total',
+    'Read sessions by where their reads went (primary when no replica is healthy)',
+    ['target']
+)
+
+# Model catalog metrics
+model_catalog_entries = Gauge(
+    'model_catalog_entries',
+    'Live entries in this worker\'s model catalog index',
+    multiprocess_mode='livemax'
+)
+
+model_catalog_search_seconds = Histogram(
+    'model_catalog_search_seconds',
+    'Time to search the in-memory model catalog index',
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1)
+)
+
+model_catalog_refresh_errors_total = Counter(
+    'model_catalog_refresh_errors_total',
+    'Failed loads or polls of the model catalog table'
+)
+
+model_catalog_ingest_cards_total = Counter(
+    'model_catalog_ingest_cards_total',
+    'Cards processed by catalog ingestion',
+    ['status']  # created, updated, unchanged, duplicate, deleted, invalid, error
+)
+
+model_catalog_recommend_seconds = Histogram(
+    'model_catalog_recommend_seconds',
+    'Time to answer a model recommendation request',
+    ['kind'],  # similar, use_case
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5)
+)
+
+model_catalog_recommend_cache_total = Counter(
+    'model_catalog_recommend_cache_total',
+    'Lookups of cached "similar models" results',
+    ['result']
+)
+
+# Inference serving metrics, labelled by deployed model
+inference_requests_total = Counter(
+    'inference_requests_total',
+    'Inputs processed by inference, by outcome; the rate of "ok" is throughput',
+    ['model', 'status']  # ok, error, invalid, cancelled
+)
+
+inference_batch_size = Histogram(
+    'inference_batch_size',
+    'Inputs per micro-batch',
+    ['model'],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128)
+)
+
+inference_queue_seconds = Histogram(
+    'inference_queue_seconds',
+    'Time an input waited before its batch started',
+    ['model'],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+
+inference_batch_seconds = Histogram(
+    'inference_batch_seconds',
+    'Time to run one micro-batch on the worker pool',
+    ['model'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+)
+
+inference_queue_depth = Gauge(
+    'inference_queue_depth',
+    'Inputs waiting for a batch',
+    ['model'],
+    multiprocess_mode='livesum'
+)
+
+inference_rejections_total = Counter(
+    'inference_rejections_total',
+    'Inputs rejected with 503 because the model queue was full',
+    ['model']
+)
+
+inference_time_to_first_token_seconds = Histogram(
+    'inference_time_to_first_token_seconds',
+    'Time from accepting a generate request to its first token',
+    ['model'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+inference_tokens_per_second = Histogram(
+    'inference_tokens_per_second',
+    'Per-stream decode rate after the first token',
+    ['model'],
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+)
+
+inference_generated_tokens_total = Counter(
+    'inference_generated_tokens_total',
+    'Tokens streamed to clients',
+    ['model']
+)
+
+inference_streams_total = Counter(
+    'inference_streams_total',
+    'Generate requests by outcome',
+    ['model', 'status']  # completed, cancelled, error, rejected
+)
+
+inference_active_streams = Gauge(
+    'inference_active_streams',
+    'Generations holding a stream slot',
+    ['model'],
+    multiprocess_mode='livesum'
+)
+
+# Label for requests that never matched a route (404s, rejected before routing)
+UNMATCHED_ROUTE = "unmatched"
+
+def _route_template(scope) -> str:
+    """Path template of the matched route, e.g. /auth/teams/{team_id}/members"""
+    template = getattr(scope.get("route"), "path", None)
+    # "" is a real route: the root of an included router, e.g. GET /models
+    if template is None:
+        return UNMATCHED_ROUTE
+
+    # Depending on the FastAPI version, routes from an included router may
+    # only carry their own path; restore the literal prefix from the request
+    path = scope.get("path", "")
+    depth = template.count("/")
+    if ":path}" not in template and path.count("/") > depth:
+        segments = path.split("/")
+        template = "/".join(segments[:len(segments) - depth]) + template
+    return template
+
 class MetricsMiddleware:
-    async def __call__(self, request, call_next):
-        start_time = time.time()
-        
-        response = await call_next(request)
-        
-        # Record request metrics
-        duration = time.time() - start_time
-        http_requests_total.labels(
-            method=request.method,
-            endpoint=request.url.path,
-            status=response.status_code
-        ).inc()
-        
-        http_request_duration_seconds.labels(
-            method=request.method,
-            endpoint=request.url.path
-        ).observe(duration)
-        
-        return response 
\ No newline at end of file
+    """Pure ASGI middleware recording request metrics.
+
+    Requests are labelled by route template rather than raw URL path so
+    label cardinality stays bounded by the number of routes.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        response_size = 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        in_progress = http_requests_in_progress.labels(method=method)
+        in_progress.inc()
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start_time
+            in_progress.dec()
+
+            # Routing has run by now and left the matched route in the scope
+            endpoint = _route_template(scope)
+            http_requests_total.labels(
+                method=method,
+                endpoint=endpoint,
+                status=status_code
+            ).inc()
+            http_request_duration_seconds.labels(
+                method=method,
+                endpoint=endpoint
+            ).observe(duration)
+            http_response_size_bytes.labels(
+                method=method,
+                endpoint=endpoint
+            ).observe(response_size)
+
+def _collect_registry():
+    """Registry to expose; aggregates all workers in multiprocess mode"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+async def metrics_endpoint(request: Request) -> Response:
+    """GET /metrics in the Prometheus text format"""
+    return Response(generate_latest(_collect_registry()), media_type=CONTENT_TYPE_LATEST)
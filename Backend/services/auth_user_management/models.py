@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, UniqueConstraint, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from services.auth_user_management.database import Base
@@ -26,6 +26,15 @@ class User(Base):
     teams = relationship("TeamMember", back_populates="user")
     verification_tokens = relationship("EmailVerificationToken", back_populates="user", cascade="all, delete-orphan")
 
+    # Keyset pagination for the admin listing: newest first, optionally filtered
+    __table_args__ = (
+        Index('ix_users_created_id', 'created_at', 'id'),
+        Index('ix_users_role_created_id', 'role', 'created_at', 'id'),
+        Index('ix_users_tier_created_id', 'tier', 'created_at', 'id'),
+        Index('ix_users_org_created_id', 'organization', 'created_at', 'id'),
+        Index('ix_users_status_created_id', 'is_active', 'email_verified', 'created_at', 'id'),
+    )
+
 class EmailVerificationToken(Base):
     __tablename__ = "email_verification_tokens"
 
@@ -56,6 +65,8 @@ class Team(Base):
     organization = Column(String(100), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     created_by = Column(Integer, ForeignKey("users.id"))
+    # Bumped on any change to the team or its members; feeds the team ETags
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     # Relationships
     members = relationship("TeamMember", back_populates="team")
@@ -71,7 +82,11 @@ class TeamMember(Base):
     joined_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Unique constraint to prevent duplicate memberships
-    __table_args__ = (UniqueConstraint('team_id', 'user_id', name='unique_team_member'),)
+    # (team_id, user_id) also orders member pages; (user_id, team_id) serves a user's team list
+    __table_args__ = (
+        UniqueConstraint('team_id', 'user_id', name='unique_team_member'),
+        Index('ix_team_members_user_team', 'user_id', 'team_id'),
+    )
 
     # Relationships
     team = relationship("Team", back_populates="members")
@@ -86,3 +101,44 @@ class TeamActivityLog(Base):
     action = Column(String(50))  # e.g., "member_added", "member_removed"
     details = Column(String(255))
     created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Activity pages are read newest first per team
+    __table_args__ = (
+        Index('ix_team_activity_team_created_id', 'team_id', 'created_at', 'id'),
+    )
+
+class AuditEvent(Base):
+    __tablename__ = "audit_events"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    kind = Column(String(20))  # "security" or "admin"
+    event = Column(String(100), nullable=False)
+    actor_email = Column(String(255))
+    ip = Column(String(45))
+    target = Column(String(255))
+    details = Column(Text)
+
+    __table_args__ = (
+        Index('ix_audit_events_created_at', 'created_at'),
+        Index('ix_audit_events_actor_created', 'actor_email', 'created_at'),
+    )
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String(50), nullable=False)  # e.g., "verification", "password_reset"
+    to_email = Column(String(255), nullable=False)
+    token = Column(String(255), nullable=False)
+    status = Column(String(20), nullable=False, default="pending")  # pending, sending, sent, dead
+    attempts = Column(Integer, nullable=False, default=0)
+    # When a pending job is due, or when a claimed job's lease runs out
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    sent_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index('ix_email_outbox_status_next_attempt', 'status', 'next_attempt_at'),
+    )
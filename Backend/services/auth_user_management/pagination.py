@@ -0,0 +1,46 @@
+"""
+services/auth_user_management/pagination.py
+
+Opaque cursors for keyset pagination.
+
+A cursor is the sort key of the last row on a page, e.g. (created_at, id),
+encoded as URL-safe base64 JSON. The next page is fetched with
+`WHERE (created_at, id) < (:created_at, :id)`, which an index on the sort
+columns answers without scanning the rows before it, however deep the page.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Sequence, Tuple
+
+from fastapi import HTTPException, status
+
+_DATETIME_TAG = "$dt"
+
+
+class InvalidCursor(HTTPException):
+    def __init__(self):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode a row's sort key; datetimes survive the round trip"""
+    payload = [{_DATETIME_TAG: v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, arity: int) -> Tuple[Any, ...]:
+    """Decode a cursor made by encode_cursor, raising InvalidCursor (400) if malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != arity:
+            raise ValueError("wrong arity")
+        return tuple(
+            datetime.fromisoformat(v[_DATETIME_TAG]) if isinstance(v, dict) else v
+            for v in payload
+        )
+    except (ValueError, TypeError, KeyError, binascii.Error):
+        raise InvalidCursor()
@@ -0,0 +1,191 @@
+"""
+services/auth_user_management/password_hashing.py
+
+Bounded worker pool for bcrypt hashing and verification.
+
+bcrypt is deliberately slow (~200ms per call), so running it inside an
+`async def` handler stalls the whole event loop. Every credential path goes
+through `hash_password`/`verify_password` here, which run the work on a
+dedicated executor and reject new jobs with 503 once the queue is full.
+Bulk work (`hash_many`) waits for a free slot instead of being rejected.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from services.auth_user_management.config import get_settings
+from services.auth_user_management.logger import setup_logger
+from services.auth_user_management.metrics import (
+    password_hash_duration_seconds,
+    password_hash_in_flight,
+    password_hash_queue_wait_seconds,
+    password_hash_rejections_total,
+)
+
+logger = setup_logger("password_hashing")
+
+settings = get_settings()
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+class HashingPoolSaturated(HTTPException):
+    """Raised when the hashing pool cannot accept more work"""
+    def __init__(self, retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy. Please try again shortly.",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
+# Module-level so they can be pickled into a process pool
+def _hash(plain_password: str) -> str:
+    return pwd_context.hash(plain_password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def _run_timed(func: Callable, *args) -> Tuple[object, float, float]:
+    """Run func in the worker and report when it actually started and finished.
+
+    time.monotonic is system-wide on the platforms we deploy to, so the
+    timestamps are comparable with the submitting process.
+    """
+    started = time.monotonic()
+    result = func(*args)
+    return result, started, time.monotonic()
+
+
+class PasswordHashingPool:
+    """Executor wrapper with a hard cap on queued plus running jobs"""
+
+    def __init__(self, workers: int, max_queue: int, executor: str = "thread"):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown password hash executor: {executor}")
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.executor_kind = executor
+        self._executor: Optional[Executor] = None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        # One semaphore for every caller, so concurrent batches share the cap
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _get_executor(self) -> Executor:
+        # Created lazily so importing the routes doesn't fork worker processes
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="password-hash"
+                )
+            logger.info(
+                f"Password hashing pool started: {self.executor_kind} x{self.workers}, "
+                f"max queue {self.max_queue}"
+            )
+        return self._executor
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # A semaphore belongs to one event loop; tests and CLI runs may use several
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.capacity)
+            self._slots_loop = loop
+        return self._slots
+
+    def _release(self, loop: asyncio.AbstractEventLoop, slots: asyncio.Semaphore) -> None:
+        # Runs when the job really finishes, even if the caller was cancelled
+        with self._lock:
+            self._in_flight -= 1
+        password_hash_in_flight.dec()
+        try:
+            loop.call_soon_threadsafe(slots.release)
+        except RuntimeError:
+            # Event loop already closed; nobody is left waiting on it
+            pass
+
+    async def _submit(self, operation: str, func: Callable, *args, wait: bool = False):
+        slots = self._get_slots()
+        if slots.locked() and not wait:
+            password_hash_rejections_total.labels(operation=operation).inc()
+            logger.warning("Password hashing pool saturated, rejecting %s", operation)
+            raise HashingPoolSaturated()
+        await slots.acquire()
+        with self._lock:
+            self._in_flight += 1
+        password_hash_in_flight.inc()
+
+        loop = asyncio.get_running_loop()
+        submitted = time.monotonic()
+        try:
+            future = self._get_executor().submit(_run_timed, func, *args)
+        except Exception:
+            self._release(loop, slots)
+            raise
+        future.add_done_callback(lambda _: self._release(loop, slots))
+
+        result, started, finished = await asyncio.wrap_future(future)
+
+        password_hash_queue_wait_seconds.labels(operation=operation).observe(max(0.0, started - submitted))
+        password_hash_duration_seconds.labels(operation=operation).observe(finished - started)
+        return result
+
+    async def hash(self, plain_password: str) -> str:
+        return await self._submit("hash", _hash, plain_password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit("verify", _verify, plain_password, hashed_password)
+
+    async def hash_many(self, plain_passwords: List[str]) -> List[str]:
+        """Hash a batch in parallel, waiting for pool slots rather than failing"""
+        return list(await asyncio.gather(
+            *(self._submit("hash", _hash, p, wait=True) for p in plain_passwords)
+        ))
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+hashing_pool = PasswordHashingPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    executor=settings.PASSWORD_HASH_EXECUTOR
+)
+
+# Separate pool for bulk imports so a 20k-row upload can't starve logins
+bulk_hashing_pool = PasswordHashingPool(
+    workers=settings.BULK_IMPORT_HASH_WORKERS,
+    max_queue=settings.BULK_IMPORT_HASH_WORKERS,
+    executor=settings.BULK_IMPORT_HASH_EXECUTOR
+)
+
+
+async def hash_password(plain_password: str) -> str:
+    """Hash a password on the hashing pool"""
+    return await hashing_pool.hash(plain_password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing pool"""
+    return await hashing_pool.verify(plain_password, hashed_password)
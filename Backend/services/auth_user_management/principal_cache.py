@@ -0,0 +1,118 @@
+"""
+services/auth_user_management/principal_cache.py
+
+Cache of authenticated principals keyed by token subject (email).
+
+`get_current_user` resolves a lightweight, immutable `UserPrincipal` from
+here and only queries the users table on a miss. Entries never outlive the
+token that produced them, and are invalidated after a commit that changes
+a user's role, tier, activation or email.
+"""
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from services.auth_user_management.cache import TTLCache
+from services.auth_user_management.config import get_settings
+from services.auth_user_management.metrics import principal_cache_requests_total
+from services.auth_user_management.models import User
+
+settings = get_settings()
+
+# Attributes baked into the snapshot; changing any of them invalidates it
+_PRINCIPAL_ATTRS = ("email", "role", "tier", "is_active", "email_verified")
+
+
+@dataclass(frozen=True)
+class UserPrincipal:
+    """Read-only snapshot of the fields request handlers need"""
+    id: int
+    email: str
+    role: str
+    tier: str
+    is_active: bool
+    email_verified: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserPrincipal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            role=user.role,
+            tier=user.tier,
+            is_active=bool(user.is_active),
+            email_verified=bool(user.email_verified)
+        )
+
+
+class PrincipalCache:
+    def __init__(self, maxsize: int, max_ttl_seconds: int):
+        self._cache = TTLCache(maxsize)
+        # Upper bound on staleness for changes made by other workers
+        self.max_ttl_seconds = max_ttl_seconds
+
+    def get(self, email: str) -> Optional[UserPrincipal]:
+        principal = self._cache.get(email)
+        principal_cache_requests_total.labels(result="hit" if principal else "miss").inc()
+        return principal
+
+    def peek(self, email: str) -> Optional[UserPrincipal]:
+        """Lookup that isn't counted in the hit/miss metrics"""
+        return self._cache.get(email)
+
+    def put(self, principal: UserPrincipal, token_exp: Optional[float] = None) -> None:
+        expires_at = time.time() + self.max_ttl_seconds
+        if token_exp is not None:
+            expires_at = min(expires_at, float(token_exp))
+        self._cache.set(principal.email, principal, expires_at)
+
+    def invalidate(self, email: str) -> None:
+        self._cache.pop(email)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+principal_cache = PrincipalCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    max_ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+
+# -----------------------------------------------------------------------------
+# Invalidation hooks
+# Registered on the ORM Session class, so they also fire for AsyncSession.
+# -----------------------------------------------------------------------------
+_PENDING_KEY = "principal_cache_invalidations"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_principals(session, flush_context):
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            pending.add(obj.email)
+    for obj in session.dirty:
+        if not isinstance(obj, User):
+            continue
+        state = inspect(obj)
+        for attr in _PRINCIPAL_ATTRS:
+            history = state.attrs[attr].history
+            if history.has_changes():
+                pending.add(obj.email)
+                # Old email is the cache key still pointing at the stale entry
+                pending.update(v for v in history.deleted if v)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_principals(session):
+    for email in session.info.pop(_PENDING_KEY, ()):
+        principal_cache.invalidate(email)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changed_principals(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,222 @@
+"""
+services/auth_user_management/rate_limit_middleware.py
+
+Declarative per-route rate limits enforced as ASGI middleware.
+
+Limits are token buckets keyed per client IP, per account, per API key or
+per account tier. They run before routing and body validation, so
+throttled credential-stuffing traffic never reaches bcrypt.
+"""
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from starlette.responses import JSONResponse
+
+from services.auth_user_management.config import get_settings
+from services.auth_user_management.logger import setup_logger
+from services.auth_user_management.metrics import rate_limit_hits
+from services.auth_user_management.principal_cache import principal_cache
+from services.auth_user_management.rate_limiter import RateLimitBackend, create_rate_limit_backend
+from services.auth_user_management.token_cache import decode_access_token
+
+logger = setup_logger("rate_limit_middleware")
+
+settings = get_settings()
+
+# Largest request body read to find the account email on credential routes
+MAX_INSPECTED_BODY_BYTES = 16 * 1024
+
+
+@dataclass(frozen=True)
+class Limit:
+    """`capacity` requests per `per_seconds`, refilled continuously.
+
+    scope is one of "ip", "account", "api_key" or "tier". Account limits
+    are keyed on the "email" field of the JSON body, for credential routes.
+    Tier limits take their capacity from `tiers` using the `User.tier` of
+    the bearer token's subject.
+    """
+    scope: str
+    capacity: int = 0
+    per_seconds: float = 60.0
+    tiers: Dict[str, int] = field(default_factory=dict)
+
+    def capacity_for(self, tier: Optional[str]) -> int:
+        if self.scope == "tier":
+            return self.tiers.get(tier or "Free", self.tiers.get("Free", self.capacity))
+        return self.capacity
+
+
+@dataclass(frozen=True)
+class RouteLimit:
+    """Limits applied to requests whose path matches.
+
+    Paths are matched literally, or as a prefix when they end with "*".
+    An empty `methods` tuple matches every method.
+    """
+    name: str
+    path: str
+    limits: Tuple[Limit, ...]
+    methods: Tuple[str, ...] = ()
+
+    @property
+    def is_prefix(self) -> bool:
+        return self.path.endswith("*")
+
+
+TIER_REQUESTS_PER_MINUTE = {
+    "Free": 60,
+    "Advanced": 300,
+    "Enterprise": 1200,
+}
+
+DEFAULT_ROUTE_LIMITS: List[RouteLimit] = [
+    RouteLimit("login", "/auth/login", (Limit("ip", 20), Limit("account", 5)), ("POST",)),
+    RouteLimit("admin_login", "/auth/admin/login", (Limit("ip", 10), Limit("account", 5)), ("POST",)),
+    RouteLimit("register", "/auth/register", (Limit("ip", 5),), ("POST",)),
+    RouteLimit("admin_register", "/auth/admin/register", (Limit("ip", 3),), ("POST",)),
+    RouteLimit("api", "/*", (
+        Limit("ip", 600),
+        Limit("api_key", 600),
+        Limit("tier", tiers=TIER_REQUESTS_PER_MINUTE),
+    )),
+]
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware; the first matching RouteLimit wins"""
+
+    def __init__(
+        self,
+        app,
+        route_limits: Optional[Iterable[RouteLimit]] = None,
+        backend: Optional[RateLimitBackend] = None
+    ):
+        self.app = app
+        self.backend = backend or create_rate_limit_backend()
+        self._exact: Dict[str, List[RouteLimit]] = {}
+        self._prefixes: List[RouteLimit] = []
+        for rule in (DEFAULT_ROUTE_LIMITS if route_limits is None else route_limits):
+            if rule.is_prefix:
+                self._prefixes.append(rule)
+            else:
+                self._exact.setdefault(rule.path, []).append(rule)
+
+    def _match(self, method: str, path: str) -> Optional[RouteLimit]:
+        for rule in self._exact.get(path, ()):
+            if not rule.methods or method in rule.methods:
+                return rule
+        for rule in self._prefixes:
+            if path.startswith(rule.path[:-1]) and (not rule.methods or method in rule.methods):
+                return rule
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        rule = self._match(scope["method"], scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = _headers(scope)
+        if any(limit.scope == "account" for limit in rule.limits):
+            # Credential routes limit the account being signed into, never the
+            # caller's token, or any valid token would sidestep the limit
+            account, receive = await _body_email(receive)
+        else:
+            account = _bearer_subject(headers)
+
+        for limit in rule.limits:
+            identity, tier = self._identity(limit, scope, headers, account)
+            if identity is None:
+                continue
+            capacity = limit.capacity_for(tier)
+            key = f"{rule.name}:{limit.scope}:{identity}"
+            retry_after = await self.backend.take(key, capacity, capacity / limit.per_seconds)
+            if retry_after > 0:
+                rate_limit_hits.labels(endpoint=rule.name).inc()
+                logger.warning("Rate limit exceeded on %s (%s)", rule.name, limit.scope)
+                response = JSONResponse(
+                    status_code=429,
+                    content={"detail": f"Too many requests. Please retry in {int(retry_after) + 1} seconds."},
+                    headers={"Retry-After": str(int(retry_after) + 1)}
+                )
+                await response(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
+
+    def _identity(self, limit: Limit, scope, headers: Dict[str, str], account: Optional[str]):
+        if limit.scope == "ip":
+            return _client_ip(scope, headers), None
+        if limit.scope == "account":
+            return (account.lower() if account else None), None
+        if limit.scope == "api_key":
+            api_key = headers.get("x-api-key")
+            # Never keep raw keys in the limiter store
+            return (hashlib.sha256(api_key.encode()).hexdigest() if api_key else None), None
+        if limit.scope == "tier":
+            if account is None:
+                return None, None
+            principal = principal_cache.peek(account)
+            return account.lower(), (principal.tier if principal else None)
+        raise ValueError(f"Unknown rate limit scope: {limit.scope}")
+
+
+def _headers(scope) -> Dict[str, str]:
+    return {name.decode("latin-1"): value.decode("latin-1") for name, value in scope.get("headers", ())}
+
+
+def _client_ip(scope, headers: Dict[str, str]) -> Optional[str]:
+    if settings.RATE_LIMIT_TRUST_FORWARDED_FOR:
+        forwarded = headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else None
+
+
+def _bearer_subject(headers: Dict[str, str]) -> Optional[str]:
+    authorization = headers.get("authorization", "")
+    if not authorization.lower().startswith("bearer "):
+        return None
+    try:
+        return decode_access_token(authorization[7:].strip()).get("sub")
+    except Exception:
+        # Invalid tokens are rejected by the route itself
+        return None
+
+
+async def _body_email(receive):
+    """Buffer a small JSON body to read its "email" field, then replay it"""
+    messages = []
+    body = b""
+    while True:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request":
+            break
+        body += message.get("body", b"")
+        if not message.get("more_body", False) or len(body) > MAX_INSPECTED_BODY_BYTES:
+            break
+
+    email = None
+    if len(body) <= MAX_INSPECTED_BODY_BYTES:
+        try:
+            payload = json.loads(body)
+            if isinstance(payload, dict) and isinstance(payload.get("email"), str):
+                email = payload["email"]
+        except ValueError:
+            pass
+
+    async def replay():
+        if messages:
+            return messages.pop(0)
+        return await receive()
+
+    return email, replay
@@ -1,9 +1,12 @@
 from fastapi import HTTPException, status
-from datetime import datetime, timedelta
-from typing import Dict, Tuple
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from typing import Dict, List, Optional
+import math
 import time
 from services.auth_user_management.logger import setup_logger
 from services.auth_user_management.config import get_settings
+from services.auth_user_management.metrics import rate_limit_hits
 
 logger = setup_logger("rate_limiter")
 
@@ -11,28 +14,280 @@ settings = get_settings()
 
 class RateLimitExceeded(HTTPException):
     """Custom exception for rate limit errors"""
-    def __init__(self, minutes_left: int, action: str):
+    def __init__(self, minutes_left: int, action: str, retry_after: Optional[int] = None):
+        if retry_after is None:
+            retry_after = minutes_left * 60
         super().__init__(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=f"Too many {action} attempts. Please try again in {minutes_left} minutes."
+            detail=f"Too many {action} attempts. Please try again in {minutes_left} minutes.",
+            headers={"Retry-After": str(max(1, retry_after))}
         )
 
+def sliding_window_retry_after(previous: int, current: int, elapsed: float, limit: int, window: float) -> float:
+    """Seconds until one more attempt fits under a sliding-window counter.
+
+    The window estimate is previous * (1 - elapsed / window) + current, i.e.
+    the previous bucket's count decays linearly as the current bucket ages.
+    """
+    allowed = limit - 1
+    if current > allowed:
+        # Must wait for the next bucket, where `current` becomes the decaying one
+        decay = 1 - allowed / current if current else 0
+        return (window - elapsed) + window * max(0.0, decay)
+    if previous <= 0:
+        return 0.0
+    needed = window * (1 - (allowed - current) / previous)
+    return max(0.0, needed - elapsed)
+
+# -----------------------------------------------------------------------------
+# Backends
+# -----------------------------------------------------------------------------
+class RateLimitBackend(ABC):
+    """Storage for sliding-window attempt counters and token buckets"""
+
+    @abstractmethod
+    async def hit(self, key: str, limit: int, window_seconds: float) -> float:
+        """Record one attempt for key.
+
+        Returns 0 when the attempt is allowed, otherwise the number of seconds
+        until the next attempt would be allowed (rejected attempts are not
+        counted).
+        """
+
+    @abstractmethod
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """Take one token from the bucket for key.
+
+        Returns 0 when a token was available, otherwise the number of seconds
+        until one will be.
+        """
+
+    async def close(self) -> None:
+        pass
+
+class _Window:
+    __slots__ = ("bucket", "previous", "current", "expires_at")
+
+    def __init__(self, bucket: int):
+        self.bucket = bucket
+        self.previous = 0
+        self.current = 0
+        self.expires_at = 0.0
+
+class _Bucket:
+    __slots__ = ("tokens", "updated_at", "expires_at")
+
+    def __init__(self, tokens: float, updated_at: float):
+        self.tokens = tokens
+        self.updated_at = updated_at
+        self.expires_at = 0.0
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Per-process backend with O(1) checks.
+
+    Each key holds two fixed buckets (previous and current) and the window
+    count is interpolated between them. Idle keys are expired through a
+    hashed timer wheel: keys are filed under the second they expire and
+    each check only sweeps the slots that elapsed since the previous one.
+    """
+
+    def __init__(self, resolution: float = 1.0):
+        self._windows: Dict[str, _Window] = {}
+        self._buckets: Dict[str, _Bucket] = {}
+        self._wheel: Dict[int, List[str]] = {}
+        self._resolution = resolution
+        self._cursor: Optional[int] = None
+
+    def _slot(self, timestamp: float) -> int:
+        return int(timestamp // self._resolution)
+
+    def _schedule(self, key: str, expires_at: float) -> None:
+        self._wheel.setdefault(self._slot(expires_at), []).append(key)
+
+    def _expire(self, now: float) -> None:
+        target = self._slot(now)
+        if self._cursor is None:
+            self._cursor = target
+        if target <= self._cursor:
+            return
+        if target - self._cursor > len(self._wheel):
+            # Long idle gap: cheaper to visit the occupied slots than every second
+            due = sorted(slot for slot in self._wheel if slot < target)
+        else:
+            due = range(self._cursor, target)
+        for slot in due:
+            for key in self._wheel.pop(slot, ()):
+                for entries in (self._windows, self._buckets):
+                    entry = entries.get(key)
+                    if entry is None:
+                        continue
+                    if entry.expires_at <= now:
+                        del entries[key]
+                    else:
+                        # Touched since it was filed; move it to its new slot
+                        self._schedule(key, entry.expires_at)
+        self._cursor = target
+
+    def __len__(self) -> int:
+        return len(self._windows) + len(self._buckets)
+
+    def hit_sync(self, key: str, limit: int, window_seconds: float, now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        self._expire(now)
+
+        bucket = int(now // window_seconds)
+        window = self._windows.get(key)
+        if window is None:
+            window = _Window(bucket)
+            self._windows[key] = window
+            window.expires_at = (bucket + 2) * window_seconds
+            self._schedule(key, window.expires_at)
+        elif window.bucket != bucket:
+            window.previous = window.current if window.bucket == bucket - 1 else 0
+            window.current = 0
+            window.bucket = bucket
+            # Rescheduled lazily when the old wheel slot comes due
+            window.expires_at = (bucket + 2) * window_seconds
+
+        elapsed = now - bucket * window_seconds
+        estimate = window.previous * (1 - elapsed / window_seconds) + window.current
+        if estimate + 1 > limit:
+            return sliding_window_retry_after(window.previous, window.current, elapsed, limit, window_seconds)
+
+        window.current += 1
+        return 0.0
+
+    async def hit(self, key: str, limit: int, window_seconds: float) -> float:
+        return self.hit_sync(key, limit, window_seconds)
+
+    def take_sync(self, key: str, capacity: int, refill_per_second: float, now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        self._expire(now)
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = _Bucket(float(capacity), now)
+            self._buckets[key] = bucket
+            new = True
+        else:
+            bucket.tokens = min(float(capacity), bucket.tokens + (now - bucket.updated_at) * refill_per_second)
+            bucket.updated_at = now
+            new = False
+
+        retry_after = 0.0
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+        else:
+            retry_after = (1 - bucket.tokens) / refill_per_second
+
+        # Once refilled to capacity the bucket is indistinguishable from a new one
+        bucket.expires_at = now + (capacity - bucket.tokens) / refill_per_second
+        if new:
+            self._schedule(key, bucket.expires_at)
+        return retry_after
+
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        return self.take_sync(key, capacity, refill_per_second)
+
+# Check-and-increment in one round-trip so concurrent workers can't overshoot
+_SLIDING_WINDOW_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local limit = tonumber(ARGV[1])
+local window_ms = tonumber(ARGV[2])
+local elapsed_ms = tonumber(ARGV[3])
+local estimate = previous * (1 - elapsed_ms / window_ms) + current
+if estimate + 1 > limit then
+    return {0, current, previous}
+end
+redis.call('INCR', KEYS[1])
+redis.call('PEXPIRE', KEYS[1], 2 * window_ms)
+return {1, current + 1, previous}
+"""
+
+# Floats are returned as strings: Redis truncates Lua numbers to integers
+_TOKEN_BUCKET_SCRIPT = """
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+return tostring(retry_after)
+"""
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Backend shared by every worker through a Redis-protocol server.
+
+    `client` is any redis.asyncio-compatible client, so a local stand-in
+    such as fakeredis can be passed in for tests.
+    """
+
+    def __init__(self, client, prefix: str = "ratelimit:"):
+        self._client = client
+        self._prefix = prefix
+        self._script = client.register_script(_SLIDING_WINDOW_SCRIPT)
+        self._bucket_script = client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    async def hit(self, key: str, limit: int, window_seconds: float) -> float:
+        now = time.time()
+        bucket = int(now // window_seconds)
+        elapsed = now - bucket * window_seconds
+        allowed, current, previous = await self._script(
+            keys=[f"{self._prefix}{key}:{bucket}", f"{self._prefix}{key}:{bucket - 1}"],
+            args=[limit, int(window_seconds * 1000), int(elapsed * 1000)]
+        )
+        if allowed:
+            return 0.0
+        return sliding_window_retry_after(int(previous), int(current), elapsed, limit, window_seconds)
+
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        retry_after = await self._bucket_script(
+            keys=[f"{self._prefix}{key}"],
+            args=[capacity, refill_per_second, time.time()]
+        )
+        return float(retry_after)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+def create_rate_limit_backend() -> RateLimitBackend:
+    """Build the backend selected by RATE_LIMIT_BACKEND"""
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        import redis.asyncio as redis  # Only needed when limits are shared across workers
+        return RedisRateLimitBackend(redis.from_url(settings.RATE_LIMIT_REDIS_URL))
+    if settings.RATE_LIMIT_BACKEND != "memory":
+        raise ValueError(f"Unknown rate limit backend: {settings.RATE_LIMIT_BACKEND}")
+    return InMemoryRateLimitBackend()
+
 class RateLimiter:
-    def __init__(self):
-        # Store attempts as: {'email:action': (count, first_attempt_timestamp)}
-        self._attempts: Dict[str, Tuple[int, datetime]] = {}
-        
+    def __init__(self, backend: Optional[RateLimitBackend] = None):
+        self.backend = backend or create_rate_limit_backend()
+
         # Configure limits from environment
         self.VERIFY_EMAIL_MAX_ATTEMPTS = settings.VERIFY_EMAIL_MAX_ATTEMPTS
         self.VERIFY_EMAIL_WINDOW = timedelta(hours=settings.VERIFY_EMAIL_WINDOW_HOURS)
-        
+
         self.RESET_PASSWORD_MAX_ATTEMPTS = settings.RESET_PASSWORD_MAX_ATTEMPTS
         self.RESET_PASSWORD_WINDOW = timedelta(minutes=settings.RESET_PASSWORD_WINDOW_MINUTES)
 
         self.IP_VERIFY_MAX_ATTEMPTS = settings.IP_VERIFY_MAX_ATTEMPTS
         self.IP_RESET_MAX_ATTEMPTS = settings.IP_RESET_MAX_ATTEMPTS
 
-        logger.info("Rate limiter initialized with following limits:")
+        logger.info(f"Rate limiter initialized with {type(self.backend).__name__} and following limits:")
         logger.info(f"Verify Email: {self.VERIFY_EMAIL_MAX_ATTEMPTS} attempts per {self.VERIFY_EMAIL_WINDOW}")
         logger.info(f"Reset Password: {self.RESET_PASSWORD_MAX_ATTEMPTS} attempts per {self.RESET_PASSWORD_WINDOW}")
 
@@ -40,29 +295,29 @@ class RateLimiter:
         """Generate key for rate limiting"""
         return f"{identifier}:{action}"
 
-    def check_verify_email_rate(self, email: str, ip: str = None):
+    async def check_verify_email_rate(self, email: str, ip: str = None):
         """Check if user can request another verification email"""
         try:
             # Check email-based limit
-            self._check_rate(
-                email, 
-                "verify_email", 
+            await self._check_rate(
+                email,
+                "verify_email",
                 self.VERIFY_EMAIL_MAX_ATTEMPTS,
                 self.VERIFY_EMAIL_WINDOW
             )
-            
+
             # Check IP-based limit if provided
             if ip:
-                self._check_rate(
+                await self._check_rate(
                     ip,
                     "verify_email_ip",
                     self.IP_VERIFY_MAX_ATTEMPTS,
                     self.VERIFY_EMAIL_WINDOW
                 )
-            
-            logger.info(f"Rate check passed for email verification: {email}")
+
+            logger.info("Rate check passed for email verification: %s", email)
         except RateLimitExceeded as e:
-            logger.warning(f"Rate limit exceeded for email verification: {email}")
+            logger.warning("Rate limit exceeded for email verification: %s", email)
             raise
         except Exception as e:
             logger.error(f"Unexpected error in verify email rate check: {str(e)}")
@@ -71,29 +326,29 @@ class RateLimiter:
                 detail="Error checking rate limit"
             )
 
-    def check_reset_password_rate(self, email: str, ip: str = None):
+    async def check_reset_password_rate(self, email: str, ip: str = None):
         """Check if user can request another password reset"""
         try:
             # Check email-based limit
-            self._check_rate(
+            await self._check_rate(
                 email,
                 "reset_password",
                 self.RESET_PASSWORD_MAX_ATTEMPTS,
                 self.RESET_PASSWORD_WINDOW
             )
-            
+
             # Check IP-based limit if provided
             if ip:
-                self._check_rate(
+                await self._check_rate(
                     ip,
                     "reset_password_ip",
                     self.IP_RESET_MAX_ATTEMPTS,
                     self.RESET_PASSWORD_WINDOW
                 )
-            
-            logger.info(f"Rate check passed for password reset: {email}")
+
+            logger.info("Rate check passed for password reset: %s", email)
         except RateLimitExceeded as e:
-            logger.warning(f"Rate limit exceeded for password reset: {email}")
+            logger.warning("Rate limit exceeded for password reset: %s", email)
             raise
         except Exception as e:
             logger.error(f"Unexpected error in password reset rate check: {str(e)}")
@@ -102,38 +357,14 @@ class RateLimiter:
                 detail="Error checking rate limit"
             )
 
-    def _check_rate(self, identifier: str, action: str, max_attempts: int, window: timedelta):
+    async def _check_rate(self, identifier: str, action: str, max_attempts: int, window: timedelta):
         """Generic rate check logic"""
         try:
             key = self._get_key(identifier, action)
-            now = datetime.now()
-
-            # Clean up old entries periodically
-            self._cleanup_old_entries()
-            
-            if key in self._attempts:
-                count, first_attempt = self._attempts[key]
-                
-                # Reset if outside window
-                if now - first_attempt > window:
-                    self._attempts[key] = (1, now)
-                    logger.debug(f"Reset rate limit counter for {key}")
-                    return
-                
-                # Check limit
-                if count >= max_attempts:
-                    time_left = window - (now - first_attempt)
-                    minutes_left = int(time_left.total_seconds() / 60)
-                    raise RateLimitExceeded(minutes_left, action)
-                
-                # Increment counter
-                self._attempts[key] = (count + 1, first_attempt)
-                logger.debug(f"Incremented rate limit counter for {key}: {count + 1}")
-            else:
-                # First attempt
-                self._attempts[key] = (1, now)
-                logger.debug(f"Initial rate limit entry for {key}")
-
+            retry_after = await self.backend.hit(key, max_attempts, window.total_seconds())
+            if retry_after > 0:
+                rate_limit_hits.labels(endpoint=action).inc()
+                raise RateLimitExceeded(math.ceil(retry_after / 60), action, math.ceil(retry_after))
         except RateLimitExceeded:
             raise
         except Exception as e:
@@ -142,23 +373,3 @@ class RateLimiter:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Error checking rate limit"
             )
-
-    def _cleanup_old_entries(self):
-        """Remove expired entries to prevent memory growth"""
-        try:
-            now = datetime.now()
-            keys_to_delete = []
-            
-            for key, (_, timestamp) in self._attempts.items():
-                # Use the longer window (24 hours) for cleanup
-                if now - timestamp > timedelta(hours=24):
-                    keys_to_delete.append(key)
-            
-            for key in keys_to_delete:
-                del self._attempts[key]
-                logger.debug(f"Cleaned up expired rate limit entry: {key}")
-
-            if keys_to_delete:
-                logger.info(f"Cleaned up {len(keys_to_delete)} expired rate limit entries")
-        except Exception as e:
-            logger.error(f"Error cleaning up rate limit entries: {str(e)}") 
\ No newline at end of file
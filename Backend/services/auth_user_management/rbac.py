@@ -1,6 +1,19 @@
+import functools
+import time
 from enum import Enum, auto
-from typing import Dict, List, Set
-from fastapi import HTTPException, status
+from typing import Dict, Iterable, List, Optional, Set, Union
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from services.auth_user_management.cache import TTLCache
+from services.auth_user_management.config import get_settings
+from services.auth_user_management.database import get_async_db
+from services.auth_user_management.dependencies import get_current_user
+from services.auth_user_management.models import Team, TeamMember
+from services.auth_user_management.principal_cache import UserPrincipal
+
+settings = get_settings()
 
 class Role(str, Enum):
     ADMIN = "admin"
@@ -14,6 +27,7 @@ class Permission(str, Enum):
     VIEW_MODELS = "view_models"
     DEPLOY_MODELS = "deploy_models"
     FINE_TUNE_MODELS = "fine_tune_models"
+    MANAGE_MODEL_CATALOG = "manage_model_catalog"
     
     # User Management
     VIEW_USERS = "view_users"
@@ -100,24 +114,50 @@ TEAM_ROLE_PERMISSIONS = {
     }
 }
 
+# -----------------------------------------------------------------------------
+# Compiled permission masks
+# Each Permission gets one bit; role tables are folded into ints at import,
+# so a check is a dict lookup and a bitwise AND.
+# -----------------------------------------------------------------------------
+PERMISSION_BITS: Dict[Permission, int] = {permission: 1 << i for i, permission in enumerate(Permission)}
+
+def permission_mask(permissions: Iterable[Permission]) -> int:
+    mask = 0
+    for permission in permissions:
+        mask |= PERMISSION_BITS[permission]
+    return mask
+
+ROLE_MASKS: Dict[str, int] = {role.value: permission_mask(perms) for role, perms in ROLE_PERMISSIONS.items()}
+TEAM_ROLE_MASKS: Dict[str, int] = {role: permission_mask(perms) for role, perms in TEAM_ROLE_PERMISSIONS.items()}
+# Permissions that only mean something inside a team
+TEAM_SCOPED_MASK = permission_mask(p for p in Permission if p.name.startswith("TEAM_"))
+
+def has_permission(mask: int, permission: Permission) -> bool:
+    return bool(mask & PERMISSION_BITS[permission])
+
 def check_permission(user_role: str, required_permission: Permission):
     """Check if a role has a specific permission"""
-    try:
-        role = Role(user_role)
-        if required_permission not in ROLE_PERMISSIONS[role]:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Permission denied: {required_permission} required"
-            )
-    except ValueError:
+    mask = ROLE_MASKS.get(user_role)
+    if mask is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"Invalid role: {user_role}"
         )
+    if not has_permission(mask, required_permission):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Permission denied: {required_permission} required"
+        )
 
 def requires_permission(permission: Permission):
-    """Decorator to check if user has required permission"""
+    """Decorator to check if user has required permission
+
+    The handler must declare `current_user`. Prefer the `require` dependency
+    for new endpoints.
+    """
     def decorator(func):
+        # Keep the handler's signature visible to FastAPI's introspection
+        @functools.wraps(func)
         async def wrapper(*args, **kwargs):
             current_user = kwargs.get('current_user')
             if not current_user:
@@ -128,4 +168,102 @@ def requires_permission(permission: Permission):
             check_permission(current_user.role, permission)
             return await func(*args, **kwargs)
         return wrapper
-    return decorator 
\ No newline at end of file
+    return decorator
+
+# -----------------------------------------------------------------------------
+# Effective permissions
+# A user's mask in a team is their global role mask, minus the TEAM_* bits,
+# OR'ed with the mask of their role in that team; so a global manager gets
+# team permissions only in teams they belong to. Admins keep every bit in
+# every team. Team-role masks are cached per user and dropped
+# after any commit that changes one of their memberships.
+# -----------------------------------------------------------------------------
+class TeamMaskCache:
+    def __init__(self, maxsize: int, ttl_seconds: int):
+        self._cache = TTLCache(maxsize)
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, user_id: int) -> Optional[Dict[int, int]]:
+        return self._cache.get(user_id)
+
+    def put(self, user_id: int, team_masks: Dict[int, int]) -> None:
+        self._cache.set(user_id, team_masks, time.time() + self.ttl_seconds)
+
+    def invalidate(self, user_id: int) -> None:
+        self._cache.pop(user_id)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+team_mask_cache = TeamMaskCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+async def effective_mask(db: AsyncSession, user: UserPrincipal, team_id: Optional[int] = None) -> int:
+    """Permissions the user holds globally, plus those from their role in team_id"""
+    mask = ROLE_MASKS.get(user.role, 0)
+    if team_id is None:
+        return mask
+    if user.role != Role.ADMIN.value:
+        mask &= ~TEAM_SCOPED_MASK
+    team_masks = team_mask_cache.get(user.id)
+    if team_masks is None:
+        # One query loads every membership, so later teams are free
+        result = await db.execute(select(TeamMember.team_id, TeamMember.role).where(TeamMember.user_id == user.id))
+        team_masks = {tid: TEAM_ROLE_MASKS.get(role, 0) for tid, role in result.all()}
+        team_mask_cache.put(user.id, team_masks)
+    return mask | team_masks.get(team_id, 0)
+
+def require(permission: Permission, team_id: Union[int, str, None] = None):
+    """FastAPI dependency granting access only with `permission`.
+
+    `team_id` scopes the check to a team: an int for a fixed team, or the
+    name of a path parameter, e.g. `require(Permission.TEAM_VIEW_ANALYTICS,
+    team_id="team_id")`. A missing team is a 404. Resolves to the current user.
+    """
+    bit = PERMISSION_BITS[permission]
+
+    async def dependency(
+        request: Request,
+        current_user: UserPrincipal = Depends(get_current_user),
+        db: AsyncSession = Depends(get_async_db)
+    ) -> UserPrincipal:
+        scope = team_id
+        if isinstance(scope, str):
+            try:
+                scope = int(request.path_params[scope])
+            except (KeyError, TypeError, ValueError):
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Team not found")
+        if not await effective_mask(db, current_user, scope) & bit:
+            # Only denials pay for the existence check
+            if scope is not None and await db.get(Team, scope) is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Team not found")
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Permission denied: {permission.value} required"
+            )
+        return current_user
+
+    return dependency
+
+# Invalidation hooks, registered on the ORM Session class like the principal cache's
+_PENDING_KEY = "team_mask_invalidations"
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_memberships(session, flush_context):
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, TeamMember):
+            pending.add(obj.user_id)
+            # A membership moved to another user invalidates the old one too
+            pending.update(v for v in inspect(obj).attrs["user_id"].history.deleted if v)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_memberships(session):
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        team_mask_cache.invalidate(user_id)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changed_memberships(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
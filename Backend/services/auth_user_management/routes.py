@@ -7,9 +7,9 @@ Auth microservice using MySQL + SQLAlchemy. Includes:
 - Tier updates
 - Basic protected endpoints
 """
-from fastapi import APIRouter, HTTPException, status, Depends, Request, Body
+from fastapi import APIRouter, HTTPException, status, Depends, Request, Response, Body, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, EmailStr, Field, ConfigDict
-from passlib.context import CryptContext
 from jose import jwt, JWTError
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials, OAuth2PasswordBearer, OAuth2PasswordRequestForm
 import random
@@ -17,19 +17,28 @@ import string
 import time
 from datetime import datetime, timezone, timedelta
 from sqlalchemy.exc import OperationalError
+from sqlalchemy import select, tuple_
 from typing import Optional, List, Dict, Any
 from enum import Enum
 from typing_extensions import Literal
 
-from sqlalchemy.orm import Session
-from services.auth_user_management.database import get_db, verify_db_connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from services.auth_user_management.db_routing import pin_primary
+from services.auth_user_management.database import AsyncSessionLocal, get_async_db, get_async_read_db, verify_db_connection
 from services.auth_user_management.models import User, PasswordResetToken, EmailVerificationToken, Team, TeamMember, TeamActivityLog
-from services.auth_user_management.email import send_verification_email, send_password_reset_email
+from services.auth_user_management.email_outbox import email_worker, queue_verification_email
 from services.auth_user_management.rate_limiter import RateLimiter
-from services.auth_user_management.logger import setup_logger
+from services.auth_user_management.logger import setup_logger, AuditLogger
 from services.auth_user_management.config import get_settings, Settings
-from services.auth_user_management.rbac import Permission, requires_permission, Role, ROLE_PERMISSIONS
+from services.auth_user_management.rbac import Permission, require, requires_permission, Role, ROLE_PERMISSIONS
 from services.auth_user_management.team_logger import log_team_activity
+from services.auth_user_management.password_hashing import hash_password, verify_password
+from services.auth_user_management.principal_cache import UserPrincipal
+from services.auth_user_management.dependencies import get_current_user
+from services.auth_user_management.team_access import TeamAccess, TeamAuthorizer
+from services.auth_user_management.team_versions import if_none_match, team_etag, team_list_etag
+from services.auth_user_management.pagination import decode_cursor, encode_cursor
+from services.auth_user_management.bulk_import import BulkUserImporter, SUPPORTED_FORMATS, iter_records, spool_upload
 
 # -----------------------------------------------------------------------------
 # Constants & Utilities
@@ -54,6 +63,12 @@ tags_metadata = [
     },
     {
         "name": "System",
+    },
+    {
+        "name": "Model Catalog",
+    },
+    {
+        "name": "Inference",
     }
 ]
 
@@ -62,7 +77,6 @@ router = APIRouter(
     responses={404: {"description": "Not found"}}
 )
 bearer_scheme = HTTPBearer()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 settings = get_settings()
 
@@ -76,8 +90,7 @@ ALLOWED_TIERS = ["Free", "Advanced", "Enterprise"]
 rate_limiter = RateLimiter()
 
 logger = setup_logger("auth_routes")
-
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+audit = AuditLogger()
 
 # -----------------------------------------------------------------------------
 # Pydantic Schemas
@@ -185,12 +198,20 @@ class TeamMemberResponse(BaseModel):
     role: str
     joined_at: datetime
 
+class TeamDetailResponse(TeamResponse):
+    members: List[TeamMemberResponse]
+    next_member_cursor: Optional[str] = None
+
 class TeamActivityResponse(BaseModel):
     action: str
-    details: str
-    user_email: str
+    details: Optional[str]
+    user_email: Optional[str]  # None once the acting user has been deleted
     created_at: datetime
 
+class TeamActivityPage(BaseModel):
+    items: List[TeamActivityResponse]
+    next_cursor: Optional[str] = None
+
 class UserResponse(BaseModel):
     id: int
     email: str
@@ -203,15 +224,28 @@ class UserResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+class UserListResponse(BaseModel):
+    items: List[UserResponse]
+    next_cursor: Optional[str] = None
+
+# Only the columns UserResponse needs; never loads password hashes
+USER_RESPONSE_COLUMNS = (
+    User.id,
+    User.email,
+    User.role,
+    User.tier,
+    User.email_verified,
+    User.created_at,
+    User.last_login,
+    User.is_active,
+)
+
+# Rows per page when streaming an NDJSON export
+USER_EXPORT_PAGE_SIZE = 1000
+
 # -----------------------------------------------------------------------------
 # Helper Functions
 # -----------------------------------------------------------------------------
-def hash_password(plain_password: str) -> str:
-    return pwd_context.hash(plain_password)
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
-
 def create_access_token(email: str) -> str:
     """Create JWT access token with timezone-aware timestamps"""
     now = datetime.now(timezone.utc)
@@ -227,32 +261,10 @@ def create_access_token(email: str) -> str:
 def create_random_token(length=20) -> str:
     return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-        
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise credentials_exception
-    return user
-
 # Role-based access control decorator
 def require_role(required_role: str):
     def decorator(func):
-        async def wrapper(*args, current_user: User = Depends(get_current_user), **kwargs):
+        async def wrapper(*args, current_user: UserPrincipal = Depends(get_current_user), **kwargs):
             if current_user.role != required_role:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
@@ -262,6 +274,35 @@ def require_role(required_role: str):
         return wrapper
     return decorator
 
+async def get_current_admin(current_user: UserPrincipal = Depends(get_current_user)) -> UserPrincipal:
+    if current_user.role != Role.ADMIN.value:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="This action requires admin role"
+        )
+    return current_user
+
+async def get_team_authorizer(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user)
+) -> TeamAuthorizer:
+    # FastAPI caches dependencies per request, so every check shares one authorizer
+    return TeamAuthorizer(db, current_user)
+
+async def get_team_read_authorizer(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserPrincipal = Depends(get_current_user)
+) -> TeamAuthorizer:
+    # For read-only team endpoints; resolves against the read replica
+    return TeamAuthorizer(db, current_user)
+
+async def require_team_manager(
+    team_id: int,
+    authz: TeamAuthorizer = Depends(get_team_authorizer)
+) -> TeamAccess:
+    """Team admins of {team_id}, or system admins"""
+    return await authz.require_manager(team_id)
+
 # Domain restriction check for admin registration
 def validate_admin_domain(email: str, settings: Settings = Depends(get_settings)):
     try:
@@ -280,10 +321,14 @@ def validate_admin_domain(email: str, settings: Settings = Depends(get_settings)
         # Allow registration if validation fails
         return
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
     """Authenticate user with email and password"""
-    user = db.query(User).filter(User.email == email).first()
-    if not user or not verify_password(password, user.hashed_password):
+    query = select(User).where(User.email == email)
+    user = (await db.execute(query)).scalars().first()
+    if (user is None or not user.email_verified) and pin_primary(db):
+        # The replica may not have caught up with a fresh registration or verification
+        user = (await db.execute(query.execution_options(populate_existing=True))).scalars().first()
+    if not user or not await verify_password(password, user.hashed_password):
         return None
     if not user.email_verified:
         raise HTTPException(
@@ -305,11 +350,12 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
 async def register_user(
     user: UserRegister,
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Register a new user account"""
     # Check if user exists
-    if db.query(User).filter(User.email == user.email).first():
+    existing = await db.execute(select(User.id).where(User.email == user.email))
+    if existing.first():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
@@ -317,7 +363,7 @@ async def register_user(
     
     try:
         # Create user
-        hashed_password = hash_password(user.password)
+        hashed_password = await hash_password(user.password)
         db_user = User(
             email=user.email,
             hashed_password=hashed_password,
@@ -327,23 +373,26 @@ async def register_user(
             tier="Free"
         )
         db.add(db_user)
-        db.flush()  # Get the user ID without committing
+        await db.flush()  # Get the user ID without committing
         
         # Create verification token
         token = create_random_token()
         verification = EmailVerificationToken(
             token=token,
-            user=db_user  # Use relationship instead of user_id
+            user_id=db_user.id  # Assigning the relationship would lazy-load the collection
         )
         db.add(verification)
-        db.commit()
-        
-        # Send verification email
-        send_verification_email(user.email, token)
+        # Queued in the same transaction, delivered by the outbox worker
+        queue_verification_email(db, user.email, token)
+        await db.commit()
+        email_worker.wake()
         
         return {"message": "User registered successfully. Please check your email for verification."}
+    except HTTPException as e:
+        await db.rollback()
+        raise e
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error registering user: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -356,11 +405,13 @@ async def register_user(
 )
 async def login(
     form_data: UserLogin,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Authenticate user and get access token"""
-    user = authenticate_user(db, form_data.email, form_data.password)
+    user = await authenticate_user(db, form_data.email, form_data.password)
     if not user:
+        audit.log_security_event("login_failed", form_data.email, request, "Invalid credentials")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -368,7 +419,7 @@ async def login(
     
     # Update last login
     user.last_login = datetime.now(timezone.utc)
-    db.commit()
+    await db.commit()
     
     access_token = create_access_token(user.email)
     return {"access_token": access_token, "token_type": "bearer"}
@@ -386,9 +437,17 @@ async def reset_password():
     """Reset password using token"""
 
 # User Management Endpoints
-@router.get("/users/me", tags=["User Management"])
-async def get_profile():
+@router.get("/users/me", tags=["User Management"], response_model=UserResponse)
+async def get_profile(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
     """Get current user's profile"""
+    result = await db.execute(select(*USER_RESPONSE_COLUMNS).where(User.id == current_user.id))
+    row = result.first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return UserResponse.model_validate(row, from_attributes=True)
 
 @router.put("/users/me", tags=["User Management"])
 async def update_profile():
@@ -401,8 +460,8 @@ async def update_profile():
 )
 async def create_team(
     team: TeamCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
     """Create a new team"""
     try:
@@ -413,7 +472,7 @@ async def create_team(
             created_by=current_user.id
         )
         db.add(db_team)
-        db.flush()  # Get team ID without committing
+        await db.flush()  # Get team ID without committing
 
         # Add creator as team admin
         team_member = TeamMember(
@@ -423,34 +482,142 @@ async def create_team(
         )
         db.add(team_member)
         
-        # Log team creation
-        log = TeamActivityLog(
-            team_id=db_team.id,
-            user_id=current_user.id,
-            action="team_created",
-            details=f"Team {team.name} created"
-        )
-        db.add(log)
+        await db.commit()
+        await db.refresh(db_team)
         
-        db.commit()
-        db.refresh(db_team)
+        # Log team creation (written in the background)
+        log_team_activity(db_team.id, current_user.id, "team_created", f"Team {team.name} created")
         
         return db_team
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error creating team: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
 
-@router.get("/teams", tags=["Team Management"])
-async def list_teams():
+# Dashboards poll the team endpoints; let them revalidate with If-None-Match
+TEAM_CACHE_CONTROL = "private, no-cache"
+
+def _not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": TEAM_CACHE_CONTROL}
+    )
+
+@router.get("/teams",
+    tags=["Team Management"],
+    response_model=List[TeamResponse]
+)
+async def list_teams(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
     """List all teams for current user"""
+    result = await db.execute(
+        select(Team.id, Team.name, Team.organization, Team.created_at, Team.created_by, Team.version)
+        .join(TeamMember, TeamMember.team_id == Team.id)
+        .where(TeamMember.user_id == current_user.id)
+        .order_by(Team.id)
+    )
+    rows = result.all()
+
+    etag = team_list_etag(current_user.id, [(row.id, row.version) for row in rows])
+    if if_none_match(request.headers.get("if-none-match"), etag):
+        return _not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = TEAM_CACHE_CONTROL
+    return [TeamResponse.model_validate(row, from_attributes=True) for row in rows]
+
+@router.get("/teams/{team_id}",
+    tags=["Team Management"],
+    response_model=TeamDetailResponse
+)
+async def get_team(
+    team_id: int,
+    request: Request,
+    response: Response,
+    member_limit: int = Query(50, ge=1, le=200),
+    member_cursor: Optional[str] = Query(None, description="next_member_cursor from the previous page"),
+    db: AsyncSession = Depends(get_async_read_db),
+    authz: TeamAuthorizer = Depends(get_team_read_authorizer)
+):
+    """Get team details with a page of its members"""
+    access = await authz.require_member(team_id)
+    team = access.team
+
+    # Decided before touching the members: a poll that matches costs one query
+    etag = team_etag(team.id, team.version, member_limit, member_cursor)
+    if if_none_match(request.headers.get("if-none-match"), etag):
+        return _not_modified(etag)
+
+    query = (
+        select(User.email, TeamMember.role, TeamMember.joined_at, TeamMember.user_id)
+        .join(User, User.id == TeamMember.user_id)
+        .where(TeamMember.team_id == team_id)
+    )
+    if member_cursor:
+        query = query.where(TeamMember.user_id > decode_cursor(member_cursor, 1)[0])
+    # Ordered by user_id so the (team_id, user_id) unique index drives the page
+    rows = (await db.execute(query.order_by(TeamMember.user_id).limit(member_limit + 1))).all()
+
+    next_member_cursor = None
+    if len(rows) > member_limit:
+        rows = rows[:member_limit]
+        next_member_cursor = encode_cursor((rows[-1].user_id,))
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = TEAM_CACHE_CONTROL
+    return TeamDetailResponse(
+        id=team.id,
+        name=team.name,
+        organization=team.organization,
+        created_at=team.created_at,
+        created_by=team.created_by,
+        members=[TeamMemberResponse.model_validate(row, from_attributes=True) for row in rows],
+        next_member_cursor=next_member_cursor
+    )
 
-@router.get("/teams/{team_id}", tags=["Team Management"])
-async def get_team():
-    """Get team details"""
+@router.get("/teams/{team_id}/activity",
+    tags=["Team Management"],
+    response_model=TeamActivityPage
+)
+async def get_team_activity(
+    team_id: int,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserPrincipal = Depends(require(Permission.TEAM_VIEW_ANALYTICS, team_id="team_id"))
+):
+    """Team activity, newest first
+
+    Activity is written in the background, so events can take up to
+    TEAM_ACTIVITY_FLUSH_INTERVAL_SECONDS to appear.
+    """
+
+    # Email joined in the same query; (team_id, created_at, id) index drives the page
+    query = (
+        select(TeamActivityLog.id, TeamActivityLog.action, TeamActivityLog.details,
+               TeamActivityLog.created_at, User.email.label("user_email"))
+        .outerjoin(User, User.id == TeamActivityLog.user_id)
+        .where(TeamActivityLog.team_id == team_id)
+    )
+    if cursor:
+        query = query.where(tuple_(TeamActivityLog.created_at, TeamActivityLog.id) < decode_cursor(cursor, 2))
+    query = query.order_by(TeamActivityLog.created_at.desc(), TeamActivityLog.id.desc()).limit(limit + 1)
+    rows = (await db.execute(query)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor((rows[-1].created_at, rows[-1].id))
+    return TeamActivityPage(
+        items=[TeamActivityResponse.model_validate(row, from_attributes=True) for row in rows],
+        next_cursor=next_cursor
+    )
 
 @router.put("/teams/{team_id}",
     tags=["Team Management"],
@@ -459,44 +626,27 @@ async def get_team():
 async def update_team(
     team_id: int,
     team_update: TeamUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+    access: TeamAccess = Depends(require_team_manager)
 ):
     """Update team settings"""
     try:
-        team = db.query(Team).filter(Team.id == team_id).first()
-        if not team:
-            raise HTTPException(status_code=404, detail="Team not found")
-            
-        # Check permissions
-        team_member = db.query(TeamMember).filter(
-            TeamMember.team_id == team_id,
-            TeamMember.user_id == current_user.id,
-            TeamMember.role == "team_admin"
-        ).first()
-        
-        if not team_member and current_user.role != "admin":
-            raise HTTPException(status_code=403, detail="Not authorized")
+        team = access.team
         
         # Update team
         team.name = team_update.name
         team.organization = team_update.organization
         
-        # Log update
-        log = TeamActivityLog(
-            team_id=team_id,
-            user_id=current_user.id,
-            action="team_updated",
-            details=f"Team details updated"
-        )
-        db.add(log)
+        await db.commit()
         
-        db.commit()
+        # Log update
+        log_team_activity(team_id, current_user.id, "team_updated", "Team details updated")
         return {"message": "Team updated successfully"}
     except HTTPException as e:
         raise e
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error updating team: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -510,64 +660,37 @@ async def update_team(
 async def add_team_member(
     team_id: int,
     member: TeamMemberAdd,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+    authz: TeamAuthorizer = Depends(get_team_authorizer)
 ):
     """Add a member to a team"""
     try:
-        # Check if team exists
-        team = db.query(Team).filter(Team.id == team_id).first()
-        if not team:
-            raise HTTPException(status_code=404, detail="Team not found")
-            
-        # Check if current user is team admin
-        team_admin = db.query(TeamMember).filter(
-            TeamMember.team_id == team_id,
-            TeamMember.user_id == current_user.id,
-            TeamMember.role == "team_admin"
-        ).first()
-        
-        if not team_admin and current_user.role != "admin":
-            raise HTTPException(status_code=403, detail="Not authorized")
-            
-        # Get user to add
-        new_member = db.query(User).filter(User.email == member.user_email).first()
-        if not new_member:
+        # Team, caller's role and the new member's standing in one query
+        access = await authz.require_manager(team_id, target_email=member.user_email)
+        if access.target_user_id is None:
             raise HTTPException(status_code=404, detail="User not found")
-            
-        # Check if already a member
-        existing = db.query(TeamMember).filter(
-            TeamMember.team_id == team_id,
-            TeamMember.user_id == new_member.id
-        ).first()
-        
-        if existing:
+        if access.target_role is not None:
             raise HTTPException(status_code=400, detail="User is already a team member")
             
         # Add member
         team_member = TeamMember(
             team_id=team_id,
-            user_id=new_member.id,
+            user_id=access.target_user_id,
             role=member.role
         )
         db.add(team_member)
         
-        # Log activity
-        log = TeamActivityLog(
-            team_id=team_id,
-            user_id=current_user.id,
-            action="member_added",
-            details=f"Added {member.user_email} as {member.role}"
-        )
-        db.add(log)
+        await db.commit()
         
-        db.commit()
+        # Log activity
+        log_team_activity(team_id, current_user.id, "member_added", f"Added {member.user_email} as {member.role}")
         return {"message": "Team member added successfully"}
         
     except HTTPException as e:
         raise e
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error adding team member: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -575,10 +698,117 @@ async def add_team_member(
         )
 
 # Admin Control Endpoints
-@router.get("/users", tags=["Admin Controls"])
-@require_role("admin")
-async def list_users():
-    """List all system users (Admin only)"""
+def _user_page_query(filters: list, after: Optional[tuple], limit: int):
+    """Newest users first, keyed on (created_at, id) so deep pages stay cheap"""
+    query = select(*USER_RESPONSE_COLUMNS).where(*filters)
+    if after is not None:
+        query = query.where(tuple_(User.created_at, User.id) < after)
+    return query.order_by(User.created_at.desc(), User.id.desc()).limit(limit)
+
+@router.get("/users",
+    tags=["Admin Controls"],
+    response_model=UserListResponse
+)
+async def list_users(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    role: Optional[str] = None,
+    tier: Optional[str] = None,
+    email_verified: Optional[bool] = None,
+    is_active: Optional[bool] = None,
+    organization: Optional[str] = None,
+    export_format: Optional[Literal["ndjson"]] = Query(None, alias="format", description="ndjson streams every matching user"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_admin)
+):
+    """List system users, newest first (Admin only)"""
+    filters = []
+    if role is not None:
+        filters.append(User.role == role)
+    if tier is not None:
+        filters.append(User.tier == tier)
+    if email_verified is not None:
+        filters.append(User.email_verified == email_verified)
+    if is_active is not None:
+        filters.append(User.is_active == is_active)
+    if organization is not None:
+        filters.append(User.organization == organization)
+    after = decode_cursor(cursor, 2) if cursor else None
+
+    if export_format == "ndjson":
+        async def export():
+            position = after
+            # Fresh session: the request-scoped one may be closed before streaming ends
+            async with AsyncSessionLocal() as export_db:
+                while True:
+                    rows = (await export_db.execute(_user_page_query(filters, position, USER_EXPORT_PAGE_SIZE))).all()
+                    for row in rows:
+                        yield UserResponse.model_validate(row).model_dump_json().encode() + b"\n"
+                    if len(rows) < USER_EXPORT_PAGE_SIZE:
+                        return
+                    position = (rows[-1].created_at, rows[-1].id)
+
+        return StreamingResponse(export(), media_type="application/x-ndjson")
+
+    # One extra row tells us whether there is a next page
+    rows = (await db.execute(_user_page_query(filters, after, limit + 1))).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor((rows[-1].created_at, rows[-1].id))
+    return UserListResponse(
+        items=[UserResponse.model_validate(row) for row in rows],
+        next_cursor=next_cursor
+    )
+
+@router.post("/admin/users/import",
+    tags=["Admin Controls"],
+    response_class=StreamingResponse
+)
+async def bulk_import_users(
+    request: Request,
+    import_format: Optional[Literal["csv", "jsonl"]] = Query(None, alias="format"),
+    current_user: UserPrincipal = Depends(get_current_admin)
+):
+    """Bulk-create users from a CSV or JSON lines upload (Admin only)
+
+    The body is the raw file: CSV with an `email,password,first_name,last_name`
+    header, or one JSON object per line. Results are streamed back as JSON
+    lines, one per input row, followed by a summary line.
+    """
+    fmt = import_format or _import_format(request.headers.get("content-type", ""))
+    upload = await spool_upload(request.stream(), settings.BULK_IMPORT_MAX_BYTES)
+    importer = BulkUserImporter(
+        token_factory=create_random_token,
+        batch_size=settings.BULK_IMPORT_BATCH_SIZE,
+        max_rows=settings.BULK_IMPORT_MAX_ROWS
+    )
+
+    async def results():
+        try:
+            async for line in importer.run(iter_records(upload, fmt)):
+                yield line
+        finally:
+            upload.close()
+            audit.log_admin_action(
+                "users_bulk_imported",
+                current_user.email,
+                target=f"{importer.counts['created']} users",
+                details=", ".join(f"{k}={v}" for k, v in sorted(importer.counts.items()))
+            )
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+def _import_format(content_type: str) -> str:
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type in ("text/csv", "application/csv"):
+        return "csv"
+    if media_type in ("application/x-ndjson", "application/jsonl", "application/x-jsonlines"):
+        return "jsonl"
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail=f"Upload must be one of: {', '.join(SUPPORTED_FORMATS)} (set Content-Type or ?format=)"
+    )
 
 @router.put("/users/{user_id}/role", tags=["Admin Controls"])
 async def update_user_role():
@@ -594,19 +824,21 @@ async def update_member_role():
 )
 async def register_admin(
     form_data: AdminRegister,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     settings: Settings = Depends(get_settings)
 ):
     """Register an admin user"""
     try:
         if form_data.registration_key != settings.ADMIN_REGISTRATION_KEY:
+            audit.log_security_event("admin_register_denied", form_data.email, request, "Invalid registration key")
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Invalid registration key"
             )
         
         # Create admin user
-        hashed_password = hash_password(form_data.password)
+        hashed_password = await hash_password(form_data.password)
         db_user = User(
             email=form_data.email,
             hashed_password=hashed_password,
@@ -615,13 +847,14 @@ async def register_admin(
             email_verified=True  # Auto-verify admin accounts
         )
         db.add(db_user)
-        db.commit()
+        await db.commit()
+        audit.log_security_event("admin_registered", form_data.email, request, "Admin account created")
         
         return {"message": "Admin user created successfully"}
     except HTTPException as e:
         raise e
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error registering admin: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -634,11 +867,13 @@ async def register_admin(
 )
 async def admin_login(
     form_data: UserLogin,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Admin login endpoint"""
-    user = authenticate_user(db, form_data.email, form_data.password)
+    user = await authenticate_user(db, form_data.email, form_data.password)
     if not user or user.role != "admin":
+        audit.log_security_event("admin_login_failed", form_data.email, request, "Invalid admin credentials")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid admin credentials"
@@ -646,8 +881,9 @@ async def admin_login(
     
     # Update last login
     user.last_login = datetime.now(timezone.utc)
-    db.commit()
+    await db.commit()
     
+    audit.log_security_event("admin_login", user.email, request, "Admin signed in")
     access_token = create_access_token(user.email)
     return {"access_token": access_token, "token_type": "bearer"}
 
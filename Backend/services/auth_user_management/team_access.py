@@ -0,0 +1,103 @@
+"""
+services/auth_user_management/team_access.py
+
+Team authorization in one round-trip.
+
+Team endpoints need the team, the caller's membership and often the
+membership of a target user. `TeamAuthorizer.resolve` fetches all of it
+with a single joined query and remembers the answer for the rest of the
+request, so several checks against the same team cost one query.
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from services.auth_user_management.models import Team, TeamMember, User
+from services.auth_user_management.principal_cache import UserPrincipal
+from services.auth_user_management.rbac import Role
+
+TEAM_ADMIN_ROLE = "team_admin"
+
+
+@dataclass(frozen=True)
+class TeamAccess:
+    """What the caller may do with a team, plus the target user's standing"""
+    team: Team
+    caller_role: Optional[str]  # caller's TeamMember.role, None if not a member
+    is_system_admin: bool
+    target_user_id: Optional[int] = None  # None if no target or no such user
+    target_role: Optional[str] = None  # target's TeamMember.role, None if not a member
+
+    @property
+    def is_member(self) -> bool:
+        return self.caller_role is not None or self.is_system_admin
+
+    @property
+    def can_manage(self) -> bool:
+        return self.caller_role == TEAM_ADMIN_ROLE or self.is_system_admin
+
+
+class TeamAuthorizer:
+    """Per-request resolver; obtain it through the `get_team_authorizer` dependency"""
+
+    def __init__(self, db: AsyncSession, user: UserPrincipal):
+        self.db = db
+        self.user = user
+        self._resolved: Dict[Tuple[int, Optional[str]], Optional[TeamAccess]] = {}
+
+    async def resolve(self, team_id: int, target_email: Optional[str] = None) -> Optional[TeamAccess]:
+        """Team, caller membership and target membership; None if the team doesn't exist"""
+        key = (team_id, target_email)
+        if key in self._resolved:
+            return self._resolved[key]
+        if target_email is None:
+            # A lookup made with a target already answered the team-only question
+            for (resolved_team_id, _), access in self._resolved.items():
+                if resolved_team_id == team_id:
+                    return access
+
+        caller = aliased(TeamMember)
+        query = select(Team, caller.role).select_from(Team).outerjoin(
+            caller, and_(caller.team_id == Team.id, caller.user_id == self.user.id)
+        )
+        if target_email is not None:
+            target_user = aliased(User)
+            target_member = aliased(TeamMember)
+            query = query.add_columns(target_user.id, target_member.role).outerjoin(
+                target_user, target_user.email == target_email
+            ).outerjoin(
+                target_member, and_(target_member.team_id == Team.id, target_member.user_id == target_user.id)
+            )
+        row = (await self.db.execute(query.where(Team.id == team_id))).first()
+
+        access = None
+        if row is not None:
+            access = TeamAccess(
+                team=row[0],
+                caller_role=row[1],
+                is_system_admin=self.user.role == Role.ADMIN.value,
+                target_user_id=row[2] if target_email is not None else None,
+                target_role=row[3] if target_email is not None else None
+            )
+        self._resolved[key] = access
+        return access
+
+    async def require_member(self, team_id: int, target_email: Optional[str] = None) -> TeamAccess:
+        access = await self.resolve(team_id, target_email)
+        if access is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Team not found")
+        if not access.is_member:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+        return access
+
+    async def require_manager(self, team_id: int, target_email: Optional[str] = None) -> TeamAccess:
+        access = await self.resolve(team_id, target_email)
+        if access is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Team not found")
+        if not access.can_manage:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+        return access
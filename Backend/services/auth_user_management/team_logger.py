@@ -1,64 +1,186 @@
+"""
+services/auth_user_management/team_logger.py
+
+Write-behind team activity log.
+
+Handlers call `log_team_activity(...)` after their own commit; it only
+appends to an in-memory buffer. A background task flushes the buffer in
+batches with one executemany insert per batch, so recording activity
+never adds a round-trip or a commit to the request. Foreign keys already
+guarantee the team and user exist, so nothing is re-queried here.
+
+A batch the database rejects outright (a constraint or data error) is split
+in half until the offending rows are isolated and dropped, so one bad row
+cannot hold back the events queued behind it. Batches that fail for any
+other reason are retried on later flushes, up to `max_attempts` times.
+"""
+import asyncio
+from collections import deque
 from datetime import datetime, timezone
-from sqlalchemy.orm import Session
-from services.auth_user_management.models import TeamActivityLog, User, Team
+from typing import Deque, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+
+from services.auth_user_management.config import get_settings
+from services.auth_user_management.database import AsyncSessionLocal
 from services.auth_user_management.logger import setup_logger
+from services.auth_user_management.metrics import (
+    team_activity_batch_size,
+    team_activity_dropped_total,
+    team_activity_flush_errors_total,
+)
+from services.auth_user_management.models import TeamActivityLog
 
 logger = setup_logger("team_logger")
 
+settings = get_settings()
+
+
 class TeamActivityLogger:
-    def __init__(self, db: Session):
-        self.db = db
+    """Buffers activity rows and bulk-inserts them from a background task.
+
+    The buffer is bounded; when the database is unreachable for long enough
+    to fill it, new events are dropped and counted rather than blocking
+    request handlers.
+    """
 
-    def log_activity(
+    def __init__(
         self,
-        team_id: int,
-        user_id: int,
-        action: str,
-        details: str
+        session_factory=AsyncSessionLocal,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        max_buffer: int = 10000,
+        max_attempts: int = 30
     ):
-        """Log team activity with enhanced error handling"""
-        try:
-            # Verify team and user exist
-            team = self.db.query(Team).filter(Team.id == team_id).first()
-            user = self.db.query(User).filter(User.id == user_id).first()
-            
-            if not team or not user:
-                logger.error(
-                    f"Failed to log activity: Team {team_id} or User {user_id} not found"
-                )
-                return
-            
-            # Create activity log
-            activity = TeamActivityLog(
-                team_id=team_id,
-                user_id=user_id,
-                action=action,
-                details=details,
-                created_at=datetime.now(timezone.utc)
-            )
-            
-            self.db.add(activity)
-            self.db.commit()
-            
-            logger.info(
-                f"Team activity logged | "
-                f"Team: {team.name} | "
-                f"User: {user.email} | "
-                f"Action: {action}"
+        self.session_factory = session_factory
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_buffer = max(self.batch_size, max_buffer)
+        self.max_attempts = max(1, max_attempts)
+        self._buffer: Deque[Dict] = deque()
+        # Failed flushes of the rows at the head of the buffer
+        self._head_failures = 0
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def log_activity(self, team_id: int, user_id: int, action: str, details: str) -> None:
+        """Queue one activity row; never blocks or touches the database"""
+        if len(self._buffer) >= self.max_buffer:
+            team_activity_dropped_total.labels(reason="buffer_full").inc()
+            return
+        self._buffer.append({
+            "team_id": team_id,
+            "user_id": user_id,
+            "action": action,
+            "details": details,
+            "created_at": datetime.now(timezone.utc)
+        })
+        if len(self._buffer) >= self.batch_size and self._wake is not None:
+            self._wake.set()
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._stopping = False
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and write out whatever is still buffered"""
+        if self._task is not None:
+            self._stopping = True
+            self._wake.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Insert buffered rows in batches; returns how many were written"""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        written = 0
+        async with self._flush_lock:
+            while self._buffer:
+                batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+                # Stack of chunks still to insert, next one last
+                pending = [batch]
+                while pending:
+                    chunk = pending.pop()
+                    try:
+                        async with self.session_factory() as db:
+                            await db.execute(insert(TeamActivityLog), chunk)
+                            await db.commit()
+                    except DBAPIError as e:
+                        if _is_transient(e):
+                            self._retry_later([chunk, *reversed(pending)], e)
+                            return written
+                        if len(chunk) == 1:
+                            team_activity_dropped_total.labels(reason="rejected").inc()
+                            logger.error(f"Dropping team activity row rejected by the database: {str(e)}")
+                            continue
+                        # Split to isolate the rows the database rejects
+                        middle = len(chunk) // 2
+                        pending.extend([chunk[middle:], chunk[:middle]])
+                        continue
+                    except Exception as e:
+                        self._retry_later([chunk, *reversed(pending)], e)
+                        return written
+                    self._head_failures = 0
+                    team_activity_batch_size.observe(len(chunk))
+                    written += len(chunk)
+        return written
+
+    def _retry_later(self, chunks: List[List[Dict]], error: Exception) -> None:
+        """Put unwritten rows back at the head of the buffer, or drop them
+        once the head has failed `max_attempts` flushes in a row"""
+        rows = [row for chunk in chunks for row in chunk]
+        team_activity_flush_errors_total.inc()
+        self._head_failures += 1
+        if self._head_failures >= self.max_attempts:
+            self._head_failures = 0
+            team_activity_dropped_total.labels(reason="retries_exhausted").inc(len(rows))
+            logger.error(
+                f"Dropping {len(rows)} team activity rows after {self.max_attempts} failed attempts: {str(error)}"
             )
-            
-        except Exception as e:
-            logger.error(f"Error logging team activity: {str(e)}")
-            self.db.rollback()
-            raise
-
-def log_team_activity(
-    db: Session,
-    team_id: int,
-    user_id: int,
-    action: str,
-    details: str
-):
+            return
+        logger.error(f"Error writing {len(rows)} team activity rows: {str(error)}")
+        # Keep them for the next flush if there is room, oldest first
+        room = self.max_buffer - len(self._buffer)
+        if room < len(rows):
+            team_activity_dropped_total.labels(reason="buffer_full").inc(len(rows) - room)
+        self._buffer.extendleft(reversed(rows[:max(0, room)]))
+
+
+def _is_transient(error: DBAPIError) -> bool:
+    """Lost connections and lock or timeout errors may succeed on a retry;
+    constraint and data errors will not"""
+    return isinstance(error, (OperationalError, InterfaceError)) or error.connection_invalidated
+
+
+team_activity_logger = TeamActivityLogger(
+    batch_size=settings.TEAM_ACTIVITY_BATCH_SIZE,
+    flush_interval=settings.TEAM_ACTIVITY_FLUSH_INTERVAL_SECONDS,
+    max_buffer=settings.TEAM_ACTIVITY_BUFFER_SIZE,
+    max_attempts=settings.TEAM_ACTIVITY_MAX_ATTEMPTS
+)
+
+
+def log_team_activity(team_id: int, user_id: int, action: str, details: str) -> None:
     """Convenience function for logging team activity"""
-    logger = TeamActivityLogger(db)
-    logger.log_activity(team_id, user_id, action, details) 
\ No newline at end of file
+    team_activity_logger.log_activity(team_id, user_id, action, details)
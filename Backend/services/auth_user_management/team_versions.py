@@ -0,0 +1,80 @@
+"""
+services/auth_user_management/team_versions.py
+
+Per-team version counter used to build ETags for the team endpoints.
+
+`Team.version` is bumped in the same flush as any change to the team row or
+its memberships, so a client holding an ETag built from it can be answered
+with 304 after a single indexed lookup.
+"""
+import hashlib
+from itertools import chain
+from typing import Iterable, Tuple
+
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+
+from services.auth_user_management.models import Team, TeamMember
+
+_PENDING_KEY = "team_version_bumps"
+
+
+def team_etag(team_id: int, version: int, *variant) -> str:
+    """ETag for one team's representation; `variant` covers query parameters"""
+    suffix = "-".join(str(v) for v in variant if v is not None)
+    return f'"team-{team_id}-v{version}{"-" + suffix if suffix else ""}"'
+
+
+def team_list_etag(user_id: int, versions: Iterable[Tuple[int, int]]) -> str:
+    """ETag for a user's team list, from each (team id, version)"""
+    digest = hashlib.sha1(repr((user_id, sorted(versions))).encode()).hexdigest()[:20]
+    return f'"teams-{digest}"'
+
+
+def if_none_match(header: str, etag: str) -> bool:
+    """True if an If-None-Match header value matches etag"""
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+# -----------------------------------------------------------------------------
+# Version bump hooks
+# Registered on the ORM Session class, so they also fire for AsyncSession.
+# -----------------------------------------------------------------------------
+def _bump(team: Team) -> None:
+    # Evaluated by the database, so concurrent writers never lose an increment
+    team.version = Team.version + 1
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_team_changes(session, flush_context, instances):
+    bumped = set()
+    for obj in session.dirty:
+        if isinstance(obj, Team) and session.is_modified(obj, include_collections=False):
+            _bump(obj)
+            bumped.add(obj.id)
+
+    team_ids = {
+        obj.team_id
+        for obj in chain(session.new, session.dirty, session.deleted)
+        if isinstance(obj, TeamMember) and obj.team_id is not None
+    } - bumped
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    for team_id in team_ids:
+        team = session.identity_map.get(identity_key(Team, team_id))
+        if team is not None and team not in session.new:
+            _bump(team)
+        elif team is None:
+            pending.add(team_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_unloaded_teams(session, flush_context):
+    team_ids = session.info.pop(_PENDING_KEY, None)
+    if team_ids:
+        session.connection().execute(
+            update(Team).where(Team.id.in_(team_ids)).values(version=Team.version + 1)
+        )
@@ -0,0 +1,61 @@
+"""
+services/auth_user_management/token_cache.py
+
+Verified-token cache in front of `jwt.decode`.
+
+Clients reuse the same access token for its whole lifetime, so the HMAC
+check and JSON parsing only need to happen once per token. Entries are
+keyed by a SHA-256 digest of the raw token (the token itself is never
+stored) and expire at the token's `exp`.
+"""
+import hashlib
+from types import MappingProxyType
+from typing import Mapping
+
+from jose import jwt
+
+from services.auth_user_management.cache import TTLCache
+from services.auth_user_management.config import get_settings
+from services.auth_user_management.metrics import token_cache_requests_total
+
+settings = get_settings()
+
+
+class TokenVerificationCache:
+    def __init__(self, maxsize: int, secret_key: str, algorithm: str):
+        self._cache = TTLCache(maxsize)
+        self._secret_key = secret_key
+        self._algorithms = [algorithm]
+
+    def decode(self, token: str) -> Mapping:
+        """Return the verified claims, raising JWTError like jwt.decode"""
+        key = hashlib.sha256(token.encode()).digest()
+        claims = self._cache.get(key)
+        if claims is not None:
+            token_cache_requests_total.labels(result="hit").inc()
+            return claims
+
+        token_cache_requests_total.labels(result="miss").inc()
+        payload = jwt.decode(token, self._secret_key, algorithms=self._algorithms)
+        # Shared between requests, so hand out a read-only view
+        claims = MappingProxyType(payload)
+        exp = payload.get("exp")
+        if exp is not None:
+            # Tokens without exp are never cached: nothing bounds their lifetime
+            self._cache.set(key, claims, float(exp))
+        return claims
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+token_cache = TokenVerificationCache(
+    maxsize=settings.TOKEN_CACHE_MAX_SIZE,
+    secret_key=settings.JWT_SECRET_KEY,
+    algorithm=settings.JWT_ALGORITHM
+)
+
+
+def decode_access_token(token: str) -> Mapping:
+    """Decode and verify an access token, memoizing the result"""
+    return token_cache.decode(token)
@@ -0,0 +1,220 @@
+"""
+services/deployment_inference/backends.py
+
+Model runtimes the inference engine can serve.
+
+A backend loads once, then scores whole micro-batches: `predict_batch`
+receives every input collected for one batch and returns one output per
+input, in order. It runs on the inference worker pool, never on the event
+loop. `validate` runs on the event loop as a request arrives, so it must
+stay cheap; it raises ValueError for input the model cannot take.
+
+Generation backends also implement `generate`, which returns a lazy
+iterator of text tokens. The streamer pulls one token at a time on the
+worker pool, so a model only does work while a client is reading.
+"""
+import math
+import re
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+SUPPORTED_BACKENDS = ("reference", "echo", "onnx")
+
+
+class InferenceBackend:
+    kind = "base"
+    # Largest batch the model accepts, when the model itself fixes one
+    max_batch_size: Optional[int] = None
+
+    def load(self) -> None:
+        """Load weights; called once on the worker pool before serving"""
+
+    def validate(self, item: Any) -> Any:
+        return item
+
+    def predict_batch(self, items: List[Any]) -> List[Any]:
+        raise NotImplementedError
+
+
+class ReferenceSentimentModel(InferenceBackend):
+    """Tiny bag-of-words logistic regression, for tests and smoke checks.
+
+    Input is a string or {"text": str}; output is {"label", "score"} where
+    score is the probability of "positive". Deterministic and dependency
+    free, so it behaves the same on every machine.
+    """
+    kind = "reference"
+
+    TOKEN_PATTERN = re.compile(r"[a-z']+")
+    BIAS = -0.1
+    WEIGHTS = {
+        "good": 1.6, "great": 2.2, "excellent": 2.6, "love": 2.0, "fast": 0.9, "helpful": 1.4,
+        "accurate": 1.5, "reliable": 1.3, "easy": 0.8, "happy": 1.5, "recommend": 1.2,
+        "bad": -1.7, "poor": -1.8, "terrible": -2.6, "hate": -2.2, "slow": -1.0, "broken": -2.0,
+        "wrong": -1.4, "useless": -2.3, "confusing": -1.1, "expensive": -0.7, "crash": -1.9,
+    }
+    NEGATIONS = {"not", "no", "never", "isn't", "wasn't", "don't", "doesn't"}
+    MAX_TEXT_CHARS = 10_000
+
+    def validate(self, item: Any) -> str:
+        text = item.get("text") if isinstance(item, dict) else item
+        if not isinstance(text, str) or not text.strip():
+            raise ValueError('Each input must be a non-empty string or {"text": "..."}')
+        if len(text) > self.MAX_TEXT_CHARS:
+            raise ValueError(f"Input text is limited to {self.MAX_TEXT_CHARS} characters")
+        return text
+
+    def _logit(self, text: str) -> float:
+        logit, negate = self.BIAS, False
+        for token in self.TOKEN_PATTERN.findall(text.lower()):
+            if token in self.NEGATIONS:
+                negate = True
+                continue
+            weight = self.WEIGHTS.get(token)
+            if weight is not None:
+                logit += -weight if negate else weight
+                negate = False
+        return logit
+
+    def predict_batch(self, items: List[str]) -> List[Dict[str, Any]]:
+        outputs = []
+        for text in items:
+            score = 1 / (1 + math.exp(-self._logit(text)))
+            outputs.append({"label": "positive" if score >= 0.5 else "negative", "score": round(score, 4)})
+        return outputs
+
+
+class GenerationBackend(InferenceBackend):
+    # Tokens produced by predict, which returns whole completions
+    default_max_tokens = 256
+
+    def generate(self, prompt: Any, max_tokens: int) -> Iterator[str]:
+        """Yield up to max_tokens tokens for a validated prompt.
+
+        Must be lazy (a generator): each token is computed when it is
+        requested, and the iterator is closed early when the client leaves.
+        """
+        raise NotImplementedError
+
+    def predict_batch(self, items: List[Any]) -> List[Dict[str, Any]]:
+        return [{"text": "".join(self.generate(item, self.default_max_tokens))} for item in items]
+
+
+class EchoGenerator(GenerationBackend):
+    """Streams the prompt back word by word, for tests and smoke checks.
+
+    Input is a string or {"prompt": str}. `token_delay_ms` sleeps before
+    each token to stand in for decode time.
+    """
+    kind = "echo"
+
+    TOKEN_PATTERN = re.compile(r"\s*\S+")
+    MAX_PROMPT_CHARS = 10_000
+
+    def __init__(self, token_delay_ms: float = 0.0):
+        self.token_delay = max(0.0, token_delay_ms) / 1000
+
+    def validate(self, item: Any) -> str:
+        prompt = item.get("prompt") if isinstance(item, dict) else item
+        if not isinstance(prompt, str) or not prompt.strip():
+            raise ValueError('Each prompt must be a non-empty string or {"prompt": "..."}')
+        if len(prompt) > self.MAX_PROMPT_CHARS:
+            raise ValueError(f"Prompt is limited to {self.MAX_PROMPT_CHARS} characters")
+        return prompt
+
+    def generate(self, prompt: str, max_tokens: int) -> Iterator[str]:
+        for count, match in enumerate(self.TOKEN_PATTERN.finditer(prompt)):
+            if count >= max_tokens:
+                return
+            if self.token_delay:
+                time.sleep(self.token_delay)
+            yield match.group()
+
+
+class OnnxBackend(InferenceBackend):
+    """Any ONNX model with a dynamic or fixed leading batch dimension, on CPU.
+
+    Input is {input name: value for one example}; a model with a single
+    input also takes the bare value. Output is {output name: value}.
+    """
+    kind = "onnx"
+
+    # ONNX tensor element types we know how to feed
+    DTYPES = {
+        "tensor(float)": "float32",
+        "tensor(double)": "float64",
+        "tensor(int64)": "int64",
+        "tensor(int32)": "int32",
+        "tensor(bool)": "bool",
+    }
+
+    def __init__(self, path: str, threads: int = 1):
+        self.path = path
+        self.threads = threads
+        self._session = None
+        self._inputs: List[Tuple[str, str]] = []
+
+    def load(self) -> None:
+        import onnxruntime  # Only needed when an ONNX model is configured
+
+        options = onnxruntime.SessionOptions()
+        # Parallelism comes from the worker pool; one thread per session avoids oversubscription
+        options.intra_op_num_threads = self.threads
+        self._session = onnxruntime.InferenceSession(self.path, options, providers=["CPUExecutionProvider"])
+        self._inputs = []
+        for tensor in self._session.get_inputs():
+            if tensor.type not in self.DTYPES:
+                raise ValueError(f"{self.path}: input {tensor.name} has unsupported type {tensor.type}")
+            self._inputs.append((tensor.name, self.DTYPES[tensor.type]))
+            batch_dim = tensor.shape[0] if tensor.shape else None
+            if isinstance(batch_dim, int) and batch_dim > 0:
+                self.max_batch_size = min(self.max_batch_size or batch_dim, batch_dim)
+
+    def validate(self, item: Any) -> Dict[str, Any]:
+        if not isinstance(item, dict):
+            if len(self._inputs) != 1:
+                raise ValueError(f"Each input must be an object with keys: {', '.join(name for name, _ in self._inputs)}")
+            item = {self._inputs[0][0]: item}
+        missing = [name for name, _ in self._inputs if name not in item]
+        if missing:
+            raise ValueError(f"Input is missing: {', '.join(missing)}")
+        return item
+
+    def predict_batch(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        import numpy as np
+
+        feeds = {name: np.asarray([item[name] for item in items], dtype=dtype) for name, dtype in self._inputs}
+        names = [output.name for output in self._session.get_outputs()]
+        results = self._session.run(names, feeds)
+        return [
+            {name: result[row].tolist() for name, result in zip(names, results)}
+            for row in range(len(items))
+        ]
+
+
+def parse_model_specs(value: str) -> List[Tuple[str, str, Optional[str]]]:
+    """Parse INFERENCE_MODELS, e.g. "sentiment=reference,writer=echo:20,fraud=onnx:/models/fraud.onnx" """
+    specs = []
+    for part in filter(None, (part.strip() for part in value.split(","))):
+        name, _, target = part.partition("=")
+        kind, _, argument = target.partition(":")
+        name, kind = name.strip(), kind.strip()
+        if not name or kind not in SUPPORTED_BACKENDS:
+            raise ValueError(
+                f"Invalid inference model spec {part!r}; expected name=reference, "
+                f"name=echo[:token delay ms] or name=onnx:/path/model.onnx"
+            )
+        if kind == "onnx" and not argument:
+            raise ValueError(f"Inference model {name} needs a path: {name}=onnx:/path/model.onnx")
+        specs.append((name, kind, argument.strip() or None))
+    return specs
+
+
+def create_backend(kind: str, argument: Optional[str] = None, threads: int = 1) -> InferenceBackend:
+    if kind == "reference":
+        return ReferenceSentimentModel()
+    if kind == "echo":
+        return EchoGenerator(float(argument or 0))
+    if kind == "onnx":
+        return OnnxBackend(argument, threads=threads)
+    raise ValueError(f"Unknown inference backend: {kind}")
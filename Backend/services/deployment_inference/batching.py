@@ -0,0 +1,215 @@
+"""
+services/deployment_inference/batching.py
+
+Dynamic micro-batching in front of one model.
+
+Predict requests append their inputs to a per-model queue and wait on a
+future. A collector task takes a free worker slot, then waits until the
+oldest queued input is `max_wait` old or `max_batch_size` inputs are
+queued, and hands that batch to the worker pool in one `predict_batch`
+call. While every slot is busy inputs keep queueing, so batches grow with
+load and shrink back to single inputs when traffic is light.
+"""
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Any, Deque, List, Optional, Set
+
+from fastapi import HTTPException, status
+
+from services.auth_user_management.logger import setup_logger
+from services.auth_user_management.metrics import (
+    inference_batch_seconds,
+    inference_batch_size,
+    inference_queue_depth,
+    inference_queue_seconds,
+    inference_rejections_total,
+    inference_requests_total,
+)
+from services.deployment_inference.backends import InferenceBackend
+
+logger = setup_logger("inference")
+
+
+class InferenceOverloaded(HTTPException):
+    """Raised when a model's queue cannot take more inputs"""
+    def __init__(self, retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Model is busy. Please try again shortly.",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
+class InferenceFailed(HTTPException):
+    def __init__(self):
+        super().__init__(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Inference failed")
+
+
+class InvalidModelInput(HTTPException):
+    def __init__(self, detail: str):
+        super().__init__(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
+
+
+@dataclass
+class _Job:
+    item: Any
+    future: asyncio.Future
+    enqueued: float = field(default_factory=time.monotonic)
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        name: str,
+        backend: InferenceBackend,
+        executor: Executor,
+        max_batch_size: int = 32,
+        max_wait: float = 0.005,
+        max_queue: int = 1024,
+        concurrency: int = 1
+    ):
+        self.name = name
+        self.backend = backend
+        self.executor = executor
+        # The model's own limit wins over the configured one
+        self.max_batch_size = max(1, min(max_batch_size, backend.max_batch_size or max_batch_size))
+        self.max_wait = max(0.0, max_wait)
+        self.max_queue = max(1, max_queue)
+        self.concurrency = max(1, concurrency)
+        self._jobs: Deque[_Job] = deque()
+        self._arrived: Optional[asyncio.Event] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._task: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+
+    @property
+    def queued(self) -> int:
+        return len(self._jobs)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._arrived = asyncio.Event()
+            self._slots = asyncio.Semaphore(self.concurrency)
+            self._task = asyncio.create_task(self._collect())
+
+    async def stop(self) -> None:
+        """Stop collecting, let running batches finish and fail whatever is still queued"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+        while self._jobs:
+            job = self._jobs.popleft()
+            if not job.future.done():
+                job.future.set_exception(InferenceOverloaded())
+        inference_queue_depth.labels(model=self.name).set(0)
+
+    async def predict(self, items: List[Any]) -> List[Any]:
+        """Outputs for items, in order, once the batches holding them have run"""
+        try:
+            validated = [self.backend.validate(item) for item in items]
+        except ValueError as e:
+            inference_requests_total.labels(model=self.name, status="invalid").inc(len(items))
+            raise InvalidModelInput(str(e))
+
+        if self._task is None:
+            raise InferenceOverloaded()
+        if len(self._jobs) + len(validated) > self.max_queue:
+            inference_rejections_total.labels(model=self.name).inc(len(validated))
+            logger.warning(f"Inference queue for {self.name} is full, rejecting {len(validated)} inputs")
+            raise InferenceOverloaded()
+
+        loop = asyncio.get_running_loop()
+        futures = []
+        for item in validated:
+            job = _Job(item, loop.create_future())
+            self._jobs.append(job)
+            futures.append(job.future)
+        inference_queue_depth.labels(model=self.name).set(len(self._jobs))
+        self._arrived.set()
+        # Cancelling the request (client gone) cancels these futures, and the
+        # collector drops cancelled inputs instead of running them
+        try:
+            return list(await asyncio.gather(*futures))
+        except Exception:
+            # One input failed; the rest of the request need not run
+            for future in futures:
+                future.cancel()
+            raise
+
+    async def _collect(self) -> None:
+        while True:
+            await self._slots.acquire()
+            try:
+                batch = await self._next_batch()
+            except BaseException:
+                self._slots.release()
+                raise
+            task = asyncio.create_task(self._run_batch(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _next_batch(self) -> List[_Job]:
+        while True:
+            while not self._jobs:
+                self._arrived.clear()
+                await self._arrived.wait()
+
+            # Inputs that waited for a slot past the deadline go out without further delay
+            deadline = self._jobs[0].enqueued + self.max_wait
+            while len(self._jobs) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._arrived.clear()
+                try:
+                    await asyncio.wait_for(self._arrived.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+
+            batch = []
+            while self._jobs and len(batch) < self.max_batch_size:
+                job = self._jobs.popleft()
+                if job.future.cancelled():
+                    inference_requests_total.labels(model=self.name, status="cancelled").inc()
+                else:
+                    batch.append(job)
+            inference_queue_depth.labels(model=self.name).set(len(self._jobs))
+            if batch:
+                return batch
+
+    async def _run_batch(self, batch: List[_Job]) -> None:
+        started = time.monotonic()
+        queue_seconds = inference_queue_seconds.labels(model=self.name)
+        for job in batch:
+            queue_seconds.observe(started - job.enqueued)
+        inference_batch_size.labels(model=self.name).observe(len(batch))
+        try:
+            loop = asyncio.get_running_loop()
+            outputs = await loop.run_in_executor(
+                self.executor, self.backend.predict_batch, [job.item for job in batch]
+            )
+            if len(outputs) != len(batch):
+                raise RuntimeError(f"returned {len(outputs)} outputs for {len(batch)} inputs")
+        except Exception as e:
+            logger.error(f"Inference batch of {len(batch)} failed on {self.name}: {str(e)}")
+            inference_requests_total.labels(model=self.name, status="error").inc(len(batch))
+            for job in batch:
+                if not job.future.done():
+                    job.future.set_exception(InferenceFailed())
+        else:
+            inference_requests_total.labels(model=self.name, status="ok").inc(len(batch))
+            for job, output in zip(batch, outputs):
+                if not job.future.done():
+                    job.future.set_result(output)
+        finally:
+            inference_batch_seconds.labels(model=self.name).observe(time.monotonic() - started)
+            self._slots.release()
@@ -0,0 +1,167 @@
+"""
+services/deployment_inference/engine.py
+
+The models this worker serves, each behind its own MicroBatcher (and a
+TokenStreamer for generation models), sharing one inference worker pool.
+
+Models come from INFERENCE_MODELS and are loaded in the application
+lifespan. A model that fails to load is logged and left out, so one bad
+file does not take the rest of the API down with it.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException, status
+
+from services.auth_user_management.config import get_settings
+from services.auth_user_management.logger import setup_logger
+from services.deployment_inference.backends import (
+    GenerationBackend,
+    InferenceBackend,
+    create_backend,
+    parse_model_specs,
+)
+from services.deployment_inference.batching import MicroBatcher
+from services.deployment_inference.streaming import TokenStreamer
+
+logger = setup_logger("inference")
+
+settings = get_settings()
+
+
+class ModelNotDeployed(HTTPException):
+    def __init__(self, model_id: str):
+        super().__init__(status_code=status.HTTP_404_NOT_FOUND, detail=f"Model {model_id} is not deployed")
+
+
+class GenerationNotSupported(HTTPException):
+    def __init__(self, model_id: str):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Model {model_id} does not generate text")
+
+
+class InferenceEngine:
+    def __init__(
+        self,
+        model_specs: str = "",
+        workers: int = 2,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        max_queue: int = 1024,
+        max_streams: int = 16,
+        max_new_tokens: int = 512,
+        stream_buffer_tokens: int = 32
+    ):
+        self.model_specs = model_specs
+        self.workers = max(1, workers)
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue = max_queue
+        self.max_streams = max_streams
+        self.max_new_tokens = max_new_tokens
+        self.stream_buffer_tokens = stream_buffer_tokens
+        self.models: Dict[str, MicroBatcher] = {}
+        self.streamers: Dict[str, TokenStreamer] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created on first deploy so importing the routes starts no threads
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+        return self._executor
+
+    async def start(self) -> None:
+        """Load and serve every model in INFERENCE_MODELS"""
+        for name, kind, argument in parse_model_specs(self.model_specs):
+            try:
+                await self.deploy(name, create_backend(kind, argument))
+            except Exception as e:
+                logger.error(f"Failed to load inference model {name} ({kind}): {str(e)}")
+
+    async def deploy(self, name: str, backend: InferenceBackend) -> MicroBatcher:
+        """Load a backend on the worker pool and start batching requests for it"""
+        executor = self._get_executor()
+        await asyncio.get_running_loop().run_in_executor(executor, backend.load)
+        batcher = MicroBatcher(
+            name,
+            backend,
+            executor,
+            max_batch_size=self.max_batch_size,
+            max_wait=self.max_wait,
+            max_queue=self.max_queue,
+            # One batch per worker; more would only queue inside the executor
+            concurrency=self.workers
+        )
+        await batcher.start()
+        previous = self.models.get(name)
+        self.models[name] = batcher
+        if previous is not None:
+            await previous.stop()
+
+        previous_streamer = self.streamers.pop(name, None)
+        if isinstance(backend, GenerationBackend):
+            self.streamers[name] = TokenStreamer(
+                name,
+                backend,
+                executor,
+                max_streams=self.max_streams,
+                max_tokens=self.max_new_tokens,
+                buffer_tokens=self.stream_buffer_tokens
+            )
+        if previous_streamer is not None:
+            await previous_streamer.stop()
+        logger.info(
+            f"Inference model {name} ({backend.kind}) ready: batches of up to {batcher.max_batch_size}, "
+            f"max wait {batcher.max_wait * 1000:g}ms"
+        )
+        return batcher
+
+    async def stop(self) -> None:
+        for streamer in self.streamers.values():
+            await streamer.stop()
+        self.streamers = {}
+        for batcher in self.models.values():
+            await batcher.stop()
+        self.models = {}
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def get(self, model_id: str) -> MicroBatcher:
+        batcher = self.models.get(model_id)
+        if batcher is None:
+            raise ModelNotDeployed(model_id)
+        return batcher
+
+    def get_streamer(self, model_id: str) -> TokenStreamer:
+        streamer = self.streamers.get(model_id)
+        if streamer is None:
+            if model_id in self.models:
+                raise GenerationNotSupported(model_id)
+            raise ModelNotDeployed(model_id)
+        return streamer
+
+    def describe(self) -> List[dict]:
+        return [
+            {
+                "id": name,
+                "backend": batcher.backend.kind,
+                "max_batch_size": batcher.max_batch_size,
+                "max_wait_ms": batcher.max_wait * 1000,
+                "queued": batcher.queued,
+                "generate": name in self.streamers,
+            }
+            for name, batcher in sorted(self.models.items())
+        ]
+
+
+inference_engine = InferenceEngine(
+    model_specs=settings.INFERENCE_MODELS,
+    workers=settings.INFERENCE_WORKERS,
+    max_batch_size=settings.INFERENCE_MAX_BATCH_SIZE,
+    max_wait_ms=settings.INFERENCE_MAX_WAIT_MS,
+    max_queue=settings.INFERENCE_MAX_QUEUE,
+    max_streams=settings.INFERENCE_MAX_STREAMS,
+    max_new_tokens=settings.INFERENCE_MAX_NEW_TOKENS,
+    stream_buffer_tokens=settings.INFERENCE_STREAM_BUFFER_TOKENS
+)
@@ -0,0 +1,136 @@
+"""
+services/deployment_inference/routes.py
+
+Inference endpoints, mounted under /v1.
+"""
+from typing import Any, Dict, List, Optional, Union
+
+from fastapi import APIRouter, Depends, Request
+from pydantic import BaseModel, Field
+
+from services.auth_user_management.config import get_settings
+from services.auth_user_management.principal_cache import UserPrincipal
+from services.auth_user_management.rbac import Permission, require
+from services.deployment_inference.batching import InferenceFailed
+from services.deployment_inference.engine import inference_engine
+from services.deployment_inference.streaming import TokenStreamResponse, ndjson_event, sse_event
+
+settings = get_settings()
+
+router = APIRouter(
+    responses={404: {"description": "Not found"}}
+)
+
+
+class PredictRequest(BaseModel):
+    inputs: List[Any] = Field(..., min_length=1, max_length=settings.INFERENCE_MAX_INPUTS_PER_REQUEST)
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "inputs": ["The model is fast and accurate", {"text": "Setup was confusing"}]
+            }
+        }
+    }
+
+
+class PredictResponse(BaseModel):
+    model: str
+    outputs: List[Any]
+
+
+class GenerateRequest(BaseModel):
+    prompt: Union[str, Dict[str, Any]]
+    max_tokens: Optional[int] = Field(None, ge=1, le=settings.INFERENCE_MAX_NEW_TOKENS)
+    stream: bool = True
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "prompt": "Summarize the quarterly report",
+                "max_tokens": 128
+            }
+        }
+    }
+
+
+class GenerateResponse(BaseModel):
+    model: str
+    text: str
+    finish_reason: str
+    tokens: int
+
+
+class DeployedModel(BaseModel):
+    id: str
+    backend: str
+    max_batch_size: int
+    max_wait_ms: float
+    queued: int
+    generate: bool
+
+
+@router.get("/models", response_model=List[DeployedModel])
+async def list_deployed_models(
+    current_user: UserPrincipal = Depends(require(Permission.VIEW_MODELS))
+):
+    """Models served by this API"""
+    return inference_engine.describe()
+
+
+@router.post("/models/{model_id}/predict", response_model=PredictResponse)
+async def predict(
+    model_id: str,
+    body: PredictRequest,
+    current_user: UserPrincipal = Depends(require(Permission.VIEW_MODELS))
+):
+    """Run a deployed model on one or more inputs
+
+    Inputs from concurrent requests are batched together; outputs come
+    back in the order of `inputs`.
+    """
+    outputs = await inference_engine.get(model_id).predict(body.inputs)
+    return {"model": model_id, "outputs": outputs}
+
+
+@router.post(
+    "/models/{model_id}/generate",
+    response_model=GenerateResponse,
+    responses={200: {"content": {"text/event-stream": {}, "application/x-ndjson": {}}}}
+)
+async def generate(
+    model_id: str,
+    body: GenerateRequest,
+    request: Request,
+    current_user: UserPrincipal = Depends(require(Permission.VIEW_MODELS))
+):
+    """Generate text, streaming tokens as they are produced
+
+    With `Accept: text/event-stream` tokens arrive as Server-Sent Events,
+    followed by a `done` (or `error`) event. Otherwise each event is a line
+    of JSON in a chunked response. `"stream": false` waits and returns the
+    whole completion. Closing the connection stops generation.
+    """
+    stream = inference_engine.get_streamer(model_id).open(body.prompt, body.max_tokens)
+
+    if body.stream:
+        if "text/event-stream" in request.headers.get("accept", ""):
+            encode, media_type = sse_event, "text/event-stream"
+        else:
+            encode, media_type = ndjson_event, "application/x-ndjson"
+        # no-transform and X-Accel-Buffering keep proxies from holding tokens back
+        headers = {"Cache-Control": "no-cache, no-transform", "X-Accel-Buffering": "no"}
+        return TokenStreamResponse(stream, encode, media_type=media_type, headers=headers)
+
+    pieces, finish = [], {}
+    try:
+        async for event in stream:
+            if "token" in event:
+                pieces.append(event["token"])
+            elif "error" in event:
+                raise InferenceFailed()
+            else:
+                finish = event
+    finally:
+        await stream.aclose()
+    return {"model": model_id, "text": "".join(pieces), **finish}
@@ -0,0 +1,242 @@
+"""
+services/deployment_inference/streaming.py
+
+Token streaming for generation models.
+
+Each stream holds one of the model's `max_streams` slots from the moment
+the request is accepted until the stream is closed. A producer task pulls
+tokens from the backend's iterator, one worker pool call per token, into a
+small buffer. When the client reads slower than the model writes, the
+buffer fills and the producer stops asking for tokens, so no worker thread
+waits on a slow socket. TokenStreamResponse closes the stream as soon as
+the client disconnects, which cancels the producer and frees the slot
+without waiting for the next token.
+"""
+import asyncio
+import json
+import time
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Dict, Optional, Set
+
+import anyio
+from fastapi.responses import StreamingResponse
+
+from services.auth_user_management.logger import setup_logger
+from services.auth_user_management.metrics import (
+    inference_active_streams,
+    inference_generated_tokens_total,
+    inference_streams_total,
+    inference_time_to_first_token_seconds,
+    inference_tokens_per_second,
+)
+from services.deployment_inference.backends import GenerationBackend
+from services.deployment_inference.batching import InferenceOverloaded, InvalidModelInput
+
+logger = setup_logger("inference")
+
+# Marks the end of the backend's iterator
+_END = object()
+# Marks a generation cut off at max_tokens with more tokens to come
+_TRUNCATED = object()
+
+
+class TokenStream:
+    """Async iterator of events for one generation:
+
+    {"token": str} for each token, then {"finish_reason": "stop" | "length",
+    "tokens": int}, or {"error": str} if the model fails part way.
+    """
+
+    def __init__(self, streamer: "TokenStreamer", prompt: Any, max_tokens: int):
+        self.streamer = streamer
+        self.max_tokens = max_tokens
+        self.tokens = 0
+        self.opened = time.monotonic()
+        self.first_token_at: Optional[float] = None
+        self._outcome: Optional[str] = None
+        self._closed = False
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=streamer.buffer_tokens)
+        # One token past the limit tells a cut-off generation from one that
+        # ended on exactly max_tokens; that token is never sent
+        self._iterator = iter(streamer.backend.generate(prompt, max_tokens + 1))
+        self._step: Optional[Future] = None
+        self._producer = asyncio.create_task(self._produce())
+
+    async def _produce(self) -> None:
+        try:
+            produced = 0
+            while True:
+                self._step = self.streamer.executor.submit(next, self._iterator, _END)
+                token = await asyncio.wrap_future(self._step)
+                self._step = None
+                if token is _END:
+                    break
+                if produced == self.max_tokens:
+                    token = _TRUNCATED
+                    break
+                # Waits while the buffer is full, so generation follows the client's pace
+                await self._queue.put(token)
+                produced += 1
+            await self._queue.put(token)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Generation failed on {self.streamer.name} after {self.tokens} tokens: {str(e)}")
+            await self._queue.put(e)
+
+    def __aiter__(self) -> "TokenStream":
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        if self._outcome is not None:
+            raise StopAsyncIteration
+        item = await self._queue.get()
+        name = self.streamer.name
+        if item is _END or item is _TRUNCATED:
+            self._outcome = "completed"
+            finish_reason = "length" if item is _TRUNCATED else "stop"
+            return {"finish_reason": finish_reason, "tokens": self.tokens}
+        if isinstance(item, Exception):
+            self._outcome = "error"
+            return {"error": "Generation failed"}
+
+        now = time.monotonic()
+        if self.first_token_at is None:
+            self.first_token_at = now
+            inference_time_to_first_token_seconds.labels(model=name).observe(now - self.opened)
+        self.tokens += 1
+        inference_generated_tokens_total.labels(model=name).inc()
+        return {"token": item}
+
+    async def aclose(self) -> None:
+        """Stop generating and free the slot; safe to call more than once"""
+        if self._closed:
+            return
+        self._closed = True
+        self._producer.cancel()
+        self._close_iterator()
+        self.streamer._release(self)
+
+        name = self.streamer.name
+        inference_streams_total.labels(model=name, status=self._outcome or "cancelled").inc()
+        if self.first_token_at is not None and self.tokens > 1:
+            elapsed = time.monotonic() - self.first_token_at
+            if elapsed > 0:
+                inference_tokens_per_second.labels(model=name).observe((self.tokens - 1) / elapsed)
+
+    def _close_iterator(self) -> None:
+        close = getattr(self._iterator, "close", None)
+        if close is None:
+            return
+        step = self._step
+        if step is not None and not step.done():
+            # A generator cannot be closed while a worker is inside it; close
+            # it on that worker once the current token is done
+            step.add_done_callback(lambda _: _close_quietly(close))
+        else:
+            _close_quietly(close)
+
+
+def _close_quietly(close: Callable[[], None]) -> None:
+    try:
+        close()
+    except Exception as e:
+        logger.warning(f"Error closing generation: {str(e)}")
+
+
+class TokenStreamer:
+    def __init__(
+        self,
+        name: str,
+        backend: GenerationBackend,
+        executor: Executor,
+        max_streams: int = 16,
+        max_tokens: int = 512,
+        buffer_tokens: int = 32
+    ):
+        self.name = name
+        self.backend = backend
+        self.executor = executor
+        self.max_streams = max(1, max_streams)
+        self.max_tokens = max(1, max_tokens)
+        self.buffer_tokens = max(1, buffer_tokens)
+        self._streams: Set[TokenStream] = set()
+
+    @property
+    def active(self) -> int:
+        return len(self._streams)
+
+    def open(self, prompt: Any, max_tokens: Optional[int] = None) -> TokenStream:
+        """Start generating, or raise before any response is sent"""
+        try:
+            prompt = self.backend.validate(prompt)
+        except ValueError as e:
+            raise InvalidModelInput(str(e))
+        if len(self._streams) >= self.max_streams:
+            inference_streams_total.labels(model=self.name, status="rejected").inc()
+            logger.warning(f"All {self.max_streams} generation slots for {self.name} are busy")
+            raise InferenceOverloaded()
+
+        stream = TokenStream(self, prompt, min(max_tokens or self.max_tokens, self.max_tokens))
+        self._streams.add(stream)
+        inference_active_streams.labels(model=self.name).set(len(self._streams))
+        return stream
+
+    def _release(self, stream: TokenStream) -> None:
+        self._streams.discard(stream)
+        inference_active_streams.labels(model=self.name).set(len(self._streams))
+
+    async def stop(self) -> None:
+        for stream in list(self._streams):
+            await stream.aclose()
+
+
+def sse_event(event: Dict[str, Any]) -> str:
+    """Server-Sent Events: tokens as unnamed events, then a "done" or "error" event"""
+    data = json.dumps(event, separators=(",", ":"))
+    if "token" in event:
+        return f"data: {data}\n\n"
+    return f"event: {'error' if 'error' in event else 'done'}\ndata: {data}\n\n"
+
+
+def ndjson_event(event: Dict[str, Any]) -> str:
+    return json.dumps(event, separators=(",", ":")) + "\n"
+
+
+class TokenStreamResponse(StreamingResponse):
+    """Streams a TokenStream and closes it when the response ends for any reason.
+
+    Always watches for the client disconnecting, including while waiting
+    for the next token, rather than finding out on the next failed write.
+    """
+
+    def __init__(
+        self,
+        stream: TokenStream,
+        encode: Callable[[Dict[str, Any]], str],
+        media_type: str,
+        headers: Optional[Dict[str, str]] = None
+    ):
+        self.stream = stream
+        super().__init__(self._encoded(encode), media_type=media_type, headers=headers)
+
+    async def _encoded(self, encode: Callable[[Dict[str, Any]], str]):
+        async for event in self.stream:
+            yield encode(event)
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            async with anyio.create_task_group() as task_group:
+                async def stream_then_stop() -> None:
+                    try:
+                        await self.stream_response(send)
+                    except OSError:
+                        # Client went away mid-write
+                        pass
+                    task_group.cancel_scope.cancel()
+
+                task_group.start_soon(stream_then_stop)
+                await self.listen_for_disconnect(receive)
+                task_group.cancel_scope.cancel()
+        finally:
+            await self.stream.aclose()
@@ -0,0 +1,281 @@
+"""
+services/model_catalog_discovery/index.py
+
+In-memory search index over the model catalog.
+
+Every catalog entry occupies the bit at its id in a set of Python ints used
+as bitsets:
+
+- one bitset per facet value (type, license, parameter-count bucket),
+- one bitset per common search term, and a set of ids per rare term
+  (a bitset costs max_id/8 bytes however few bits it holds),
+- one bitset of live entries.
+
+A search ANDs the term and facet bitsets, counts facets with popcounts and
+reads the page by scanning set bits above the cursor id. Because ids only
+grow, bit order is catalog order, so a cursor is just the last id seen and
+an entry never moves when others are added, changed or removed.
+"""
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+FACETS = ("type", "license", "params")
+
+# (label, lower bound inclusive) in ascending order
+PARAM_BUCKETS = (
+    ("<1B", 0),
+    ("1B-10B", 1_000_000_000),
+    ("10B-100B", 10_000_000_000),
+    (">=100B", 100_000_000_000),
+)
+
+# A term's posting becomes a bitset once it holds 1/DENSE_RATIO of the id
+# space; below that a set of ids is smaller
+DENSE_RATIO = 256
+MIN_DENSE_POSTINGS = 64
+
+try:
+    _popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def _popcount(value: int) -> int:
+        return bin(value).count("1")
+
+
+def tokenize(text: Optional[str]) -> Set[str]:
+    return set(TOKEN_PATTERN.findall(text.lower())) if text else set()
+
+
+def param_bucket(parameters: Optional[int]) -> Optional[str]:
+    if parameters is None:
+        return None
+    label = None
+    for bucket, lower in PARAM_BUCKETS:
+        if parameters >= lower:
+            label = bucket
+    return label
+
+
+def entry_terms(entry: Mapping) -> Set[str]:
+    """Searchable terms: name, description, tags, task and size"""
+    terms = tokenize(entry.get("name")) | tokenize(entry.get("description"))
+    terms |= tokenize(entry.get("task")) | tokenize(entry.get("size"))
+    for tag in entry.get("tags") or ():
+        terms |= tokenize(tag)
+    return terms
+
+
+def entry_facets(entry: Mapping) -> Tuple[Tuple[str, str], ...]:
+    values = (
+        ("type", entry.get("type")),
+        ("license", entry.get("license")),
+        ("params", param_bucket(entry.get("parameters"))),
+    )
+    return tuple((facet, value) for facet, value in values if value is not None)
+
+
+def _bitset(ids: Iterable[int], max_id: int) -> int:
+    bits = bytearray(max_id // 8 + 1)
+    for i in ids:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, "little")
+
+
+@dataclass
+class SearchResult:
+    items: List[dict]
+    total: int
+    next_after: Optional[int]  # id to resume after, None on the last page
+    facets: Dict[str, Dict[str, int]]
+
+
+class CatalogIndex:
+    """Not thread-safe; mutate and search from the event loop only"""
+
+    def __init__(self):
+        self._entries: Dict[int, dict] = {}
+        self._indexed: Dict[int, Tuple[Set[str], Tuple[Tuple[str, str], ...]]] = {}
+        self._updated_at: Dict[int, datetime] = {}  # deleted ids included
+        self._dense: Dict[str, int] = {}
+        self._sparse: Dict[str, Set[int]] = {}
+        self._facets: Dict[str, Dict[str, int]] = {facet: {} for facet in FACETS}
+        self._live = 0
+        self._max_id = 0
+        # Latest change applied; identical on every worker that has caught up
+        self.version: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def entries(self) -> Iterable[dict]:
+        return self._entries.values()
+
+    def get(self, entry_id: int) -> Optional[dict]:
+        return self._entries.get(entry_id)
+
+    def updated_at(self, entry_id: int) -> Optional[datetime]:
+        return self._updated_at.get(entry_id)
+
+    def _dense_threshold(self) -> int:
+        return max(MIN_DENSE_POSTINGS, self._max_id // DENSE_RATIO)
+
+    # -------------------------------------------------------------------------
+    # Building and incremental updates
+    # -------------------------------------------------------------------------
+    @classmethod
+    def build(cls, entries: Iterable[dict], deleted: Iterable[Tuple[int, datetime]] = ()) -> "CatalogIndex":
+        """Index everything in one pass; much faster than repeated upserts"""
+        index = cls()
+        postings: Dict[str, List[int]] = {}
+        facet_ids: Dict[str, Dict[str, List[int]]] = {facet: {} for facet in FACETS}
+        for entry in entries:
+            entry_id = entry["id"]
+            terms, facets = entry_terms(entry), entry_facets(entry)
+            index._entries[entry_id] = entry
+            index._indexed[entry_id] = (terms, facets)
+            index._note_change(entry_id, entry["updated_at"])
+            for term in terms:
+                postings.setdefault(term, []).append(entry_id)
+            for facet, value in facets:
+                facet_ids[facet].setdefault(value, []).append(entry_id)
+        for entry_id, deleted_at in deleted:
+            index._note_change(entry_id, deleted_at)
+
+        max_id = index._max_id = max(index._updated_at, default=0)
+        threshold = index._dense_threshold()
+        for term, ids in postings.items():
+            if len(ids) >= threshold:
+                index._dense[term] = _bitset(ids, max_id)
+            else:
+                index._sparse[term] = set(ids)
+        for facet, values in facet_ids.items():
+            index._facets[facet] = {value: _bitset(ids, max_id) for value, ids in values.items()}
+        index._live = _bitset(index._entries, max_id)
+        return index
+
+    def _note_change(self, entry_id: int, updated_at: datetime) -> None:
+        self._updated_at[entry_id] = updated_at
+        if self.version is None or updated_at > self.version:
+            self.version = updated_at
+
+    def upsert(self, entry: dict) -> None:
+        entry_id = entry["id"]
+        if entry_id in self._indexed:
+            self._unindex(entry_id)
+        self._max_id = max(self._max_id, entry_id)
+        terms, facets = entry_terms(entry), entry_facets(entry)
+        bit = 1 << entry_id
+        threshold = self._dense_threshold()
+        for term in terms:
+            if term in self._dense:
+                self._dense[term] |= bit
+                continue
+            ids = self._sparse.setdefault(term, set())
+            ids.add(entry_id)
+            if len(ids) >= threshold:
+                self._dense[term] = _bitset(self._sparse.pop(term), self._max_id)
+        for facet, value in facets:
+            values = self._facets[facet]
+            values[value] = values.get(value, 0) | bit
+        self._live |= bit
+        self._entries[entry_id] = entry
+        self._indexed[entry_id] = (terms, facets)
+        self._note_change(entry_id, entry["updated_at"])
+
+    def remove(self, entry_id: int, deleted_at: datetime) -> None:
+        if entry_id in self._indexed:
+            self._unindex(entry_id)
+            del self._entries[entry_id]
+        self._note_change(entry_id, deleted_at)
+
+    def _unindex(self, entry_id: int) -> None:
+        terms, facets = self._indexed.pop(entry_id)
+        clear = ~(1 << entry_id)
+        for term in terms:
+            if term in self._dense:
+                self._dense[term] &= clear
+            else:
+                ids = self._sparse.get(term)
+                if ids is not None:
+                    ids.discard(entry_id)
+                    if not ids:
+                        del self._sparse[term]
+        for facet, value in facets:
+            values = self._facets[facet]
+            values[value] &= clear
+            if not values[value]:
+                del values[value]
+        self._live &= clear
+
+    # -------------------------------------------------------------------------
+    # Search
+    # -------------------------------------------------------------------------
+    def _match(self, query: Optional[str]) -> int:
+        """Bitset of live entries containing every term of the query"""
+        matched = self._live
+        rare: List[Set[int]] = []
+        for term in tokenize(query):
+            if term in self._dense:
+                matched &= self._dense[term]
+            elif term in self._sparse:
+                rare.append(self._sparse[term])
+            else:
+                return 0
+        if rare:
+            rare.sort(key=len)
+            matched &= _bitset(rare[0].intersection(*rare[1:]), self._max_id)
+        return matched
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        filters: Optional[Mapping[str, Sequence[str]]] = None,
+        after: Optional[int] = None,
+        limit: int = 20
+    ) -> SearchResult:
+        """Entries matching the query and filters, in id order after `after`.
+
+        Values within a facet are OR'ed, facets are AND'ed. Each facet's
+        counts apply every filter except its own, so a client can show how
+        many results picking another value of that facet would give.
+        """
+        matched = self._match(query)
+        selected: Dict[str, int] = {}
+        for facet, values in (filters or {}).items():
+            if values:
+                masks = self._facets[facet]
+                selected[facet] = 0
+                for value in values:
+                    selected[facet] |= masks.get(value, 0)
+
+        result = matched
+        for mask in selected.values():
+            result &= mask
+
+        facet_counts: Dict[str, Dict[str, int]] = {}
+        for facet in FACETS:
+            base = matched
+            for other, mask in selected.items():
+                if other != facet:
+                    base &= mask
+            counts = {}
+            for value, mask in self._facets[facet].items():
+                count = _popcount(base & mask)
+                if count:
+                    counts[value] = count
+            facet_counts[facet] = counts
+
+        start = 0 if after is None else after + 1
+        remaining = result >> start
+        items: List[dict] = []
+        while remaining and len(items) < limit:
+            low = (remaining & -remaining).bit_length() - 1
+            start += low
+            items.append(self._entries[start])
+            remaining >>= low + 1
+            start += 1
+        next_after = items[-1]["id"] if remaining and items else None
+        return SearchResult(items, _popcount(result), next_after, facet_counts)
@@ -0,0 +1,312 @@
+"""
+services/model_catalog_discovery/ingest.py
+
+Bulk ingestion of model cards into the catalog.
+
+A dump (a JSON array, JSON lines or Parquet) is read as a stream of records
+and handled in batches, so memory stays flat however large the dump is.
+Each batch costs one lookup by slug, one executemany INSERT for new cards,
+one executemany UPDATE for changed ones and a single commit. Cards whose
+content hash matches the stored row are skipped without a write. Written
+rows are applied to the search index one by one instead of rebuilding it.
+
+Run from the Backend directory:
+    python -m services.model_catalog_discovery.ingest dump.jsonl [--format jsonl] [--batch-size 500]
+"""
+import argparse
+import asyncio
+import importlib.util
+import io
+import json
+import sys
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Dict, IO, Iterator, List, Optional, Tuple, Union
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from services.auth_user_management.bulk_import import iter_records
+from services.auth_user_management.config import get_settings
+from services.auth_user_management.database import AsyncSessionLocal, dispose_engines
+from services.auth_user_management.logger import setup_logger
+from services.auth_user_management.metrics import model_catalog_ingest_cards_total
+from services.model_catalog_discovery.models import CatalogModel, utcnow
+from services.model_catalog_discovery.schemas import CatalogModelIn, card_values
+from services.model_catalog_discovery.service import CATALOG_COLUMNS, ModelCatalog
+
+logger = setup_logger("model_catalog")
+
+settings = get_settings()
+
+SUPPORTED_FORMATS = ("json", "jsonl", "parquet")
+
+FORMAT_EXTENSIONS = {".json": "json", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet"}
+
+# Text read per refill when streaming a JSON array
+JSON_CHUNK_CHARS = 64 * 1024
+# A single record larger than this is treated as malformed rather than buffered
+MAX_RECORD_CHARS = 4 * 1024 * 1024
+
+PARQUET_BATCH_ROWS = 1024
+
+STATUSES = ("created", "updated", "unchanged", "duplicate", "deleted", "invalid", "error")
+
+
+@dataclass
+class CardResult:
+    row: int
+    status: str  # one of STATUSES
+    slug: Optional[str] = None
+    detail: Optional[str] = None
+
+    def to_line(self) -> bytes:
+        data = {k: v for k, v in asdict(self).items() if v is not None}
+        return json.dumps(data, separators=(",", ":")).encode() + b"\n"
+
+
+# -----------------------------------------------------------------------------
+# Record streams: (row number, record) pairs; a str record is a parse error
+# -----------------------------------------------------------------------------
+def iter_model_cards(dump: IO[bytes], fmt: str) -> Iterator[Tuple[int, Union[Dict, str]]]:
+    if fmt == "jsonl":
+        return iter_records(dump, "jsonl")
+    if fmt == "json":
+        return _iter_json_array(io.TextIOWrapper(dump, encoding="utf-8-sig"))
+    if fmt == "parquet":
+        return _iter_parquet(dump)
+    raise ValueError(f"Unsupported catalog dump format: {fmt}")
+
+
+def _iter_json_array(text: IO[str]) -> Iterator[Tuple[int, Union[Dict, str]]]:
+    """Decode a top-level JSON array one element at a time"""
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+    row_number = 0
+    state = "before"  # before, inside or after the array
+
+    def refill():
+        nonlocal buffer, pos, eof
+        chunk = text.read(JSON_CHUNK_CHARS)
+        buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if pos == len(buffer):
+            if not eof:
+                refill()
+                continue
+            if state == "before":
+                yield 1, "Expected a JSON array"
+            elif state == "inside":
+                yield row_number + 1, "Unterminated JSON array"
+            return
+
+        if state == "before":
+            if buffer[pos] != "[":
+                yield 1, "Expected a JSON array"
+                return
+            state = "inside"
+            pos += 1
+            continue
+        if state == "after":
+            yield row_number + 1, "Unexpected data after the JSON array"
+            return
+        if buffer[pos] == "]":
+            state = "after"
+            pos += 1
+            continue
+
+        try:
+            record, end = decoder.raw_decode(buffer, pos)
+        except ValueError:
+            # Either the record runs past the buffer or it is malformed
+            if eof or len(buffer) - pos > MAX_RECORD_CHARS:
+                yield row_number + 1, "Invalid JSON"
+                return
+            refill()
+            continue
+        pos = end
+        row_number += 1
+        yield row_number, record if isinstance(record, dict) else "Expected a JSON object"
+
+
+def parquet_supported() -> bool:
+    """pyarrow is optional; only Parquet dumps need it"""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _iter_parquet(dump: IO[bytes]) -> Iterator[Tuple[int, Union[Dict, str]]]:
+    try:
+        import pyarrow
+        import pyarrow.parquet as pq
+    except ImportError:
+        yield 1, "Parquet support requires pyarrow"
+        return
+
+    row_number = 0
+    try:
+        for batch in pq.ParquetFile(dump).iter_batches(batch_size=PARQUET_BATCH_ROWS):
+            for record in batch.to_pylist():
+                row_number += 1
+                yield row_number, record
+    except (pyarrow.ArrowException, OSError):
+        # Reported like a malformed JSON dump rather than cutting the response short
+        yield row_number + 1, "Invalid Parquet file"
+
+
+# -----------------------------------------------------------------------------
+# Ingestion
+# -----------------------------------------------------------------------------
+class CatalogIngester:
+    """Upserts cards by slug batch by batch, yielding one result per input row.
+
+    `catalog` is the in-process ModelCatalog to update as batches commit;
+    pass None when no index lives in this process (the CLI), and the API
+    workers pick the rows up on their next poll.
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal, catalog: Optional[ModelCatalog] = None, batch_size: int = 500):
+        self.session_factory = session_factory
+        self.catalog = catalog
+        self.batch_size = max(1, batch_size)
+        self.counts: Counter = Counter()
+
+    def _result(self, row: int, status: str, slug: Optional[str] = None, detail: Optional[str] = None) -> CardResult:
+        self.counts[status] += 1
+        model_catalog_ingest_cards_total.labels(status=status).inc()
+        return CardResult(row, status, slug, detail)
+
+    async def run(self, records: Iterator[Tuple[int, Union[Dict, str]]]) -> AsyncIterator[CardResult]:
+        # slug -> (row number, column values); one batch never holds a slug twice
+        batch: Dict[str, Tuple[int, Dict]] = {}
+        for row_number, record in records:
+            if isinstance(record, str):
+                yield self._result(row_number, "invalid", detail=record)
+                continue
+            try:
+                card = CatalogModelIn.model_validate({k: v for k, v in record.items() if v is not None})
+            except ValidationError as e:
+                yield self._result(row_number, "invalid", record.get("slug"), _validation_detail(e))
+                continue
+
+            values = card_values(card)
+            queued = batch.get(card.slug)
+            if queued is not None and queued[1]["content_hash"] == values["content_hash"]:
+                yield self._result(row_number, "duplicate", card.slug, f"Same card as row {queued[0]}")
+                continue
+            if queued is not None or len(batch) >= self.batch_size:
+                # A later version of a queued card goes in the next batch, so the last one wins
+                async for result in self._ingest_batch(batch):
+                    yield result
+                batch = {}
+            batch[card.slug] = (row_number, values)
+
+        if batch:
+            async for result in self._ingest_batch(batch):
+                yield result
+
+    async def _ingest_batch(self, batch: Dict[str, Tuple[int, Dict]]) -> AsyncIterator[CardResult]:
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(CatalogModel.id, CatalogModel.slug, CatalogModel.content_hash, CatalogModel.deleted_at)
+                .where(CatalogModel.slug.in_(list(batch)))
+            )
+            existing = {row.slug: row for row in result.all()}
+
+            now = utcnow()
+            inserts: List[Dict] = []
+            updates: List[Dict] = []
+            outcomes: Dict[str, Tuple[str, Optional[str]]] = {}
+            for slug, (_, values) in batch.items():
+                current = existing.get(slug)
+                if current is None:
+                    inserts.append({**values, "created_at": now, "updated_at": now})
+                    outcomes[slug] = ("created", None)
+                elif current.deleted_at is not None:
+                    # Deleted by an admin; a re-run of an old dump must not bring it back
+                    outcomes[slug] = ("deleted", "Deleted from the catalog")
+                elif current.content_hash == values["content_hash"]:
+                    outcomes[slug] = ("unchanged", None)
+                else:
+                    updates.append({**values, "id": current.id, "updated_at": now})
+                    outcomes[slug] = ("updated", None)
+
+            if inserts or updates:
+                try:
+                    if inserts:
+                        await db.execute(insert(CatalogModel), inserts)
+                    if updates:
+                        await db.execute(update(CatalogModel), updates)
+                    await db.commit()
+                except IntegrityError:
+                    # Lost a race with a concurrent write of the same slug; nothing in this batch was written
+                    await db.rollback()
+                    logger.warning(f"Catalog ingest batch of {len(batch)} cards conflicted with concurrent writes")
+                    for slug, (row_number, _) in batch.items():
+                        yield self._result(row_number, "error", slug, "Conflicted with a concurrent catalog write; retry this card")
+                    return
+
+                if self.catalog is not None:
+                    written = [values["slug"] for values in inserts] + [values["slug"] for values in updates]
+                    rows = (await db.execute(select(*CATALOG_COLUMNS).where(CatalogModel.slug.in_(written)))).all()
+                    for row in rows:
+                        self.catalog.apply(row)
+
+        for slug, (row_number, _) in batch.items():
+            status, detail = outcomes[slug]
+            yield self._result(row_number, status, slug, detail)
+
+
+def _validation_detail(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors()
+    )
+
+
+def dump_format(path: str) -> str:
+    for extension, fmt in FORMAT_EXTENSIONS.items():
+        if path.lower().endswith(extension):
+            return fmt
+    raise ValueError(f"Cannot tell the format of {path}; pass --format ({', '.join(SUPPORTED_FORMATS)})")
+
+
+# -----------------------------------------------------------------------------
+# Command line
+# -----------------------------------------------------------------------------
+async def _ingest_file(path: str, fmt: str, batch_size: int, verbose: bool) -> Counter:
+    ingester = CatalogIngester(batch_size=batch_size)
+    try:
+        with open(path, "rb") as dump:
+            async for result in ingester.run(iter_model_cards(dump, fmt)):
+                if verbose or result.status in ("invalid", "error", "deleted"):
+                    sys.stdout.buffer.write(result.to_line())
+    finally:
+        await dispose_engines()
+    return ingester.counts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="JSON array, JSON lines or Parquet dump of model cards")
+    parser.add_argument("--format", choices=SUPPORTED_FORMATS, help="Defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=settings.MODEL_CATALOG_IMPORT_BATCH_SIZE)
+    parser.add_argument("--verbose", action="store_true", help="Print every card's result, not only failures")
+    args = parser.parse_args(argv)
+
+    try:
+        fmt = args.format or dump_format(args.path)
+    except ValueError as e:
+        parser.error(str(e))
+    if fmt == "parquet" and not parquet_supported():
+        parser.error("Parquet dumps need pyarrow: pip install pyarrow")
+    counts = asyncio.run(_ingest_file(args.path, fmt, args.batch_size, args.verbose))
+    summary = {status: counts.get(status, 0) for status in STATUSES}
+    print(json.dumps({"summary": summary}), file=sys.stderr)
+    return 1 if counts.get("error") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
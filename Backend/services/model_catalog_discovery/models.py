@@ -0,0 +1,39 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import JSON, BigInteger, Boolean, Column, DateTime, Integer, String, Text
+from sqlalchemy.dialects import mysql
+
+from services.auth_user_management.database import Base
+
+# Change tracking compares timestamps, so keep microseconds on MySQL
+PreciseDateTime = DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql")
+
+def utcnow() -> datetime:
+    """Naive UTC, matching what MySQL and SQLite hand back"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+class CatalogModel(Base):
+    __tablename__ = "catalog_models"
+
+    # Ascending ids double as the catalog's sort order and pagination key
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    slug = Column(String(120), unique=True, nullable=False)
+    name = Column(String(200), nullable=False)
+    description = Column(Text)
+    model_type = Column("type", String(3), nullable=False)  # "LLM" or "SLM"
+    task = Column(String(100))
+    tags = Column(JSON, nullable=False, default=list)  # domains, e.g. ["finance", "healthcare"]
+    size = Column(String(20))  # small, medium, large
+    parameters = Column(BigInteger)  # parameter count
+    license = Column(String(100))
+    commercial = Column(Boolean, nullable=False, default=False)
+    tier = Column(String(20), nullable=False, default="free")
+    version = Column(String(20))
+    status = Column(String(20), nullable=False, default="ready")
+    metrics = Column(JSON)  # e.g. {"accuracy": 0.95, "latency": "150ms", "memory": "16GB"}
+    # SHA-256 of the card's canonical JSON; lets ingestion skip unchanged cards
+    content_hash = Column(String(64))
+    created_at = Column(DateTime, default=utcnow)
+    # Set on every change, deletes included; workers poll it to keep their index current
+    updated_at = Column(PreciseDateTime, nullable=False, default=utcnow, onupdate=utcnow, index=True)
+    deleted_at = Column(PreciseDateTime)
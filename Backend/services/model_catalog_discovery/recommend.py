@@ -0,0 +1,416 @@
+"""
+services/model_catalog_discovery/recommend.py
+
+"Models like this" and "best model for my use case" recommendations.
+
+Every catalog entry is one float32 row made of blocks: a hashed TF-IDF
+embedding of its name, description and tags; one-hot blocks for task,
+type, size, license, parameter-count bucket and latency class; and its
+benchmark scores. Each block has unit length and is scaled by the square
+root of its weight, so the dot product of two rows is the weighted sum of
+per-block cosine similarities. Scoring any number of queries against the
+whole catalog is then a single matrix product.
+
+The matrix depends on catalog-wide statistics (IDF, score ranges), so it
+is rebuilt in a worker thread rather than patched, at most once every
+MODEL_CATALOG_RECOMMEND_REBUILD_SECONDS. Until a rebuild finishes the
+previous one answers: removed models are filtered out and models added
+since are vectorized on the fly. Each build caches the top matches per
+model, so repeat lookups skip the matrix product entirely.
+"""
+import asyncio
+import math
+import re
+import time
+import zlib
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from fastapi import HTTPException, status
+
+from services.auth_user_management.config import get_settings
+from services.auth_user_management.logger import setup_logger
+from services.auth_user_management.metrics import model_catalog_recommend_cache_total
+from services.model_catalog_discovery.index import TOKEN_PATTERN, CatalogIndex, param_bucket
+from services.model_catalog_discovery.schemas import MAX_RECOMMENDATIONS
+from services.model_catalog_discovery.service import ModelCatalog, model_catalog
+
+logger = setup_logger("model_catalog")
+
+settings = get_settings()
+
+# Hashed text embedding width; the matrix takes rows * (TEXT_DIMS + ~100) * 4 bytes
+TEXT_DIMS = 128
+# Rarer values of a categorical field share the all-zero "other" encoding
+MAX_CATEGORY_VALUES = 64
+# Most common numeric metrics used as benchmark scores
+MAX_SCORE_KEYS = 8
+# Metrics that are numeric but not higher-is-better scores
+NON_SCORE_METRICS = {"latency", "memory"}
+
+# Matches kept per model in the cache, enough for the largest limit served
+CACHED_MATCHES = MAX_RECOMMENDATIONS
+# Share of a use-case score that comes from benchmark quality rather than fit
+QUALITY_WEIGHT = 0.1
+
+BLOCK_WEIGHTS = {
+    "text": 1.0,
+    "task": 0.8,
+    "type": 0.3,
+    "size": 0.2,
+    "params": 0.4,
+    "license": 0.3,
+    "latency": 0.2,
+    "scores": 0.3,
+}
+CATEGORICAL = ("task", "type", "size", "params", "license", "latency")
+TOTAL_WEIGHT = sum(BLOCK_WEIGHTS.values())
+
+# (label, lower bound in ms inclusive) in ascending order
+LATENCY_CLASSES = (
+    ("<100ms", 0.0),
+    ("100-500ms", 100.0),
+    ("500ms-2s", 500.0),
+    (">=2s", 2000.0),
+)
+LATENCY_PATTERN = re.compile(r"^\s*([0-9]*\.?[0-9]+)\s*(ms|s)?\s*$", re.IGNORECASE)
+
+Match = Tuple[int, float]  # (entry id, score)
+
+
+class RecommendationsUnavailable(HTTPException):
+    def __init__(self):
+        super().__init__(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Recommendations are unavailable, retry shortly")
+
+
+# -----------------------------------------------------------------------------
+# Features
+# -----------------------------------------------------------------------------
+def latency_class(metrics: Optional[Mapping]) -> Optional[str]:
+    """Bucket a metrics["latency"] such as "150ms", "1.2s" or 150 (ms)"""
+    value = (metrics or {}).get("latency")
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        ms = float(value)
+    else:
+        match = LATENCY_PATTERN.match(str(value))
+        if not match:
+            return None
+        ms = float(match.group(1)) * (1000 if (match.group(2) or "ms").lower() == "s" else 1)
+    label = None
+    for name, lower in LATENCY_CLASSES:
+        if ms >= lower:
+            label = name
+    return label
+
+
+def categorical_values(entry: Mapping) -> Dict[str, Optional[str]]:
+    return {
+        "task": entry.get("task"),
+        "type": entry.get("type"),
+        "size": entry.get("size"),
+        "params": param_bucket(entry.get("parameters")),
+        "license": entry.get("license"),
+        "latency": latency_class(entry.get("metrics")),
+    }
+
+
+def benchmark_scores(metrics: Optional[Mapping]) -> Dict[str, float]:
+    return {
+        key: float(value)
+        for key, value in (metrics or {}).items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+        and key not in NON_SCORE_METRICS and math.isfinite(value)
+    }
+
+
+def text_terms(entry: Mapping) -> Counter:
+    """Term counts over name, description and tags"""
+    parts = [entry.get("name") or "", entry.get("description") or ""]
+    parts.extend(entry.get("tags") or ())
+    return Counter(TOKEN_PATTERN.findall(" ".join(parts).lower()))
+
+
+def _term_slot(term: str) -> Tuple[int, float]:
+    """Stable hash bucket and sign, identical in every worker"""
+    digest = zlib.crc32(term.encode())
+    return digest % TEXT_DIMS, (1.0 if digest & 0x80000000 else -1.0)
+
+
+class Vectorizer:
+    """Catalog-wide statistics frozen at build time, and the row encoding they define"""
+
+    def __init__(self, entries: Sequence[Mapping]):
+        documents = len(entries)
+        document_frequency: Counter = Counter()
+        category_counts: Dict[str, Counter] = {field: Counter() for field in CATEGORICAL}
+        score_counts: Counter = Counter()
+        all_scores = []
+        for entry in entries:
+            document_frequency.update(text_terms(entry).keys())
+            for field, value in categorical_values(entry).items():
+                if value is not None:
+                    category_counts[field][value] += 1
+            scores = benchmark_scores(entry.get("metrics"))
+            score_counts.update(scores.keys())
+            all_scores.append(scores)
+
+        # A term in a single document cannot make two documents alike
+        self.terms: Dict[str, Tuple[int, float, float]] = {
+            term: (*_term_slot(term), math.log((1 + documents) / (1 + df)) + 1)
+            for term, df in document_frequency.items() if df > 1
+        }
+
+        self.offsets: Dict[str, int] = {"text": 0}
+        self.categories: Dict[str, Dict[str, int]] = {}
+        width = TEXT_DIMS
+        for field in CATEGORICAL:
+            values = [value for value, _ in category_counts[field].most_common(MAX_CATEGORY_VALUES)]
+            self.offsets[field] = width
+            self.categories[field] = {value: width + i for i, value in enumerate(values)}
+            width += len(values)
+
+        self.score_keys = [key for key, _ in score_counts.most_common(MAX_SCORE_KEYS)]
+        self.score_ranges: Dict[str, Tuple[float, float]] = {}
+        for key in self.score_keys:
+            values = [scores[key] for scores in all_scores if key in scores]
+            self.score_ranges[key] = (min(values), max(values))
+        self.offsets["scores"] = width
+        self.width = width + len(self.score_keys)
+
+    def scaled_scores(self, entry: Mapping) -> Dict[str, float]:
+        """Benchmark scores scaled to [0, 1] over the catalog's range"""
+        scores = benchmark_scores(entry.get("metrics"))
+        scaled = {}
+        for key in self.score_keys:
+            if key in scores:
+                low, high = self.score_ranges[key]
+                scaled[key] = min(1.0, max(0.0, (scores[key] - low) / (high - low))) if high > low else 0.5
+        return scaled
+
+    def vectorize(self, entries: Sequence[Mapping]) -> np.ndarray:
+        matrix = np.zeros((len(entries), self.width), dtype=np.float32)
+        text_scale = math.sqrt(BLOCK_WEIGHTS["text"])
+        score_scale = math.sqrt(BLOCK_WEIGHTS["scores"])
+        score_offset = self.offsets["scores"]
+        for row, entry in enumerate(entries):
+            text = matrix[row, :TEXT_DIMS]
+            for term, count in text_terms(entry).items():
+                slot = self.terms.get(term)
+                if slot is not None:
+                    bucket, sign, idf = slot
+                    text[bucket] += sign * (1 + math.log(count)) * idf
+            norm = float(np.linalg.norm(text))
+            if norm:
+                text *= text_scale / norm
+
+            for field, value in categorical_values(entry).items():
+                column = self.categories[field].get(value)
+                if column is not None:
+                    matrix[row, column] = math.sqrt(BLOCK_WEIGHTS[field])
+
+            # Centred, so models with the same strengths score alike
+            scaled = self.scaled_scores(entry)
+            if scaled:
+                centred = np.array([scaled.get(key, 0.5) - 0.5 for key in self.score_keys], dtype=np.float32)
+                norm = float(np.linalg.norm(centred))
+                if norm:
+                    matrix[row, score_offset:score_offset + len(self.score_keys)] = centred * (score_scale / norm)
+        return matrix
+
+
+# -----------------------------------------------------------------------------
+# Scoring
+# -----------------------------------------------------------------------------
+def _top_matches(scores: np.ndarray, ids: np.ndarray, k: int) -> List[List[Match]]:
+    """Best k (id, score) per row of a (queries x catalog) score matrix"""
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return [[] for _ in range(scores.shape[0])]
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    results = []
+    for row, columns in enumerate(top):
+        row_scores = scores[row, columns]
+        order = np.argsort(-row_scores, kind="stable")
+        results.append([
+            (int(ids[columns[i]]), float(row_scores[i]))
+            for i in order if np.isfinite(row_scores[i])
+        ])
+    return results
+
+
+def _encode(values: Sequence[Optional[str]]) -> Tuple[Dict[str, int], np.ndarray]:
+    """Integer codes for a column of strings, so filters compare ints; None is -1"""
+    codes: Dict[str, int] = {}
+    column = np.array(
+        [-1 if value is None else codes.setdefault(value, len(codes)) for value in values], dtype=np.int32
+    )
+    return codes, column
+
+
+class Recommender:
+    """One build of the catalog matrix; read-only apart from its match cache"""
+
+    def __init__(self, entries: Sequence[Mapping], version: Optional[datetime], cache_size: int = 10000):
+        self.version = version
+        self.vectorizer = Vectorizer(entries)
+        self.ids = np.array([entry["id"] for entry in entries], dtype=np.int64)
+        self.rows = {int(entry_id): row for row, entry_id in enumerate(self.ids)}
+        self.matrix = self.vectorizer.vectorize(entries)
+        # Columns for use-case filters and the quality prior
+        self.type_codes, self.types = _encode([entry.get("type") for entry in entries])
+        self.license_codes, self.licenses = _encode([entry.get("license") for entry in entries])
+        self.parameters = np.array(
+            [np.nan if entry.get("parameters") is None else entry["parameters"] for entry in entries], dtype=np.float64
+        )
+        self.commercial = np.array([bool(entry.get("commercial")) for entry in entries], dtype=bool)
+        self.quality = np.array([
+            sum(scaled.values()) / len(scaled) if scaled else 0.5
+            for scaled in map(self.vectorizer.scaled_scores, entries)
+        ], dtype=np.float32)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[int, List[Match]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def cached(self, entry_id: int) -> Optional[List[Match]]:
+        matches = self._cache.get(entry_id)
+        model_catalog_recommend_cache_total.labels(result="miss" if matches is None else "hit").inc()
+        if matches is not None:
+            self._cache.move_to_end(entry_id)
+        return matches
+
+    def remember(self, entry_id: int, matches: List[Match]) -> None:
+        self._cache[entry_id] = matches
+        self._cache.move_to_end(entry_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def similar(self, entries: Sequence[Mapping], k: int = CACHED_MATCHES) -> List[List[Match]]:
+        """Closest catalog models to each entry, itself excluded"""
+        if not entries or not len(self):
+            return [[] for _ in entries]
+        known = [self.rows.get(entry["id"]) for entry in entries]
+        queries = np.empty((len(entries), self.matrix.shape[1]), dtype=np.float32)
+        fresh = [i for i, row in enumerate(known) if row is None]
+        for i, row in enumerate(known):
+            if row is not None:
+                queries[i] = self.matrix[row]
+        if fresh:
+            # Added since this build: encode with the build's statistics
+            queries[fresh] = self.vectorizer.vectorize([entries[i] for i in fresh])
+
+        scores = queries @ self.matrix.T
+        scores /= TOTAL_WEIGHT
+        for i, row in enumerate(known):
+            if row is not None:
+                scores[i, row] = -np.inf
+        return _top_matches(scores, self.ids, k)
+
+    def for_use_case(
+        self,
+        description: str,
+        task: Optional[str] = None,
+        model_type: Optional[str] = None,
+        licenses: Sequence[str] = (),
+        max_parameters: Optional[int] = None,
+        commercial: Optional[bool] = None,
+        k: int = CACHED_MATCHES
+    ) -> List[Match]:
+        """Best fits for a described use case, nudged towards better benchmark scores"""
+        if not len(self):
+            return []
+        query = self.vectorizer.vectorize([{"description": description, "task": task, "type": model_type}])[0]
+        scores = (self.matrix @ query) / TOTAL_WEIGHT + QUALITY_WEIGHT * self.quality
+
+        allowed = np.ones(len(self), dtype=bool)
+        if model_type:
+            allowed &= self.types == self.type_codes.get(model_type, -2)
+        if licenses:
+            allowed &= np.isin(self.licenses, [self.license_codes[name] for name in licenses if name in self.license_codes])
+        if max_parameters is not None:
+            # Unknown sizes are kept; the caller asked to exclude known large models
+            allowed &= ~(self.parameters > max_parameters)
+        if commercial:
+            allowed &= self.commercial
+        scores[~allowed] = -np.inf
+        return _top_matches(scores[np.newaxis, :], self.ids, k)[0]
+
+
+# -----------------------------------------------------------------------------
+# Per-worker service
+# -----------------------------------------------------------------------------
+class RecommendationService:
+    def __init__(self, catalog: ModelCatalog, rebuild_interval: float = 60.0, cache_size: int = 10000):
+        self.catalog = catalog
+        self.rebuild_interval = rebuild_interval
+        self.cache_size = cache_size
+        self._recommender: Optional[Recommender] = None
+        self._built_at = 0.0
+        self._building: Optional[asyncio.Task] = None
+
+    async def recommender(self) -> Recommender:
+        """The latest build; the first call waits for one, later ones never do"""
+        index = await self.catalog.ready()
+        current = self._recommender
+        stale = current is None or (
+            current.version != index.version and time.monotonic() - self._built_at >= self.rebuild_interval
+        )
+        if stale and self._building is None:
+            self._building = asyncio.create_task(self._rebuild(index))
+        if current is None:
+            await asyncio.shield(self._building)
+            if self._recommender is None:
+                raise RecommendationsUnavailable()
+        return self._recommender
+
+    async def _rebuild(self, index: CatalogIndex) -> None:
+        try:
+            started = time.monotonic()
+            # Entries are replaced, never mutated, so the thread can read this snapshot
+            entries = list(index.entries())
+            recommender = await asyncio.to_thread(Recommender, entries, index.version, self.cache_size)
+            self._recommender, self._built_at = recommender, time.monotonic()
+            logger.info(f"Model recommender built: {len(recommender)} models in {time.monotonic() - started:.2f}s")
+        except Exception as e:
+            logger.error(f"Error building model recommender: {str(e)}")
+        finally:
+            self._building = None
+
+    async def similar(self, entry: Mapping, limit: int) -> List[Tuple[dict, float]]:
+        recommender = await self.recommender()
+        matches = recommender.cached(entry["id"])
+        if matches is None:
+            # numpy releases the GIL for the matrix product, so this runs beside the event loop
+            matches = (await asyncio.to_thread(recommender.similar, [entry]))[0]
+            recommender.remember(entry["id"], matches)
+        return self._present(matches, limit, exclude=entry["id"])
+
+    async def for_use_case(self, limit: int, **query) -> List[Tuple[dict, float]]:
+        recommender = await self.recommender()
+        # Extra candidates cover models removed since the build
+        matches = await asyncio.to_thread(recommender.for_use_case, k=limit + CACHED_MATCHES, **query)
+        return self._present(matches, limit)
+
+    def _present(self, matches: Iterable[Match], limit: int, exclude: Optional[int] = None) -> List[Tuple[dict, float]]:
+        """Current entries for the matches, skipping models removed since the build"""
+        index = self.catalog.index
+        results = []
+        for entry_id, score in matches:
+            entry = index.get(entry_id)
+            if entry is not None and entry_id != exclude:
+                results.append((entry, score))
+                if len(results) == limit:
+                    break
+        return results
+
+
+recommendations = RecommendationService(
+    model_catalog,
+    rebuild_interval=settings.MODEL_CATALOG_RECOMMEND_REBUILD_SECONDS,
+    cache_size=settings.MODEL_CATALOG_RECOMMEND_CACHE_SIZE
+)
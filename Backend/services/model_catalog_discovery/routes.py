@@ -0,0 +1,306 @@
+"""
+services/model_catalog_discovery/routes.py
+
+Model catalog endpoints, mounted under /models.
+
+Reads are served from this worker's in-memory CatalogIndex and never touch
+the database; writes go to the database and are applied to the index once
+they commit.
+"""
+import hashlib
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing_extensions import Literal
+
+from services.auth_user_management.bulk_import import spool_upload
+from services.auth_user_management.config import get_settings
+from services.auth_user_management.database import get_async_db
+from services.auth_user_management.logger import AuditLogger, setup_logger
+from services.auth_user_management.metrics import model_catalog_recommend_seconds, model_catalog_search_seconds
+from services.auth_user_management.pagination import InvalidCursor, decode_cursor, encode_cursor
+from services.auth_user_management.principal_cache import UserPrincipal
+from services.auth_user_management.rbac import Permission, require
+from services.auth_user_management.team_versions import if_none_match
+from services.model_catalog_discovery.index import PARAM_BUCKETS
+from services.model_catalog_discovery.ingest import SUPPORTED_FORMATS, CatalogIngester, iter_model_cards, parquet_supported
+from services.model_catalog_discovery.models import CatalogModel, utcnow
+from services.model_catalog_discovery.schemas import (
+    CatalogModelIn,
+    CatalogModelResponse,
+    CatalogSearchResponse,
+    MAX_RECOMMENDATIONS,
+    RecommendationResponse,
+    UseCaseQuery,
+    card_values,
+)
+from services.model_catalog_discovery.service import model_catalog, to_entry
+
+logger = setup_logger("model_catalog")
+audit = AuditLogger()
+
+settings = get_settings()
+
+router = APIRouter(
+    responses={404: {"description": "Not found"}}
+)
+
+# Every worker converges on the same index version, so shared caches may
+# hold a page for a short while and then revalidate with If-None-Match
+CATALOG_CACHE_CONTROL = f"public, max-age={settings.MODEL_CATALOG_CACHE_MAX_AGE_SECONDS}"
+
+PARAM_BUCKET_LABELS = [label for label, _ in PARAM_BUCKETS]
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CATALOG_CACHE_CONTROL}
+    )
+
+
+def _catalog_etag(version: Optional[datetime], *variant) -> str:
+    digest = hashlib.sha1(repr((version and version.isoformat(), variant)).encode()).hexdigest()[:20]
+    return f'"catalog-{digest}"'
+
+
+@router.get("", response_model=CatalogSearchResponse)
+async def search_models(
+    request: Request,
+    response: Response,
+    q: Optional[str] = Query(None, max_length=200, description="Words that must all appear in name, description, tags, task or size"),
+    model_type: List[Literal["LLM", "SLM"]] = Query([], alias="type"),
+    license: List[str] = Query([]),
+    params: List[str] = Query([], description=f"Parameter-count buckets: {', '.join(PARAM_BUCKET_LABELS)}"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
+):
+    """Search and filter the model catalog"""
+    after = None
+    if cursor:
+        after = decode_cursor(cursor, 1)[0]
+        # The last id seen; anything else would break the index's bit scan
+        if not isinstance(after, int) or isinstance(after, bool) or after < 0:
+            raise InvalidCursor()
+    filters = {"type": model_type, "license": license, "params": params}
+    index = await model_catalog.ready()
+
+    # Only the index version and the query decide the page
+    etag = _catalog_etag(
+        index.version, q and " ".join(sorted(set(q.lower().split()))),
+        sorted(model_type), sorted(license), sorted(params), after, limit
+    )
+    if if_none_match(request.headers.get("if-none-match"), etag):
+        return _not_modified(etag)
+
+    started = time.perf_counter()
+    result = index.search(q, filters, after=after, limit=limit)
+    model_catalog_search_seconds.observe(time.perf_counter() - started)
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CATALOG_CACHE_CONTROL
+    return {
+        "items": result.items,
+        "total": result.total,
+        "next_cursor": encode_cursor((result.next_after,)) if result.next_after is not None else None,
+        "facets": result.facets,
+    }
+
+
+@router.get("/{model_id}", response_model=CatalogModelResponse)
+async def get_model(model_id: int, request: Request, response: Response):
+    """Get one catalog entry"""
+    index = await model_catalog.ready()
+    entry = index.get(model_id)
+    if entry is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Model not found")
+
+    etag = f'"model-{model_id}-{entry["updated_at"].isoformat()}"'
+    if if_none_match(request.headers.get("if-none-match"), etag):
+        return _not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CATALOG_CACHE_CONTROL
+    return entry
+
+
+# -----------------------------------------------------------------------------
+# Recommendations
+# -----------------------------------------------------------------------------
+@lru_cache(maxsize=1)
+def _recommendations():
+    """The recommendation service, imported on first use so the app starts without numpy"""
+    from services.model_catalog_discovery.recommend import recommendations
+    return recommendations
+
+
+@router.get("/{model_id}/similar", response_model=RecommendationResponse)
+async def similar_models(
+    model_id: int,
+    request: Request,
+    response: Response,
+    limit: int = Query(10, ge=1, le=MAX_RECOMMENDATIONS)
+):
+    """Models most like this one, best match first"""
+    index = await model_catalog.ready()
+    entry = index.get(model_id)
+    if entry is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Model not found")
+
+    recommender = await _recommendations().recommender()
+    etag = _catalog_etag(index.version, "similar", recommender.version, model_id, limit)
+    if if_none_match(request.headers.get("if-none-match"), etag):
+        return _not_modified(etag)
+
+    started = time.perf_counter()
+    matches = await _recommendations().similar(entry, limit)
+    model_catalog_recommend_seconds.labels(kind="similar").observe(time.perf_counter() - started)
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CATALOG_CACHE_CONTROL
+    return {"items": [{**match, "score": round(score, 4)} for match, score in matches]}
+
+
+@router.post("/recommend", response_model=RecommendationResponse)
+async def recommend_models(body: UseCaseQuery):
+    """Models that best fit a described use case, best match first"""
+    started = time.perf_counter()
+    matches = await _recommendations().for_use_case(
+        body.limit,
+        description=body.description,
+        task=body.task,
+        model_type=body.type,
+        licenses=body.license,
+        max_parameters=body.max_parameters,
+        commercial=body.commercial
+    )
+    model_catalog_recommend_seconds.labels(kind="use_case").observe(time.perf_counter() - started)
+    return {"items": [{**match, "score": round(score, 4)} for match, score in matches]}
+
+
+# -----------------------------------------------------------------------------
+# Catalog administration
+# -----------------------------------------------------------------------------
+async def _get_live_row(db: AsyncSession, model_id: int) -> CatalogModel:
+    row = (await db.execute(
+        select(CatalogModel).where(CatalogModel.id == model_id, CatalogModel.deleted_at.is_(None))
+    )).scalar_one_or_none()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Model not found")
+    return row
+
+
+async def _commit(db: AsyncSession, row: CatalogModel) -> None:
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"A model with slug '{row.slug}' already exists"
+        )
+    # Visible on this worker right away; the others pick it up on their next poll
+    model_catalog.apply(row)
+
+
+@router.post("", response_model=CatalogModelResponse, status_code=status.HTTP_201_CREATED)
+async def create_model(
+    body: CatalogModelIn,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(require(Permission.MANAGE_MODEL_CATALOG))
+):
+    """Add a model to the catalog"""
+    row = CatalogModel(**card_values(body))
+    db.add(row)
+    await _commit(db, row)
+    logger.info(f"Catalog model {row.slug} (id {row.id}) created by {current_user.email}")
+    return to_entry(row)
+
+
+@router.put("/{model_id}", response_model=CatalogModelResponse)
+async def update_model(
+    model_id: int,
+    body: CatalogModelIn,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(require(Permission.MANAGE_MODEL_CATALOG))
+):
+    """Replace a catalog entry"""
+    row = await _get_live_row(db, model_id)
+    for field, value in card_values(body).items():
+        setattr(row, field, value)
+    await _commit(db, row)
+    logger.info(f"Catalog model {row.slug} (id {row.id}) updated by {current_user.email}")
+    return to_entry(row)
+
+
+@router.delete("/{model_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_model(
+    model_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(require(Permission.MANAGE_MODEL_CATALOG))
+):
+    """Remove a model from the catalog"""
+    row = await _get_live_row(db, model_id)
+    # Soft delete, so other workers' polls see the change
+    row.deleted_at = row.updated_at = utcnow()
+    await _commit(db, row)
+    logger.info(f"Catalog model {row.slug} (id {row.id}) deleted by {current_user.email}")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.post("/import", response_class=StreamingResponse)
+async def import_models(
+    request: Request,
+    import_format: Optional[Literal["json", "jsonl", "parquet"]] = Query(None, alias="format"),
+    current_user: UserPrincipal = Depends(require(Permission.MANAGE_MODEL_CATALOG))
+):
+    """Add or update catalog entries in bulk from a model card dump
+
+    The body is the raw file: a JSON array of cards, one card per line, or
+    a Parquet file with one column per card field. Cards are matched by
+    slug. Results are streamed back as JSON lines, one per input row.
+    """
+    fmt = import_format or _import_format(request.headers.get("content-type", ""))
+    if fmt == "parquet" and not parquet_supported():
+        # Checked before the 200 starts streaming; the rows could only all fail
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Parquet uploads are not enabled on this server; send JSON or JSON lines"
+        )
+    upload = await spool_upload(request.stream(), settings.MODEL_CATALOG_IMPORT_MAX_BYTES)
+    ingester = CatalogIngester(catalog=model_catalog, batch_size=settings.MODEL_CATALOG_IMPORT_BATCH_SIZE)
+
+    async def results():
+        try:
+            async for result in ingester.run(iter_model_cards(upload, fmt)):
+                yield result.to_line()
+        finally:
+            upload.close()
+            audit.log_admin_action(
+                "model_catalog_imported",
+                current_user.email,
+                target=f"{ingester.counts['created'] + ingester.counts['updated']} models",
+                details=", ".join(f"{k}={v}" for k, v in sorted(ingester.counts.items()))
+            )
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
+def _import_format(content_type: str) -> str:
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type == "application/json":
+        return "json"
+    if media_type in ("application/x-ndjson", "application/jsonl", "application/x-jsonlines"):
+        return "jsonl"
+    if media_type in ("application/vnd.apache.parquet", "application/x-parquet"):
+        return "parquet"
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail=f"Upload must be one of: {', '.join(SUPPORTED_FORMATS)} (set Content-Type or ?format=)"
+    )
@@ -0,0 +1,113 @@
+"""
+services/model_catalog_discovery/schemas.py
+
+Request and response bodies for the model catalog, shared by the API and
+the bulk ingestion pipeline.
+"""
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+from typing_extensions import Literal
+
+# Largest number of recommendations returned per request
+MAX_RECOMMENDATIONS = 50
+
+
+class CatalogModelIn(BaseModel):
+    slug: str = Field(..., min_length=1, max_length=120, pattern=r"^[a-z0-9][a-z0-9._-]*$")
+    name: str = Field(..., min_length=1, max_length=200)
+    description: Optional[str] = None
+    type: Literal["LLM", "SLM"]
+    task: Optional[str] = Field(None, max_length=100)
+    tags: List[str] = Field(default_factory=list, description="Domains, e.g. finance, healthcare")
+    size: Optional[str] = Field(None, max_length=20)
+    parameters: Optional[int] = Field(None, ge=0, description="Parameter count")
+    license: Optional[str] = Field(None, max_length=100)
+    commercial: bool = False
+    tier: Literal["free", "advanced", "enterprise"] = "free"
+    version: Optional[str] = Field(None, max_length=20)
+    status: str = Field("ready", max_length=20)
+    metrics: Optional[Dict[str, Any]] = None
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "slug": "llama-3-8b",
+                "name": "Llama 3 8B",
+                "description": "General purpose instruction-tuned model",
+                "type": "LLM",
+                "task": "text-generation",
+                "tags": ["general", "chat"],
+                "size": "medium",
+                "parameters": 8_000_000_000,
+                "license": "Apache 2.0",
+                "commercial": True,
+                "tier": "free",
+                "version": "1.0",
+                "status": "ready",
+                "metrics": {"accuracy": 0.9, "latency": "150ms", "memory": "16GB"}
+            }
+        }
+    }
+
+
+class CatalogModelResponse(CatalogModelIn):
+    id: int
+    updated_at: datetime
+
+
+class CatalogSearchResponse(BaseModel):
+    items: List[CatalogModelResponse]
+    total: int
+    next_cursor: Optional[str] = None
+    facets: Dict[str, Dict[str, int]] = Field(
+        ..., description="Counts per facet value, each ignoring the facet's own filter"
+    )
+
+
+class UseCaseQuery(BaseModel):
+    description: str = Field(..., min_length=1, max_length=2000, description="What the model should do")
+    task: Optional[str] = Field(None, max_length=100)
+    type: Optional[Literal["LLM", "SLM"]] = None
+    license: List[str] = Field(default_factory=list, description="Acceptable licenses; any when empty")
+    max_parameters: Optional[int] = Field(None, ge=0)
+    commercial: Optional[bool] = Field(None, description="Only models cleared for commercial use when true")
+    limit: int = Field(10, ge=1, le=MAX_RECOMMENDATIONS)
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "description": "Summarize customer support tickets for a bank",
+                "task": "summarization",
+                "license": ["Apache 2.0", "MIT"],
+                "max_parameters": 10_000_000_000,
+                "commercial": True,
+                "limit": 5
+            }
+        }
+    }
+
+
+class RecommendedModel(CatalogModelResponse):
+    score: float
+
+
+class RecommendationResponse(BaseModel):
+    items: List[RecommendedModel]
+
+
+def content_hash(card: CatalogModelIn) -> str:
+    """SHA-256 of a card's canonical JSON; equal for cards that would store the same row"""
+    canonical = json.dumps(card.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def card_values(card: CatalogModelIn) -> Dict[str, Any]:
+    """Column values for a CatalogModel row"""
+    values = card.model_dump()
+    values["model_type"] = values.pop("type")
+    values["content_hash"] = content_hash(card)
+    return values
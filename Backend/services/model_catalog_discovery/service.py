@@ -0,0 +1,191 @@
+"""
+services/model_catalog_discovery/service.py
+
+Keeps each worker's CatalogIndex in step with the catalog_models table.
+
+The index is built once in a worker thread at startup, then a background
+task polls for rows whose updated_at moved and applies them one by one.
+Writes made through this worker are applied as soon as they commit, so
+only other workers' changes wait for the next poll. The poll re-reads a
+short overlap window, because a transaction that commits late can carry an
+updated_at older than rows already seen; rows already applied are skipped.
+"""
+import asyncio
+import time
+from datetime import timedelta
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+
+from services.auth_user_management.config import get_settings
+from services.auth_user_management.database import AsyncSessionLocal
+from services.auth_user_management.logger import setup_logger
+from services.auth_user_management.metrics import model_catalog_entries, model_catalog_refresh_errors_total
+from services.model_catalog_discovery.index import CatalogIndex
+from services.model_catalog_discovery.models import CatalogModel
+
+logger = setup_logger("model_catalog")
+
+settings = get_settings()
+
+# How long a request waits for the first load before giving up with 503
+READY_TIMEOUT_SECONDS = 10.0
+
+# Rows applied between yields to the event loop while catching up
+APPLY_BATCH = 500
+
+
+class CatalogUnavailable(HTTPException):
+    def __init__(self):
+        super().__init__(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Model catalog is loading, retry shortly")
+
+
+CATALOG_COLUMNS = (
+    CatalogModel.id,
+    CatalogModel.slug,
+    CatalogModel.name,
+    CatalogModel.description,
+    CatalogModel.model_type,
+    CatalogModel.task,
+    CatalogModel.tags,
+    CatalogModel.size,
+    CatalogModel.parameters,
+    CatalogModel.license,
+    CatalogModel.commercial,
+    CatalogModel.tier,
+    CatalogModel.version,
+    CatalogModel.status,
+    CatalogModel.metrics,
+    CatalogModel.updated_at,
+    CatalogModel.deleted_at,
+)
+
+
+def to_entry(row) -> dict:
+    """API representation of a catalog row, as stored in the index"""
+    return {
+        "id": row.id,
+        "slug": row.slug,
+        "name": row.name,
+        "description": row.description,
+        "type": row.model_type,
+        "task": row.task,
+        "tags": list(row.tags or ()),
+        "size": row.size,
+        "parameters": row.parameters,
+        "license": row.license,
+        "commercial": bool(row.commercial),
+        "tier": row.tier,
+        "version": row.version,
+        "status": row.status,
+        "metrics": row.metrics,
+        "updated_at": row.updated_at,
+    }
+
+
+class ModelCatalog:
+    def __init__(self, session_factory=AsyncSessionLocal, refresh_interval: float = 5.0, refresh_overlap: float = 30.0):
+        self.session_factory = session_factory
+        self.refresh_interval = refresh_interval
+        self.refresh_overlap = timedelta(seconds=refresh_overlap)
+        self.index = CatalogIndex()
+        self._loaded: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Load the catalog in the background; requests wait for it in `ready`"""
+        if self._task is None:
+            self._loaded = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def ready(self) -> CatalogIndex:
+        """The index, once the first load has finished"""
+        if self._loaded is None:
+            # Not started by the lifespan (scripts, tests): load inline
+            self._loaded = asyncio.Event()
+            try:
+                await self.reload()
+            except Exception:
+                # Let the next call try again instead of waiting on an Event nobody will set
+                self._loaded = None
+                raise
+            self._loaded.set()
+        try:
+            await asyncio.wait_for(self._loaded.wait(), READY_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            raise CatalogUnavailable()
+        return self.index
+
+    async def _run(self) -> None:
+        while not self._loaded.is_set():
+            try:
+                await self.reload()
+                self._loaded.set()
+            except Exception as e:
+                model_catalog_refresh_errors_total.inc()
+                logger.error(f"Error loading model catalog: {str(e)}")
+                await asyncio.sleep(self.refresh_interval)
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                model_catalog_refresh_errors_total.inc()
+                logger.error(f"Error refreshing model catalog: {str(e)}")
+
+    async def reload(self) -> None:
+        """Rebuild the whole index from the database"""
+        started = time.monotonic()
+        async with self.session_factory() as db:
+            rows = (await db.execute(select(*CATALOG_COLUMNS))).all()
+        live = [to_entry(row) for row in rows if row.deleted_at is None]
+        deleted = [(row.id, row.updated_at) for row in rows if row.deleted_at is not None]
+        # Indexing 100k entries takes long enough to keep it off the event loop
+        self.index = await asyncio.to_thread(CatalogIndex.build, live, deleted)
+        model_catalog_entries.set(len(self.index))
+        logger.info(f"Model catalog loaded: {len(self.index)} entries in {time.monotonic() - started:.2f}s")
+
+    async def refresh(self) -> int:
+        """Apply rows changed since the last poll; returns how many changed"""
+        version = self.index.version
+        query = select(*CATALOG_COLUMNS)
+        if version is not None:
+            query = query.where(CatalogModel.updated_at >= version - self.refresh_overlap)
+        async with self.session_factory() as db:
+            rows = (await db.execute(query.order_by(CatalogModel.updated_at))).all()
+        changed = 0
+        for position, row in enumerate(rows, start=1):
+            changed += self.apply(row)
+            if position % APPLY_BATCH == 0:
+                # A bulk ingest can change tens of thousands of rows; keep serving between slices
+                await asyncio.sleep(0)
+        if changed:
+            model_catalog_entries.set(len(self.index))
+        return changed
+
+    def apply(self, row) -> bool:
+        """Bring one row into the index unless it is already there; True if it changed"""
+        known = self.index.updated_at(row.id)
+        if known is not None and row.updated_at <= known:
+            return False
+        if row.deleted_at is None:
+            self.index.upsert(to_entry(row))
+        else:
+            self.index.remove(row.id, row.updated_at)
+        return True
+
+
+model_catalog = ModelCatalog(
+    refresh_interval=settings.MODEL_CATALOG_REFRESH_SECONDS,
+    refresh_overlap=settings.MODEL_CATALOG_REFRESH_OVERLAP_SECONDS
+)
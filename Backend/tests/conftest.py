@@ -0,0 +1,49 @@
+"""
+Shared fixtures for the backend tests.
+
+Settings normally come from .env; placeholders are filled in here, before
+any service module is imported, so the tests run on a bare checkout
+against SQLite without MySQL or an SMTP server.
+"""
+import os
+import tempfile
+
+_PLACEHOLDER_SETTINGS = {
+    "DB_USERNAME": "test",
+    "DB_PASSWORD": "test",
+    "DB_HOST": "localhost",
+    "DB_NAME": "test",
+    "ASYNC_DATABASE_URL": f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='artintel-tests-')}/app.db",
+    "JWT_SECRET_KEY": "test-secret-key",
+    "SMTP_SERVER": "localhost",
+    "SMTP_PORT": "25",
+    "SMTP_USERNAME": "test",
+    "SMTP_PASSWORD": "test",
+    "FROM_EMAIL": "noreply@example.com",
+    "FRONTEND_URL": "http://localhost:3000",
+    "EMAIL_TRANSPORT": "memory",
+}
+
+for _name, _value in _PLACEHOLDER_SETTINGS.items():
+    os.environ.setdefault(_name, _value)
+
+import pytest_asyncio  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from services.auth_user_management.database import Base  # noqa: E402
+from services.auth_user_management import models  # noqa: E402,F401  (registers the tables)
+
+
+@pytest_asyncio.fixture
+async def sqlite_engine(tmp_path):
+    """A fresh SQLite database with every table created"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/test.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def session_factory(sqlite_engine):
+    return async_sessionmaker(sqlite_engine, class_=AsyncSession, expire_on_commit=False)
@@ -0,0 +1,33 @@
+"""
+The audit writer starts on the first event, not when the routes are imported.
+"""
+import logging
+import subprocess
+import sys
+
+from services.auth_user_management.logger import AuditLogger
+
+
+def test_importing_the_app_does_not_start_the_audit_writer():
+    # A fresh interpreter, so events logged by other tests do not count
+    check = (
+        "import threading, main\n"
+        "from services.auth_user_management import logger\n"
+        "assert logger._audit_writer is None\n"
+        "assert 'audit-writer' not in {thread.name for thread in threading.enumerate()}\n"
+    )
+    result = subprocess.run([sys.executable, "-c", check], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_events_go_to_the_logger_once_one_is_needed():
+    records = []
+    target = logging.Logger("audit-test")
+    target.handle = records.append
+    audit = AuditLogger(target)
+
+    audit.log_admin_action("user_deleted", "admin@example.com", "user@example.com", "")
+
+    assert [(record.msg, record.kind, record.target) for record in records] == [
+        ("user_deleted", "admin", "user@example.com")
+    ]
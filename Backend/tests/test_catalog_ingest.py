@@ -0,0 +1,133 @@
+"""
+Bulk ingestion of model cards: per-row results, upserts by slug, and how
+unreadable dumps are reported.
+"""
+import io
+import json
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from services.auth_user_management.database import get_async_db
+from services.auth_user_management.dependencies import get_current_user
+from services.auth_user_management.principal_cache import UserPrincipal
+from services.model_catalog_discovery import routes
+from services.model_catalog_discovery.ingest import CatalogIngester, iter_model_cards
+from services.model_catalog_discovery.models import CatalogModel, utcnow
+from services.model_catalog_discovery.service import ModelCatalog
+
+
+def card(slug, **fields):
+    return {"slug": slug, "name": slug.title(), "type": "LLM", "license": "MIT", **fields}
+
+
+def jsonl(*records):
+    return io.BytesIO("".join(json.dumps(record) + "\n" for record in records).encode())
+
+
+async def ingest_dump(ingester, dump, fmt="jsonl"):
+    return [(result.row, result.status, result.slug) async for result in ingester.run(iter_model_cards(dump, fmt))]
+
+
+@pytest.mark.asyncio
+async def test_cards_are_upserted_by_slug_and_applied_to_the_index(session_factory):
+    catalog = ModelCatalog(session_factory)
+    await catalog.ready()
+    ingester = CatalogIngester(session_factory, catalog, batch_size=2)
+
+    results = await ingest_dump(ingester, jsonl(
+        card("alpha"), card("beta", tags=["chat"]), {"slug": "bad slug"}, card("gamma"), card("alpha")
+    ))
+
+    assert results == [
+        (3, "invalid", "bad slug"), (1, "created", "alpha"), (2, "created", "beta"),
+        # Row 5 lands in a later batch, where alpha is already stored
+        (4, "created", "gamma"), (5, "unchanged", "alpha"),
+    ]
+    assert [item["slug"] for item in catalog.index.search("chat").items] == ["beta"]
+
+    # A second run only writes what changed
+    rerun = CatalogIngester(session_factory, catalog)
+    results = await ingest_dump(rerun, jsonl(card("alpha"), card("beta", tags=["code"])))
+    assert results == [(1, "unchanged", "alpha"), (2, "updated", "beta")]
+    assert [item["slug"] for item in catalog.index.search("code").items] == ["beta"]
+    assert rerun.counts == {"unchanged": 1, "updated": 1}
+
+
+@pytest.mark.asyncio
+async def test_deleted_cards_are_not_brought_back(session_factory):
+    async with session_factory() as db:
+        db.add(CatalogModel(slug="alpha", name="Alpha", model_type="LLM", deleted_at=utcnow()))
+        await db.commit()
+
+    results = await ingest_dump(CatalogIngester(session_factory), jsonl(card("alpha")))
+
+    assert results == [(1, "deleted", "alpha")]
+    async with session_factory() as db:
+        row = (await db.execute(select(CatalogModel).where(CatalogModel.slug == "alpha"))).scalar_one()
+    assert row.deleted_at is not None
+
+
+def test_json_arrays_are_read_one_card_at_a_time():
+    dump = io.BytesIO(json.dumps([card("alpha"), "not a card", card("beta")]).encode()[:-1])
+
+    results = [
+        (row, record if isinstance(record, str) else record["slug"]) for row, record in iter_model_cards(dump, "json")
+    ]
+
+    assert results == [(1, "alpha"), (2, "Expected a JSON object"), (3, "beta"), (4, "Unterminated JSON array")]
+
+
+def parquet_errors(dump):
+    return [record for _, record in iter_model_cards(dump, "parquet")]
+
+
+def test_parquet_without_pyarrow_is_a_row_error(monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    monkeypatch.setitem(sys.modules, "pyarrow.parquet", None)
+
+    assert parquet_errors(io.BytesIO(b"PAR1")) == ["Parquet support requires pyarrow"]
+
+
+def test_parquet_rows_are_read_in_order():
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    dump = io.BytesIO()
+    pq.write_table(pa.Table.from_pylist([card("alpha"), card("beta")]), dump)
+    dump.seek(0)
+
+    assert [(row, record["slug"]) for row, record in iter_model_cards(dump, "parquet")] == [(1, "alpha"), (2, "beta")]
+
+
+def test_an_unreadable_parquet_file_is_a_row_error():
+    pytest.importorskip("pyarrow")
+
+    assert parquet_errors(io.BytesIO(b"not parquet at all")) == ["Invalid Parquet file"]
+
+
+def test_parquet_upload_is_refused_before_streaming_without_pyarrow(session_factory, monkeypatch):
+    monkeypatch.setattr(routes, "parquet_supported", lambda: False)
+
+    async def override_db():
+        async with session_factory() as db:
+            yield db
+
+    async def override_user():
+        return UserPrincipal(
+            id=1, email="admin@example.com", role="admin", tier="Enterprise", is_active=True, email_verified=True
+        )
+
+    app = FastAPI()
+    app.include_router(routes.router, prefix="/models")
+    app.dependency_overrides[get_async_db] = override_db
+    app.dependency_overrides[get_current_user] = override_user
+
+    response = TestClient(app).post(
+        "/models/import", content=b"PAR1", headers={"Content-Type": "application/vnd.apache.parquet"}
+    )
+
+    assert response.status_code == 415
@@ -0,0 +1,79 @@
+"""
+Read routing against local stand-ins: a primary and two replicas, each its
+own SQLite file, configured the way DEPLOYMENT.md describes
+(ASYNC_DATABASE_URL and ASYNC_REPLICA_DATABASE_URLS).
+
+Each database holds a marker user, so a read shows which one answered.
+"""
+import pytest
+import pytest_asyncio
+from sqlalchemy import create_engine, select
+
+from services.auth_user_management import database
+from services.auth_user_management.database import Base, ReadSessionLocal
+from services.auth_user_management.models import User
+
+DATABASES = ("primary", "replica-0", "replica-1")
+
+
+@pytest_asyncio.fixture
+async def replicated(tmp_path, monkeypatch):
+    for name in DATABASES:
+        engine = create_engine(f"sqlite:///{tmp_path}/{name}.db")
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(User.__table__.insert().values(email=f"{name}@example.com", hashed_password="x"))
+        engine.dispose()
+
+    await database.dispose_engines()
+    monkeypatch.setattr(database.settings, "ASYNC_DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path}/primary.db")
+    monkeypatch.setattr(
+        database.settings,
+        "ASYNC_REPLICA_DATABASE_URLS",
+        ",".join(f"sqlite+aiosqlite:///{tmp_path}/{name}.db" for name in DATABASES[1:])
+    )
+    database.init_engines()
+    yield
+    await database.dispose_engines()
+
+
+async def answered_by(db) -> str:
+    emails = (await db.execute(select(User.email).where(User.email.like("%@example.com")))).scalars().all()
+    markers = [email.split("@")[0] for email in emails if email.split("@")[0] in DATABASES]
+    assert len(markers) == 1
+    return markers[0]
+
+
+@pytest.mark.asyncio
+async def test_app_starts_with_sqlite_stand_ins(replicated):
+    assert database.get_engine().url.drivername == "sqlite"
+    assert database.verify_db_connection(retries=1)
+    assert sorted(database.get_replica_set().engines) == ["replica-0", "replica-1"]
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_a_replica(replicated):
+    async with ReadSessionLocal() as db:
+        first = await answered_by(db)
+        assert first.startswith("replica-")
+        # A session keeps its replica
+        assert await answered_by(db) == first
+
+
+@pytest.mark.asyncio
+async def test_first_write_pins_the_session_to_the_primary(replicated):
+    async with ReadSessionLocal() as db:
+        assert (await answered_by(db)).startswith("replica-")
+
+        db.add(User(email="new@example.org", hashed_password="x"))
+        await db.flush()
+        assert db.sync_session.pinned
+
+        assert await answered_by(db) == "primary"
+        new = await db.execute(select(User.email).where(User.email == "new@example.org"))
+        assert new.scalar_one() == "new@example.org"
+        await db.commit()
+
+    async with database.AsyncSessionLocal() as db:
+        assert await answered_by(db) == "primary"
+
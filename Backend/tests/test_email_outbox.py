@@ -0,0 +1,322 @@
+"""
+SMTP connection pool and outbox worker against a local SMTP server.
+
+The stand-in is aiosmtpd on 127.0.0.1 with a self-signed certificate,
+requiring STARTTLS and AUTH like the production relay. Its handler records
+logins, NOOPs and delivered messages, and can be told to answer DATA with
+an error to drive the retry and dead-letter paths.
+"""
+import datetime as dt
+import email
+import smtplib
+import socket
+import ssl
+
+import pytest
+import pytest_asyncio
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+from sqlalchemy import select
+
+from services.auth_user_management import email_outbox
+from services.auth_user_management.email import EMAIL_BUILDERS, RELATED_BOUNDARY, _html_message
+from services.auth_user_management.email_outbox import EmailOutboxWorker, SMTPConnectionPool, enqueue_email
+from services.auth_user_management.models import EmailOutbox
+
+USERNAME, PASSWORD = "mailer", "secret"
+
+
+@pytest.fixture(scope="session")
+def tls_context(tmp_path_factory):
+    """Server-side TLS context with a throwaway self-signed certificate"""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from cryptography.x509.oid import NameOID
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = dt.datetime.now(dt.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - dt.timedelta(days=1))
+        .not_valid_after(now + dt.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    directory = tmp_path_factory.mktemp("smtp-tls")
+    cert_file, key_file = directory / "cert.pem", directory / "key.pem"
+    cert_file.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    key_file.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.TraditionalOpenSSL, serialization.NoEncryption()
+    ))
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert_file, key_file)
+    return context
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+        self.logins = 0
+        self.noops = 0
+        # Reply to DATA with this instead of accepting the message
+        self.data_reply = None
+
+    def authenticate(self, server, session, envelope, mechanism, auth_data):
+        success = auth_data.login == USERNAME.encode() and auth_data.password == PASSWORD.encode()
+        self.logins += success
+        return AuthResult(success=success)
+
+    async def handle_NOOP(self, server, session, envelope, arg):
+        self.noops += 1
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.data_reply:
+            return self.data_reply
+        self.messages.append(envelope)
+        return "250 Message accepted for delivery"
+
+
+class LocalSMTPServer:
+    def __init__(self, tls_context):
+        self.tls_context = tls_context
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            self.port = probe.getsockname()[1]
+        self.handler = RecordingHandler()
+        self._controller = None
+
+    def start(self):
+        self._controller = Controller(
+            self.handler,
+            hostname="127.0.0.1",
+            port=self.port,
+            tls_context=self.tls_context,
+            require_starttls=True,
+            authenticator=self.handler.authenticate,
+            auth_require_tls=True,
+        )
+        self._controller.start()
+
+    def stop(self):
+        if self._controller is not None:
+            self._controller.stop()
+            self._controller = None
+
+    def restart(self):
+        """Drop every open connection, like a relay restarting"""
+        self.stop()
+        self.start()
+
+    def pool(self, size=2):
+        return SMTPConnectionPool(size, "127.0.0.1", self.port, USERNAME, PASSWORD, timeout=5)
+
+
+@pytest.fixture
+def smtp_server(tls_context):
+    server = LocalSMTPServer(tls_context)
+    server.start()
+    yield server
+    server.stop()
+
+
+def verification_email(to_email="user@example.com"):
+    return EMAIL_BUILDERS["verification"](to_email, "token")
+
+
+def test_message_parts_cannot_contain_the_fixed_boundary():
+    # Plain ASCII HTML would default to 7bit, where the boundary could appear
+    message = _html_message("user@example.com", "Subject", f"<p>--{RELATED_BOUNDARY}</p>")
+    raw = message.as_bytes()
+
+    html = message.get_payload()[0]
+    assert html["Content-Transfer-Encoding"] == "base64"
+    assert raw.count(f"--{RELATED_BOUNDARY}".encode()) == len(message.get_payload()) + 1
+    parsed = email.message_from_bytes(raw)
+    assert parsed.get_payload()[0].get_payload(decode=True).decode() == f"<p>--{RELATED_BOUNDARY}</p>"
+
+
+# -----------------------------------------------------------------------------
+# Connection pool
+# -----------------------------------------------------------------------------
+def test_pool_logs_in_over_starttls_once_and_reuses_the_connection(smtp_server):
+    pool = smtp_server.pool()
+    try:
+        for i in range(3):
+            pool.send(verification_email(f"user{i}@example.com"))
+    finally:
+        pool.close()
+
+    assert [envelope.rcpt_tos for envelope in smtp_server.handler.messages] == [
+        ["user0@example.com"], ["user1@example.com"], ["user2@example.com"]
+    ]
+    assert smtp_server.handler.logins == 1
+
+
+def test_idle_connection_is_checked_with_noop_before_reuse(smtp_server, monkeypatch):
+    monkeypatch.setattr(email_outbox, "SMTP_IDLE_CHECK_SECONDS", 0.0)
+    pool = smtp_server.pool()
+    try:
+        pool.send(verification_email())
+        pool.send(verification_email())
+    finally:
+        pool.close()
+
+    assert smtp_server.handler.noops == 1
+    assert smtp_server.handler.logins == 1
+    assert len(smtp_server.handler.messages) == 2
+
+
+def test_idle_connection_dropped_by_the_server_is_replaced(smtp_server, monkeypatch):
+    monkeypatch.setattr(email_outbox, "SMTP_IDLE_CHECK_SECONDS", 0.0)
+    pool = smtp_server.pool()
+    try:
+        pool.send(verification_email())
+        smtp_server.restart()
+        # The NOOP fails on the dead connection, so the send reconnects
+        pool.send(verification_email())
+    finally:
+        pool.close()
+
+    assert smtp_server.handler.logins == 2
+    assert len(smtp_server.handler.messages) == 2
+
+
+def test_broken_connection_is_discarded_after_a_failed_send(smtp_server):
+    pool = smtp_server.pool(size=1)
+    try:
+        pool.send(verification_email())
+        smtp_server.restart()
+        with pytest.raises((smtplib.SMTPServerDisconnected, OSError)):
+            pool.send(verification_email())
+        pool.send(verification_email())
+    finally:
+        pool.close()
+
+    assert smtp_server.handler.logins == 2
+    assert len(smtp_server.handler.messages) == 2
+
+
+# -----------------------------------------------------------------------------
+# Outbox worker
+# -----------------------------------------------------------------------------
+def _utc(value):
+    return value if value.tzinfo else value.replace(tzinfo=dt.timezone.utc)
+
+
+@pytest_asyncio.fixture
+async def worker(smtp_server, session_factory):
+    worker = EmailOutboxWorker(
+        transport=smtp_server.pool(),
+        session_factory=session_factory,
+        lease_seconds=300,
+        max_attempts=3,
+        retry_base_seconds=30.0,
+    )
+    yield worker
+    worker.transport.close()
+    if worker._executor is not None:
+        worker._executor.shutdown()
+
+
+async def add_job(session_factory, to_email="user@example.com", **fields):
+    async with session_factory() as db:
+        job = enqueue_email(db, "verification", to_email, "token")
+        for name, value in fields.items():
+            setattr(job, name, value)
+        await db.commit()
+        return job.id
+
+
+async def load(session_factory, job_id):
+    async with session_factory() as db:
+        return (await db.execute(select(EmailOutbox).where(EmailOutbox.id == job_id))).scalar_one()
+
+
+async def make_due(session_factory, job_id):
+    async with session_factory() as db:
+        job = (await db.execute(select(EmailOutbox).where(EmailOutbox.id == job_id))).scalar_one()
+        job.next_attempt_at = dt.datetime.now(dt.timezone.utc) - dt.timedelta(seconds=1)
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_worker_delivers_due_jobs(worker, smtp_server, session_factory):
+    job_id = await add_job(session_factory)
+
+    assert await worker.process_batch() == 1
+
+    job = await load(session_factory, job_id)
+    assert (job.status, job.attempts, job.last_error) == ("sent", 1, None)
+    assert job.sent_at is not None
+    assert [envelope.rcpt_tos for envelope in smtp_server.handler.messages] == [["user@example.com"]]
+
+
+@pytest.mark.asyncio
+async def test_claimed_jobs_are_leased_and_reclaimed_when_the_lease_expires(worker, smtp_server, session_factory):
+    now = dt.datetime.now(dt.timezone.utc)
+    leased = await add_job(session_factory, "leased@example.com", status="sending", attempts=1,
+                           next_attempt_at=now + dt.timedelta(minutes=5))
+    expired = await add_job(session_factory, "expired@example.com", status="sending", attempts=1,
+                            next_attempt_at=now - dt.timedelta(minutes=1))
+
+    # Only the job whose lease ran out is claimed again
+    assert await worker.process_batch() == 1
+    assert (await load(session_factory, expired)).status == "sent"
+    assert (await load(session_factory, expired)).attempts == 2
+    assert (await load(session_factory, leased)).status == "sending"
+    assert [envelope.rcpt_tos for envelope in smtp_server.handler.messages] == [["expired@example.com"]]
+
+
+@pytest.mark.asyncio
+async def test_temporary_failures_are_retried_with_backoff(worker, smtp_server, session_factory):
+    smtp_server.handler.data_reply = "451 4.3.0 Try again later"
+    job_id = await add_job(session_factory)
+
+    before = dt.datetime.now(dt.timezone.utc)
+    assert await worker.process_batch() == 1
+    job = await load(session_factory, job_id)
+    assert (job.status, job.attempts) == ("pending", 1)
+    assert "451" in job.last_error
+    # retry_base_seconds with at most 20% jitter
+    assert _utc(job.next_attempt_at) >= before + dt.timedelta(seconds=24)
+    # Not due yet
+    assert await worker.process_batch() == 0
+
+    smtp_server.handler.data_reply = None
+    await make_due(session_factory, job_id)
+    assert await worker.process_batch() == 1
+    job = await load(session_factory, job_id)
+    assert (job.status, job.attempts, job.last_error) == ("sent", 2, None)
+
+
+@pytest.mark.asyncio
+async def test_permanent_failures_are_dead_lettered(worker, smtp_server, session_factory):
+    smtp_server.handler.data_reply = "554 5.7.1 Message rejected"
+    job_id = await add_job(session_factory)
+
+    assert await worker.process_batch() == 1
+
+    job = await load(session_factory, job_id)
+    assert (job.status, job.attempts) == ("dead", 1)
+    assert "554" in job.last_error
+
+
+@pytest.mark.asyncio
+async def test_jobs_are_dead_lettered_after_max_attempts(worker, smtp_server, session_factory):
+    smtp_server.handler.data_reply = "451 4.3.0 Try again later"
+    job_id = await add_job(session_factory)
+
+    for attempt in range(1, worker.max_attempts + 1):
+        await make_due(session_factory, job_id)
+        assert await worker.process_batch() == 1
+        job = await load(session_factory, job_id)
+        assert job.attempts == attempt
+
+    assert job.status == "dead"
+    assert smtp_server.handler.messages == []
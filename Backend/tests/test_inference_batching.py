@@ -0,0 +1,158 @@
+"""
+Micro-batching in front of the reference backends, through InferenceEngine.deploy.
+
+RecordingBackend remembers each batch it was handed and can be held on a
+gate, which keeps the only worker busy so inputs pile up in the queue.
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+import pytest_asyncio
+
+from services.deployment_inference.backends import EchoGenerator, InferenceBackend, ReferenceSentimentModel
+from services.deployment_inference.batching import InferenceFailed, InferenceOverloaded, InvalidModelInput
+from services.deployment_inference.engine import GenerationNotSupported, InferenceEngine, ModelNotDeployed
+
+
+class RecordingBackend(InferenceBackend):
+    kind = "recording"
+
+    def __init__(self):
+        self.batches = []
+        self.calls = 0
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def predict_batch(self, items):
+        self.calls += 1
+        self.gate.wait(5)
+        self.batches.append(list(items))
+        if "boom" in items:
+            raise RuntimeError("model failed")
+        return [item.upper() for item in items]
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = InferenceEngine(workers=1, max_batch_size=4, max_wait_ms=20, max_queue=8)
+    yield engine
+    await engine.stop()
+
+
+async def until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.001)
+
+
+@pytest.mark.asyncio
+async def test_reference_model_scores_inputs_in_order(engine):
+    batcher = await engine.deploy("sentiment", ReferenceSentimentModel())
+
+    outputs = await batcher.predict(["great and reliable", {"text": "slow and broken"}, "not bad"])
+
+    assert [output["label"] for output in outputs] == ["positive", "negative", "positive"]
+    assert engine.describe()[0]["id"] == "sentiment"
+
+
+@pytest.mark.asyncio
+async def test_batches_are_capped_at_max_batch_size(engine):
+    backend = RecordingBackend()
+    batcher = await engine.deploy("recording", backend)
+    items = [f"input-{i}" for i in range(8)]
+
+    assert await batcher.predict(items) == [item.upper() for item in items]
+    assert backend.batches == [items[:4], items[4:]]
+
+
+@pytest.mark.asyncio
+async def test_requests_arriving_within_max_wait_share_a_batch(engine):
+    backend = RecordingBackend()
+    batcher = await engine.deploy("recording", backend)
+
+    started = time.monotonic()
+    first = asyncio.create_task(batcher.predict(["a"]))
+    await asyncio.sleep(0.005)
+    second = asyncio.create_task(batcher.predict(["b", "c"]))
+
+    assert await first == ["A"]
+    assert await second == ["B", "C"]
+    # The partial batch went out when the oldest input had waited max_wait
+    assert time.monotonic() - started >= batcher.max_wait
+    assert backend.batches == [["a", "b", "c"]]
+
+
+@pytest.mark.asyncio
+async def test_a_full_queue_is_rejected_with_503(engine):
+    backend = RecordingBackend()
+    batcher = await engine.deploy("recording", backend)
+    backend.gate.clear()
+    running = asyncio.create_task(batcher.predict(["a"]))
+    await until(lambda: backend.calls == 1)
+    queued = asyncio.create_task(batcher.predict([f"q{i}" for i in range(8)]))
+    await until(lambda: batcher.queued == 8)
+
+    with pytest.raises(InferenceOverloaded) as rejected:
+        await batcher.predict(["one too many"])
+    assert rejected.value.status_code == 503
+    assert rejected.value.headers["Retry-After"] == "1"
+
+    backend.gate.set()
+    assert await running == ["A"]
+    assert len(await queued) == 8
+
+
+@pytest.mark.asyncio
+async def test_cancelled_inputs_are_dropped_before_they_run(engine):
+    backend = RecordingBackend()
+    batcher = await engine.deploy("recording", backend)
+    backend.gate.clear()
+    running = asyncio.create_task(batcher.predict(["a"]))
+    await until(lambda: backend.calls == 1)
+    abandoned = asyncio.create_task(batcher.predict(["gone"]))
+    await until(lambda: batcher.queued == 1)
+
+    abandoned.cancel()
+    kept = asyncio.create_task(batcher.predict(["kept"]))
+    await asyncio.sleep(0)
+    backend.gate.set()
+
+    assert await kept == ["KEPT"]
+    assert await running == ["A"]
+    assert backend.batches == [["a"], ["kept"]]
+
+
+@pytest.mark.asyncio
+async def test_a_failed_batch_fails_its_inputs_only(engine):
+    backend = RecordingBackend()
+    batcher = await engine.deploy("recording", backend)
+
+    with pytest.raises(InferenceFailed):
+        await batcher.predict(["boom"])
+    assert await batcher.predict(["fine"]) == ["FINE"]
+
+
+@pytest.mark.asyncio
+async def test_invalid_inputs_are_rejected_before_queueing(engine):
+    batcher = await engine.deploy("sentiment", ReferenceSentimentModel())
+
+    with pytest.raises(InvalidModelInput) as invalid:
+        await batcher.predict(["fine", "   "])
+    assert invalid.value.status_code == 422
+    assert batcher.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_engine_lookups(engine):
+    await engine.deploy("sentiment", ReferenceSentimentModel())
+    await engine.deploy("writer", EchoGenerator())
+
+    with pytest.raises(ModelNotDeployed):
+        engine.get("missing")
+    with pytest.raises(GenerationNotSupported):
+        engine.get_streamer("sentiment")
+    assert engine.get_streamer("writer").name == "writer"
+    assert await engine.get("writer").predict(["hello there"]) == [{"text": "hello there"}]
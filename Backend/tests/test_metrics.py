@@ -0,0 +1,51 @@
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from services.auth_user_management.metrics import UNMATCHED_ROUTE, MetricsMiddleware
+
+router = APIRouter()
+
+
+@router.get("")
+async def list_items():
+    return []
+
+
+@router.post("", status_code=201)
+async def create_item():
+    return {}
+
+
+@router.get("/{item_id}")
+async def get_item(item_id: int):
+    return {"id": item_id}
+
+
+app = FastAPI()
+app.add_middleware(MetricsMiddleware)
+app.include_router(router, prefix="/metrics-test-items")
+
+
+def request_count(method: str, endpoint: str, status: int) -> float:
+    value = REGISTRY.get_sample_value(
+        "http_requests_total", {"method": method, "endpoint": endpoint, "status": str(status)}
+    )
+    return value or 0.0
+
+
+def test_routes_under_a_prefix_are_labelled_with_their_template():
+    expected = [
+        ("GET", "/metrics-test-items", "/metrics-test-items", 200),
+        ("POST", "/metrics-test-items", "/metrics-test-items", 201),
+        ("GET", "/metrics-test-items/7", "/metrics-test-items/{item_id}", 200),
+        ("GET", "/metrics-test-missing", UNMATCHED_ROUTE, 404),
+    ]
+    before = [request_count(method, endpoint, status) for method, _, endpoint, status in expected]
+
+    with TestClient(app) as client:
+        for method, path, _, status in expected:
+            assert client.request(method, path).status_code == status
+
+    after = [request_count(method, endpoint, status) for method, _, endpoint, status in expected]
+    assert [b - a for a, b in zip(before, after)] == [1, 1, 1, 1]
@@ -0,0 +1,173 @@
+"""
+Model catalog: the in-memory index, loading it, and the search route.
+
+The index tests build a CatalogIndex from a handful of entries. The route
+tests serve GET /models from a ModelCatalog loaded from SQLite.
+"""
+import base64
+import json
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+
+from services.model_catalog_discovery import routes
+from services.model_catalog_discovery.index import CatalogIndex
+from services.model_catalog_discovery.models import CatalogModel
+from services.model_catalog_discovery.service import ModelCatalog
+
+T0 = datetime(2026, 1, 1)
+
+
+def entry(entry_id, name, model_type="LLM", license="MIT", parameters=7_000_000_000, tags=(), **fields):
+    return {
+        "id": entry_id,
+        "slug": name.lower().replace(" ", "-"),
+        "name": name,
+        "description": fields.pop("description", None),
+        "type": model_type,
+        "task": fields.pop("task", "text-generation"),
+        "tags": list(tags),
+        "size": None,
+        "parameters": parameters,
+        "license": license,
+        "updated_at": T0 + timedelta(seconds=entry_id),
+        **fields,
+    }
+
+
+ENTRIES = [
+    entry(1, "Llama 3 8B", tags=["chat"]),
+    entry(2, "Phi 3 Mini", "SLM", parameters=3_800_000_000, tags=["chat", "code"]),
+    entry(3, "FinBERT", "SLM", "Apache 2.0", 110_000_000, ["finance"], task="text-classification"),
+    entry(5, "Mixtral 8x22B", license="Apache 2.0", parameters=141_000_000_000, tags=["chat"]),
+    entry(8, "CodeLlama 34B", parameters=34_000_000_000, tags=["code"]),
+]
+
+
+def ids(result):
+    return [item["id"] for item in result.items]
+
+
+# -----------------------------------------------------------------------------
+# Index
+# -----------------------------------------------------------------------------
+def test_search_matches_every_query_term_and_applies_filters():
+    index = CatalogIndex.build(ENTRIES)
+
+    assert ids(index.search("chat")) == [1, 2, 5]
+    assert ids(index.search("CHAT code")) == [2]
+    assert ids(index.search("nothing-like-this")) == []
+    assert ids(index.search(filters={"type": ["SLM"]})) == [2, 3]
+    assert ids(index.search("chat", {"license": ["MIT", "Apache 2.0"], "params": [">=100B"]})) == [5]
+
+
+def test_facet_counts_ignore_their_own_filter():
+    result = CatalogIndex.build(ENTRIES).search(filters={"type": ["SLM"]})
+
+    assert result.total == 2
+    assert result.facets["type"] == {"LLM": 3, "SLM": 2}
+    assert result.facets["license"] == {"MIT": 1, "Apache 2.0": 1}
+    assert result.facets["params"] == {"<1B": 1, "1B-10B": 1}
+
+
+def test_pages_resume_after_the_cursor_id():
+    index = CatalogIndex.build(ENTRIES)
+
+    first = index.search(limit=2)
+    second = index.search(after=first.next_after, limit=2)
+    last = index.search(after=second.next_after, limit=2)
+
+    assert (ids(first), first.next_after) == ([1, 2], 2)
+    assert (ids(second), second.next_after) == ([3, 5], 5)
+    assert (ids(last), last.next_after) == ([8], None)
+    assert index.search(after=100).items == []
+
+
+def test_upserts_and_removals_match_a_fresh_build():
+    index = CatalogIndex.build(ENTRIES[:2])
+    for item in ENTRIES[2:]:
+        index.upsert(item)
+    index.upsert({**ENTRIES[0], "tags": ["finance"], "updated_at": T0 + timedelta(minutes=1)})
+    index.remove(2, T0 + timedelta(minutes=2))
+
+    assert ids(index.search("chat")) == [5]
+    assert ids(index.search("finance")) == [1, 3]
+    assert len(index) == 4
+    assert index.get(2) is None
+    assert index.version == T0 + timedelta(minutes=2)
+
+
+# -----------------------------------------------------------------------------
+# Loading
+# -----------------------------------------------------------------------------
+class FlakySessions:
+    """Session factory that fails the first `failures` times it is used"""
+
+    def __init__(self, session_factory, failures):
+        self.session_factory = session_factory
+        self.failures = failures
+
+    def __call__(self):
+        if self.failures:
+            self.failures -= 1
+            raise OperationalError("SELECT", {}, Exception("server has gone away"))
+        return self.session_factory()
+
+
+async def add_models(session_factory, *names):
+    async with session_factory() as db:
+        db.add_all([
+            CatalogModel(slug=name.lower(), name=name, model_type="LLM", tags=["chat"], license="MIT")
+            for name in names
+        ])
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_a_failed_inline_load_is_retried_on_the_next_request(session_factory):
+    await add_models(session_factory, "Alpha", "Beta")
+    catalog = ModelCatalog(FlakySessions(session_factory, failures=1))
+
+    with pytest.raises(OperationalError):
+        await catalog.ready()
+
+    index = await catalog.ready()
+    assert len(index) == 2
+
+
+# -----------------------------------------------------------------------------
+# Search route
+# -----------------------------------------------------------------------------
+@pytest_asyncio.fixture
+async def client(session_factory, monkeypatch):
+    await add_models(session_factory, "Alpha", "Beta", "Gamma")
+    monkeypatch.setattr(routes, "model_catalog", ModelCatalog(session_factory))
+    app = FastAPI()
+    app.include_router(routes.router, prefix="/models")
+    return TestClient(app)
+
+
+def cursor_for(value):
+    return base64.urlsafe_b64encode(json.dumps([value]).encode()).decode().rstrip("=")
+
+
+def test_search_pages_through_the_catalog_with_cursors(client):
+    first = client.get("/models", params={"limit": 2}).json()
+    second = client.get("/models", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+
+    assert [item["name"] for item in first["items"]] == ["Alpha", "Beta"]
+    assert [item["name"] for item in second["items"]] == ["Gamma"]
+    assert second["next_cursor"] is None
+    assert first["total"] == second["total"] == 3
+
+
+@pytest.mark.parametrize("value", ["x", -5, 1.5, True, None, [1]])
+def test_forged_cursors_are_rejected_with_400(client, value):
+    response = client.get("/models", params={"cursor": cursor_for(value)})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid pagination cursor"
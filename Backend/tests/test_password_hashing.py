@@ -0,0 +1,90 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from services.auth_user_management import password_hashing
+from services.auth_user_management.bulk_import import BulkUserImporter, BulkUserRow
+from services.auth_user_management.password_hashing import HashingPoolSaturated, PasswordHashingPool
+
+
+@pytest.fixture
+def fast_hash(monkeypatch):
+    """Replace bcrypt with a short sleep and record peak concurrency"""
+    state = {"running": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def _hash(plain_password):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.01)
+        with lock:
+            state["running"] -= 1
+        return f"hashed:{plain_password}"
+
+    monkeypatch.setattr(password_hashing, "_hash", _hash)
+    return state
+
+
+@pytest.mark.asyncio
+async def test_concurrent_hash_many_share_the_pool_capacity(fast_hash):
+    pool = PasswordHashingPool(workers=2, max_queue=2)
+    peak_in_flight = 0
+
+    async def watch():
+        nonlocal peak_in_flight
+        while True:
+            peak_in_flight = max(peak_in_flight, pool.in_flight)
+            await asyncio.sleep(0)
+
+    watcher = asyncio.create_task(watch())
+    try:
+        first, second = await asyncio.gather(
+            pool.hash_many([f"a{i}" for i in range(10)]),
+            pool.hash_many([f"b{i}" for i in range(10)]),
+        )
+    finally:
+        watcher.cancel()
+        pool.shutdown()
+
+    assert first == [f"hashed:a{i}" for i in range(10)]
+    assert second == [f"hashed:b{i}" for i in range(10)]
+    assert peak_in_flight <= pool.capacity
+    assert fast_hash["peak"] <= pool.workers
+
+
+@pytest.mark.asyncio
+async def test_single_requests_are_rejected_while_a_batch_fills_the_pool(fast_hash):
+    pool = PasswordHashingPool(workers=1, max_queue=1)
+    batch = asyncio.create_task(pool.hash_many([f"p{i}" for i in range(6)]))
+    while pool.in_flight < pool.capacity:
+        await asyncio.sleep(0)
+    try:
+        with pytest.raises(HashingPoolSaturated):
+            await pool.hash("login")
+        assert len(await batch) == 6
+    finally:
+        pool.shutdown()
+
+
+class _SaturatedHasher:
+    async def hash_many(self, plain_passwords):
+        raise HashingPoolSaturated()
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_reports_hashing_failures_as_row_errors(session_factory):
+    importer = BulkUserImporter(
+        token_factory=lambda: "token",
+        hasher=_SaturatedHasher(),
+        session_factory=session_factory,
+    )
+    batch = [(i, BulkUserRow(email=f"user{i}@example.com", password="Passw0rd!")) for i in range(1, 4)]
+
+    lines = [json.loads(line) async for line in importer._import_batch(batch)]
+
+    assert [line["status"] for line in lines] == ["error", "error", "error"]
+    assert [line["row"] for line in lines] == [1, 2, 3]
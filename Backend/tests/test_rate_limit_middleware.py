@@ -0,0 +1,50 @@
+"""
+Per-route limits in RateLimitMiddleware, run against a stub app.
+"""
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from services.auth_user_management.rate_limit_middleware import Limit, RateLimitMiddleware, RouteLimit
+from services.auth_user_management.rate_limiter import InMemoryRateLimitBackend
+from services.auth_user_management.routes import create_access_token
+
+
+def make_client():
+    app = FastAPI()
+
+    @app.post("/auth/login")
+    async def login(request: Request):
+        return await request.json()
+
+    app.add_middleware(
+        RateLimitMiddleware,
+        route_limits=[RouteLimit("login", "/auth/login", (Limit("ip", 100), Limit("account", 3)), ("POST",))],
+        backend=InMemoryRateLimitBackend(),
+    )
+    return TestClient(app)
+
+
+def login(client, email, token=None):
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    return client.post("/auth/login", json={"email": email, "password": "guess"}, headers=headers)
+
+
+def test_login_attempts_are_limited_per_submitted_email():
+    client = make_client()
+
+    assert [login(client, "victim@example.com").status_code for _ in range(4)] == [200, 200, 200, 429]
+    # Other accounts have their own budget, and the body still reaches the route
+    response = login(client, "Other@example.com")
+    assert response.status_code == 200
+    assert response.json()["email"] == "Other@example.com"
+
+
+def test_a_bearer_token_does_not_change_the_account_being_limited():
+    client = make_client()
+    attacker_tokens = [create_access_token(f"attacker{i}@example.com") for i in range(4)]
+
+    statuses = [login(client, "victim@example.com", token).status_code for token in attacker_tokens]
+
+    assert statuses == [200, 200, 200, 429]
+    # The attacker's own account was never charged
+    assert login(client, "attacker0@example.com").status_code == 200
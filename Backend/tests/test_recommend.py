@@ -0,0 +1,108 @@
+"""
+Recommendations over a handful of catalog entries.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.model_catalog_discovery.index import CatalogIndex
+from services.model_catalog_discovery.recommend import RecommendationService, Recommender, latency_class
+
+T0 = datetime(2026, 1, 1)
+
+
+def entry(entry_id, name, description, task, model_type="LLM", license="MIT", parameters=7_000_000_000, **fields):
+    return {
+        "id": entry_id,
+        "name": name,
+        "description": description,
+        "task": task,
+        "type": model_type,
+        "tags": fields.pop("tags", []),
+        "size": fields.pop("size", None),
+        "parameters": parameters,
+        "license": license,
+        "commercial": fields.pop("commercial", True),
+        "metrics": fields.pop("metrics", None),
+        "updated_at": T0 + timedelta(seconds=entry_id),
+        **fields,
+    }
+
+
+ENTRIES = [
+    entry(1, "FinBERT", "Sentiment of financial news and earnings calls", "text-classification", "SLM",
+          "Apache 2.0", 110_000_000, tags=["finance"], metrics={"accuracy": 0.90, "latency": "20ms"}),
+    entry(2, "FinSent Large", "Financial news sentiment for trading desks", "text-classification", "SLM",
+          "Apache 2.0", 340_000_000, tags=["finance"], metrics={"accuracy": 0.93, "latency": "45ms"}),
+    entry(3, "MedNER", "Clinical entity extraction from patient notes", "token-classification", "SLM",
+          "MIT", 110_000_000, tags=["healthcare"], metrics={"accuracy": 0.88, "latency": "30ms"}),
+    entry(4, "Llama 3 70B", "General purpose chat and reasoning", "text-generation",
+          license="Llama 3", parameters=70_000_000_000, tags=["chat"], metrics={"accuracy": 0.80, "latency": "1.5s"}),
+    entry(5, "Mistral 7B", "General purpose chat assistant", "text-generation",
+          license="Apache 2.0", tags=["chat"], commercial=False, metrics={"accuracy": 0.70, "latency": 400}),
+]
+
+
+def ids(matches):
+    return [entry_id for entry_id, _ in matches]
+
+
+@pytest.mark.parametrize("value, label", [
+    ("20ms", "<100ms"), ("150 ms", "100-500ms"), ("1.5s", "500ms-2s"), (2500, ">=2s"), ("fast", None), (None, None),
+])
+def test_latency_classes(value, label):
+    assert latency_class({"latency": value}) == label
+
+
+def test_similar_models_rank_the_closest_first_and_exclude_the_model_itself():
+    recommender = Recommender(ENTRIES, T0)
+
+    finbert, mistral = recommender.similar([ENTRIES[0], ENTRIES[4]])
+
+    assert ids(finbert)[0] == 2
+    assert 1 not in ids(finbert)
+    assert ids(mistral)[0] == 4
+    assert all(a >= b for (_, a), (_, b) in zip(finbert, finbert[1:]))
+
+
+def test_a_model_added_after_the_build_is_vectorized_on_the_fly():
+    recommender = Recommender(ENTRIES, T0)
+    added = entry(9, "FinSent Small", "Financial news sentiment", "text-classification", "SLM", tags=["finance"])
+
+    assert sorted(ids(recommender.similar([added])[0])[:2]) == [1, 2]
+
+
+def test_use_case_matches_the_description_and_honours_filters():
+    recommender = Recommender(ENTRIES, T0)
+
+    # FinSent also has the better accuracy
+    assert ids(recommender.for_use_case("sentiment of financial news"))[:2] == [2, 1]
+    assert ids(recommender.for_use_case("chat assistant", model_type="LLM")) == [4, 5]
+    assert ids(recommender.for_use_case("chat assistant", max_parameters=10_000_000_000, model_type="LLM")) == [5]
+    assert ids(recommender.for_use_case("chat assistant", model_type="LLM", commercial=True)) == [4]
+    assert ids(recommender.for_use_case("anything", licenses=["MIT", "Unknown"])) == [3]
+
+
+class LoadedCatalog:
+    def __init__(self, entries):
+        self.index = CatalogIndex.build(entries)
+
+    async def ready(self):
+        return self.index
+
+
+@pytest.mark.asyncio
+async def test_service_caches_matches_and_skips_models_removed_since_the_build():
+    catalog = LoadedCatalog(ENTRIES)
+    service = RecommendationService(catalog, rebuild_interval=3600)
+
+    first = await service.similar(catalog.index.get(1), limit=2)
+    assert [match["id"] for match, _ in first] == [2, 3]
+    recommender = await service.recommender()
+    assert recommender.cached(1) is not None
+
+    # Removed after the build: the cached matches still name it, the response does not
+    catalog.index.remove(2, T0 + timedelta(hours=1))
+    second = await service.similar(catalog.index.get(1), limit=2)
+    assert [match["id"] for match, _ in second] == [3, 5]
+    assert await service.recommender() is recommender
@@ -0,0 +1,108 @@
+"""
+Write-behind team activity log: rejected rows and retry limits.
+
+Foreign keys are enforced on the SQLite connection so a row pointing at a
+missing team fails with an IntegrityError, like it would on MySQL.
+"""
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, select
+from sqlalchemy.exc import OperationalError
+
+from services.auth_user_management.metrics import team_activity_dropped_total
+from services.auth_user_management.models import Team, TeamActivityLog, User
+from services.auth_user_management.team_logger import TeamActivityLogger
+
+
+def dropped(reason):
+    return team_activity_dropped_total.labels(reason=reason)._value.get()
+
+
+@pytest_asyncio.fixture
+async def team_id(sqlite_engine, session_factory):
+    @event.listens_for(sqlite_engine.sync_engine, "connect")
+    def enforce_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    # Connections opened before the listener existed do not enforce them
+    await sqlite_engine.dispose()
+    async with session_factory() as db:
+        user = User(email="owner@example.com", hashed_password="x")
+        db.add(user)
+        await db.flush()
+        team = Team(name="Research", organization="Acme", created_by=user.id)
+        db.add(team)
+        await db.commit()
+        return team.id
+
+
+async def stored_actions(session_factory):
+    async with session_factory() as db:
+        return list((await db.execute(select(TeamActivityLog.action).order_by(TeamActivityLog.id))).scalars())
+
+
+@pytest.mark.asyncio
+async def test_rows_the_database_rejects_are_dropped_and_the_rest_written(session_factory, team_id):
+    activity = TeamActivityLogger(session_factory, batch_size=8)
+    for i in range(10):
+        activity.log_activity(team_id if i not in (3, 7) else team_id + 100, None, f"event-{i}", "")
+    before = dropped("rejected")
+
+    assert await activity.flush() == 8
+
+    assert await stored_actions(session_factory) == [f"event-{i}" for i in range(10) if i not in (3, 7)]
+    assert dropped("rejected") - before == 2
+    assert len(activity) == 0
+
+
+class FailingSessions:
+    """Session factory whose sessions fail with a transient error until told otherwise"""
+
+    def __init__(self, session_factory):
+        self.session_factory = session_factory
+        self.failing = True
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.failing:
+            raise OperationalError("INSERT", {}, Exception("server has gone away"))
+        return self.session_factory()
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried_until_they_succeed(session_factory, team_id):
+    sessions = FailingSessions(session_factory)
+    activity = TeamActivityLogger(sessions, batch_size=2, max_attempts=3)
+    for i in range(3):
+        activity.log_activity(team_id, None, f"event-{i}", "")
+
+    assert await activity.flush() == 0
+    assert await activity.flush() == 0
+    # Kept in order for the next flush, not bisected
+    assert [row["action"] for row in activity._buffer] == ["event-0", "event-1", "event-2"]
+    assert sessions.calls == 2
+
+    sessions.failing = False
+    assert await activity.flush() == 3
+    assert await stored_actions(session_factory) == ["event-0", "event-1", "event-2"]
+
+
+@pytest.mark.asyncio
+async def test_a_batch_is_dropped_after_max_attempts(session_factory, team_id):
+    sessions = FailingSessions(session_factory)
+    activity = TeamActivityLogger(sessions, batch_size=2, max_attempts=3)
+    for i in range(3):
+        activity.log_activity(team_id, None, f"event-{i}", "")
+    before = dropped("retries_exhausted")
+
+    for _ in range(3):
+        assert await activity.flush() == 0
+
+    assert dropped("retries_exhausted") - before == 2
+    # Later events are no longer held back by the dropped batch
+    sessions.failing = False
+    assert await activity.flush() == 1
+    assert await stored_actions(session_factory) == ["event-2"]
@@ -0,0 +1,87 @@
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from services.auth_user_management.models import Team, TeamMember, User
+from services.auth_user_management.principal_cache import UserPrincipal
+from services.auth_user_management.rbac import Permission, require, team_mask_cache
+
+TEAM_ACTIVITY = require(Permission.TEAM_VIEW_ANALYTICS, team_id="team_id")
+
+
+def principal(user: User) -> UserPrincipal:
+    return UserPrincipal(
+        id=user.id, email=user.email, role=user.role, tier="Free", is_active=True, email_verified=True
+    )
+
+
+def team_request(team_id: int) -> Request:
+    return Request({"type": "http", "path_params": {"team_id": str(team_id)}})
+
+
+@pytest.fixture(autouse=True)
+def clear_team_masks():
+    team_mask_cache.clear()
+    yield
+    team_mask_cache.clear()
+
+
+@pytest_asyncio.fixture
+async def team_setup(session_factory):
+    async with session_factory() as db:
+        users = {
+            role: User(email=f"{role}@example.com", hashed_password="x", role=role)
+            for role in ("admin", "manager", "member", "outsider")
+        }
+        users["member"].role = "user"
+        users["outsider"].role = "user"
+        db.add_all(users.values())
+        await db.flush()
+        team = Team(name="Research", organization="Acme", created_by=users["member"].id)
+        db.add(team)
+        await db.flush()
+        db.add(TeamMember(team_id=team.id, user_id=users["member"].id, role="team_member"))
+        await db.commit()
+    return team.id, {role: principal(user) for role, user in users.items()}
+
+
+@pytest.mark.asyncio
+async def test_team_member_can_view_activity(session_factory, team_setup):
+    team_id, users = team_setup
+    async with session_factory() as db:
+        assert await TEAM_ACTIVITY(team_request(team_id), users["member"], db) == users["member"]
+
+
+@pytest.mark.asyncio
+async def test_global_manager_who_is_not_a_member_is_denied(session_factory, team_setup):
+    team_id, users = team_setup
+    async with session_factory() as db:
+        with pytest.raises(HTTPException) as denied:
+            await TEAM_ACTIVITY(team_request(team_id), users["manager"], db)
+    assert denied.value.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_non_member_is_denied(session_factory, team_setup):
+    team_id, users = team_setup
+    async with session_factory() as db:
+        with pytest.raises(HTTPException) as denied:
+            await TEAM_ACTIVITY(team_request(team_id), users["outsider"], db)
+    assert denied.value.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_admin_can_view_any_team(session_factory, team_setup):
+    team_id, users = team_setup
+    async with session_factory() as db:
+        assert await TEAM_ACTIVITY(team_request(team_id), users["admin"], db) == users["admin"]
+
+
+@pytest.mark.asyncio
+async def test_missing_team_is_not_found(session_factory, team_setup):
+    _, users = team_setup
+    async with session_factory() as db:
+        with pytest.raises(HTTPException) as missing:
+            await TEAM_ACTIVITY(team_request(9999), users["manager"], db)
+    assert missing.value.status_code == 404
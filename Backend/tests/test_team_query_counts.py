@@ -0,0 +1,139 @@
+"""
+Statements issued per team endpoint.
+
+Authorization is resolved with one joined query (see team_access), so each
+endpoint has a fixed statement budget that must not grow with the number
+of checks. Statements are counted with a before_cursor_execute listener on
+an aiosqlite engine; authentication is overridden so only the endpoint's
+own queries are counted.
+"""
+from collections import Counter
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from services.auth_user_management import routes
+from services.auth_user_management.database import get_async_db, get_async_read_db
+from services.auth_user_management.dependencies import get_current_user
+from services.auth_user_management.models import Team, TeamActivityLog, TeamMember, User
+from services.auth_user_management.principal_cache import UserPrincipal
+from services.auth_user_management.rbac import team_mask_cache
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.statements = Counter()
+        event.listen(engine.sync_engine, "before_cursor_execute", self._count)
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements[statement.split(None, 1)[0].upper()] += 1
+
+    def reset(self):
+        self.statements.clear()
+
+
+@pytest_asyncio.fixture
+async def seeded(session_factory):
+    async with session_factory() as db:
+        owner = User(email="owner@example.com", hashed_password="x", role="user")
+        member = User(email="member@example.com", hashed_password="x", role="user")
+        outsider = User(email="outsider@example.com", hashed_password="x", role="user")
+        db.add_all([owner, member, outsider])
+        await db.flush()
+        team = Team(name="Research", organization="Acme", created_by=owner.id)
+        db.add(team)
+        await db.flush()
+        db.add_all([
+            TeamMember(team_id=team.id, user_id=owner.id, role="team_admin"),
+            TeamMember(team_id=team.id, user_id=member.id, role="team_member"),
+            TeamActivityLog(team_id=team.id, user_id=owner.id, action="team_created", details=""),
+        ])
+        await db.commit()
+        return team.id, {user.email.split("@")[0]: user for user in (owner, member, outsider)}
+
+
+@pytest.fixture
+def client(sqlite_engine, seeded):
+    team_id, users = seeded
+    sessions = async_sessionmaker(sqlite_engine, class_=AsyncSession, expire_on_commit=False)
+    counter = StatementCounter(sqlite_engine)
+    caller = {"user": users["owner"]}
+
+    async def override_db():
+        async with sessions() as db:
+            yield db
+
+    async def override_user():
+        user = caller["user"]
+        return UserPrincipal(
+            id=user.id, email=user.email, role=user.role, tier="Free", is_active=True, email_verified=True
+        )
+
+    app = FastAPI()
+    app.include_router(routes.router, prefix="/auth")
+    app.dependency_overrides[get_async_db] = override_db
+    app.dependency_overrides[get_async_read_db] = override_db
+    app.dependency_overrides[get_current_user] = override_user
+    team_mask_cache.clear()
+
+    with TestClient(app) as test_client:
+        test_client.team_id = team_id
+        test_client.users = users
+        test_client.caller = caller
+        test_client.counter = counter
+        yield test_client
+    team_mask_cache.clear()
+
+
+def statements(client, method, path, as_user="owner", **kwargs):
+    client.caller["user"] = client.users[as_user]
+    client.counter.reset()
+    response = client.request(method, path, **kwargs)
+    return response.status_code, dict(client.counter.statements)
+
+
+def test_list_teams(client):
+    assert statements(client, "GET", "/auth/teams") == (200, {"SELECT": 1})
+
+
+def test_get_team(client):
+    path = f"/auth/teams/{client.team_id}"
+    assert statements(client, "GET", path) == (200, {"SELECT": 2})
+    assert statements(client, "GET", path, as_user="outsider") == (403, {"SELECT": 1})
+    assert statements(client, "GET", "/auth/teams/9999") == (404, {"SELECT": 1})
+
+
+def test_get_team_revalidation_costs_one_query(client):
+    path = f"/auth/teams/{client.team_id}"
+    etag = client.get(path).headers["ETag"]
+    assert statements(client, "GET", path, headers={"If-None-Match": etag}) == (304, {"SELECT": 1})
+
+
+def test_team_activity(client):
+    path = f"/auth/teams/{client.team_id}/activity"
+    # Membership masks, then the page
+    assert statements(client, "GET", path, as_user="member") == (200, {"SELECT": 2})
+    assert statements(client, "GET", path, as_user="outsider") == (403, {"SELECT": 2})
+
+
+def test_update_team(client):
+    path = f"/auth/teams/{client.team_id}"
+    body = {"name": "Research 2", "organization": "Acme"}
+    assert statements(client, "PUT", path, json=body) == (200, {"SELECT": 1, "UPDATE": 1})
+    assert statements(client, "PUT", path, as_user="member", json=body) == (403, {"SELECT": 1})
+    assert statements(client, "PUT", "/auth/teams/9999", json=body) == (404, {"SELECT": 1})
+
+
+def test_add_team_member(client):
+    path = f"/auth/teams/{client.team_id}/members"
+    body = {"user_email": "outsider@example.com", "role": "team_member"}
+    assert statements(client, "POST", path, json=body) == (200, {"SELECT": 1, "INSERT": 1, "UPDATE": 1})
+    # Already a member, unknown user, not a manager: all decided by the one query
+    assert statements(client, "POST", path, json=body) == (400, {"SELECT": 1})
+    unknown = {"user_email": "nobody@example.com", "role": "team_member"}
+    assert statements(client, "POST", path, json=unknown) == (404, {"SELECT": 1})
+    assert statements(client, "POST", path, as_user="member", json=body) == (403, {"SELECT": 1})
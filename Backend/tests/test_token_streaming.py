@@ -0,0 +1,163 @@
+"""
+Token streaming with EchoGenerator: finish reasons, slot limits, and what
+happens when the client goes away mid-stream.
+"""
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from services.auth_user_management.dependencies import get_current_user
+from services.auth_user_management.principal_cache import UserPrincipal
+from services.deployment_inference import routes
+from services.deployment_inference.backends import EchoGenerator
+from services.deployment_inference.batching import InferenceOverloaded
+from services.deployment_inference.streaming import TokenStreamer, TokenStreamResponse, sse_event
+
+
+class TrackedEcho(EchoGenerator):
+    """EchoGenerator that records when its generator is closed"""
+
+    def __init__(self, token_delay_ms=0.0):
+        super().__init__(token_delay_ms)
+        self.closed = 0
+
+    def generate(self, prompt, max_tokens):
+        try:
+            yield from super().generate(prompt, max_tokens)
+        finally:
+            self.closed += 1
+
+
+@pytest.fixture
+def executor():
+    executor = ThreadPoolExecutor(max_workers=2)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def streamer_for(executor, backend=None, **options):
+    return TokenStreamer("writer", backend or TrackedEcho(), executor, **options)
+
+
+async def collect(stream):
+    try:
+        return [event async for event in stream]
+    finally:
+        await stream.aclose()
+
+
+async def until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.005)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("prompt, finish_reason, tokens", [
+    ("one two", "stop", 2),
+    ("one two three", "stop", 3),
+    ("one two three four", "length", 3),
+])
+async def test_finish_reason_tells_a_natural_end_from_a_cut_off(executor, prompt, finish_reason, tokens):
+    events = await collect(streamer_for(executor).open(prompt, max_tokens=3))
+
+    assert events[-1] == {"finish_reason": finish_reason, "tokens": tokens}
+    assert "".join(event["token"] for event in events[:-1]) == " ".join(prompt.split()[:tokens])
+
+
+@pytest.mark.asyncio
+async def test_streams_beyond_max_streams_are_rejected(executor):
+    streamer = streamer_for(executor, max_streams=1)
+    stream = streamer.open("one two")
+
+    with pytest.raises(InferenceOverloaded):
+        streamer.open("three four")
+
+    await collect(stream)
+    assert streamer.active == 0
+    await collect(streamer.open("three four"))
+
+
+@pytest.mark.asyncio
+async def test_a_client_disconnect_frees_the_slot_and_closes_the_generator(executor):
+    backend = TrackedEcho(token_delay_ms=20)
+    streamer = streamer_for(executor, backend)
+    stream = streamer.open(" ".join(f"word{i}" for i in range(200)))
+    assert streamer.active == 1
+
+    gone = asyncio.Event()
+    bodies = []
+
+    async def receive():
+        await gone.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            bodies.append(message["body"])
+            if len(bodies) == 2:
+                gone.set()
+
+    started = time.monotonic()
+    response = TokenStreamResponse(stream, sse_event, media_type="text/event-stream")
+    await asyncio.wait_for(response({"type": "http", "method": "POST", "path": "/"}, receive, send), 2)
+
+    # Released at once, without waiting for the remaining ~4s of tokens
+    assert streamer.active == 0
+    assert time.monotonic() - started < 1
+    assert len(bodies) <= 3
+    # The generator is closed once the token being computed is done
+    await until(lambda: backend.closed == 1)
+
+
+class StreamingEngine:
+    def __init__(self, streamer):
+        self.streamer = streamer
+
+    def get_streamer(self, model_id):
+        return self.streamer
+
+
+@pytest_asyncio.fixture
+async def client(executor, monkeypatch):
+    monkeypatch.setattr(routes, "inference_engine", StreamingEngine(streamer_for(executor)))
+
+    async def override_user():
+        return UserPrincipal(
+            id=1, email="user@example.com", role="admin", tier="Free", is_active=True, email_verified=True
+        )
+
+    app = FastAPI()
+    app.include_router(routes.router, prefix="/v1")
+    app.dependency_overrides[get_current_user] = override_user
+    return TestClient(app)
+
+
+def test_generate_streams_server_sent_events(client):
+    response = client.post(
+        "/v1/models/writer/generate",
+        json={"prompt": "hello streaming world", "max_tokens": 2},
+        headers={"Accept": "text/event-stream"},
+    )
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text == (
+        'data: {"token":"hello"}\n\n'
+        'data: {"token":" streaming"}\n\n'
+        'event: done\ndata: {"finish_reason":"length","tokens":2}\n\n'
+    )
+
+
+def test_generate_streams_json_lines_by_default(client):
+    response = client.post("/v1/models/writer/generate", json={"prompt": "hello world"})
+
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        {"token": "hello"}, {"token": " world"}, {"finish_reason": "stop", "tokens": 2}
+    ]